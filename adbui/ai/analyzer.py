@@ -1,19 +1,27 @@
 """
 AI Analyzer Module
 ==================
-Google Gemini API entegrasyonu ile paket analizi.
-Yeni google-genai paketi kullanılıyor.
+LLM tabanlı paket analizi.
+Varsayılan sağlayıcı Google Gemini (google-genai paketi).
 """
 
+import os
+import sys
+import time
 import json
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+import asyncio
+import tempfile
+import threading
+from concurrent.futures import Future
+from typing import Optional, Dict, Any, List, Tuple, Callable
+from dataclasses import dataclass, field, replace
 import logging
 
-logger = logging.getLogger(__name__)
+from .providers import LLMProvider, GeminiProvider
+from .semantic_cache import EMBEDDING_MODEL
+from .rate_limiter import RateLimiter
 
-# Google GenAI paketi (Lazy import yapılacak)
-GEMINI_AVAILABLE = None  # İlk kullanımda kontrol edilecek
+logger = logging.getLogger(__name__)
 
 
 # Kullanılabilir modeller
@@ -28,8 +36,79 @@ AVAILABLE_MODELS = [
 
 DEFAULT_MODEL = "gemini-flash-latest"
 
+# Aynı anda uçuşta olabilecek maksimum istek sayısı (hesabın QPM limitine göre)
+DEFAULT_MAX_CONCURRENCY = 5
+
+# Modelin dakika başına istek limiti (ücretsiz katman için güvenli değer)
+DEFAULT_REQUESTS_PER_MINUTE = 10
+
+# Batch API iş durumları
+BATCH_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_PARTIALLY_SUCCEEDED",
+}
+BATCH_FAILED_STATES = {
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
+
+# Servis katmanları: kullanıcının beklediği tekil analizler öncelikli,
+# gecikmeye dayanıklı arka plan taramaları ucuz (flex) katmanda çalışır
+INTERACTIVE_SERVICE_TIER = "priority"
+BACKGROUND_SERVICE_TIER = "flex"
+
+# Bundan fazla eksik embedding varsa Batch API kullanılır
+EMBED_BATCH_THRESHOLD = 100
 
-@dataclass
+# Tekrar denemenin anlamsız olduğu API hataları (kota, kimlik doğrulama)
+FATAL_ERROR_CODES = {401, 403, 429}
+FATAL_ERROR_MARKERS = ("429", "RESOURCE_EXHAUSTED", "UNAUTHENTICATED", "PERMISSION_DENIED", "API_KEY_INVALID")
+
+# Yapılandırılmış çıktı şeması (Gemini JSON dışında bir şey döndüremez)
+ANALYSIS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "description": {"type": "STRING"},
+        "safety_score": {"type": "INTEGER", "minimum": 1, "maximum": 10},
+        "safe_to_remove": {"type": "BOOLEAN"},
+        "removal_impact": {"type": "STRING"},
+        "alternative_action": {"type": "STRING"},
+        "recommendation": {"type": "STRING"},
+    },
+    "required": [
+        "description", "safety_score", "safe_to_remove",
+        "removal_impact", "alternative_action", "recommendation",
+    ],
+}
+
+# Toplu analizde her öğe ayrıca paket adını taşır
+BATCH_ANALYSIS_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "package": {"type": "STRING"},
+            **ANALYSIS_SCHEMA["properties"],
+        },
+        "required": ["package", *ANALYSIS_SCHEMA["required"]],
+    },
+}
+
+
+def is_fatal_error(error: Exception) -> bool:
+    """Kota veya kimlik doğrulama hatası mı? (Diğer paketler de aynı hatayı alır)"""
+    if getattr(error, "code", None) in FATAL_ERROR_CODES:
+        return True
+    error_msg = str(error)
+    return any(marker in error_msg for marker in FATAL_ERROR_MARKERS)
+
+
+# Python 3.10+ dataclass'ları __slots__ ile oluşturabilir (örnek başına __dict__ yok)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class AIAnalysis:
     """AI paket analizi sonucu."""
     description: str  # Paketin ne işe yaradığı
@@ -39,13 +118,18 @@ class AIAnalysis:
     alternative_action: str  # Alternatif öneri
     recommendation: str  # Genel öneri
     is_cached: bool = False  # Cache'den mi geldi?
+    similar_to: Optional[str] = None  # Semantik cache: analizi ödünç alınan paket
+    # AICache'in BLOB hali (bir kez üretilir, tekrar yazmalarda yeniden kullanılır)
+    _packed: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
 
 
 class PackageAnalyzer:
     """
     Yapay zeka tabanlı paket analizci.
     
-    Google Gemini API kullanarak paketler hakkında bilgi sağlar.
+    Bir LLMProvider (varsayılan: Gemini) kullanarak paketler hakkında
+    bilgi sağlar. Batch API ve embedding gibi Gemini'ye özgü özellikler
+    yalnızca GeminiProvider ile çalışır.
     """
     
     # Sistem prompt'u
@@ -66,12 +150,23 @@ Kurallar:
 - Bloatware ve gereksiz uygulamalar için safe_to_remove: true ve safety_score: 8-10
 - Bilinmeyen paketler için ihtiyatlı ol, safety_score: 5
 - Her zaman geçerli JSON döndür, başka bir şey yazma"""
+    
+    # Toplu analiz isteği (sistem prompt'u system_instruction ile ayrıca gider)
+    BATCH_PROMPT = """Aşağıdaki paketleri analiz et. Yanıtını her paket için bir öğe
+içeren bir JSON Listesi olarak ver; "package" alanına paket adını yaz.
+
+Analiz edilecek paketler:
+- """
 
     def __init__(
         self, 
         api_key: Optional[str] = None,
         model: str = DEFAULT_MODEL,
-        cache_manager = None
+        cache_manager = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        semantic_cache = None,
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+        provider: Optional[LLMProvider] = None
     ):
         """
         Analyzer'ı başlat.
@@ -80,67 +175,173 @@ Kurallar:
             api_key: Google Gemini API anahtarı
             model: Kullanılacak model
             cache_manager: Cache yöneticisi (opsiyonel)
+            max_concurrency: Eşzamanlı istek sınırı (analyze_many için)
+            semantic_cache: Benzer paket adları için SemanticCache (opsiyonel)
+            requests_per_minute: Modelin RPM limiti (tüm thread'lerde ortak)
+            provider: LLM sağlayıcısı (None ise GeminiProvider)
         """
         self.api_key = api_key
-        self.model_name = model
         self.cache = cache_manager
-        self._client = None
+        self.max_concurrency = max(1, max_concurrency)
         
-        if api_key:
-            self._configure_gemini(api_key)
-    
-    def _configure_gemini(self, api_key: str):
-        """Gemini API'yi yapılandır."""
-        global GEMINI_AVAILABLE
+        # Uçuştaki istekler: aynı paket için ikinci bir API çağrısı yapılmaz,
+        # ilk isteğin sonucu beklenir (thread'ler ve event loop'lar arası)
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
         
-        try:
-            # Lazy import
-            from google import genai
-            GEMINI_AVAILABLE = True
-            
-            self._client = genai.Client(api_key=api_key)
-            logger.info(f"Gemini API yapılandırıldı: {self.model_name}")
-        except ImportError:
-            GEMINI_AVAILABLE = False
-            logger.warning("google-genai paketi yüklü değil. AI özellikleri devre dışı.")
-            self._client = None
-        except Exception as e:
-            logger.error(f"Gemini yapılandırma hatası: {e}")
-            self._client = None
+        # Tüm async işlerin çalıştığı kalıcı event loop (run_async)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        
+        self.provider = provider or GeminiProvider(
+            api_key=api_key,
+            model=model,
+            system_instruction=self.SYSTEM_PROMPT,
+        )
+        self._limiter = RateLimiter.per_minute(
+            requests_per_minute, capacity=self.max_concurrency
+        )
+        
+        # Semantik katman birebir cache'in üzerine kurulur, onsuz anlamsız
+        if semantic_cache and not (cache_manager and semantic_cache.is_available):
+            semantic_cache = None
+        self.semantic_cache = semantic_cache
+    
+    @property
+    def _client(self):
+        """Gemini istemcisi (Batch API ve embedding için), yoksa None."""
+        return getattr(self.provider, "client", None)
+    
+    @property
+    def model_name(self) -> str:
+        return self.provider.model_name
     
     @property
     def is_available(self) -> bool:
         """AI hizmeti kullanılabilir mi?"""
-        return self._client is not None
+        return self.provider.is_available
+    
+    def run_async(self, coro) -> Future:
+        """
+        Coroutine'i analyzer'ın kalıcı event loop'unda çalıştır.
+        
+        Sağlayıcının async istemcisi (client.aio) bağlantı havuzunu ilk
+        kullanıldığı loop'a bağlar; her çağrıda yeni loop açılırsa sonraki
+        taramalar "Event loop is closed" hatası alır. Bu yüzden tüm async
+        işler tek bir arka plan thread'indeki loop'ta yürür.
+        
+        Returns:
+            Future: Sonucu .result() ile beklenebilir (loop thread'inden değil)
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="AnalyzerLoop", daemon=True
+                ).start()
+                self._loop = loop
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
     
     def set_api_key(self, api_key: str):
         """API anahtarını ayarla."""
         self.api_key = api_key
         # API key varsa yapılandırmayı dene (bu modülü de yükler)
         if api_key:
-            self._configure_gemini(api_key)
+            self.provider.configure(api_key)
     
     def set_model(self, model: str):
         """Modeli değiştir."""
-        self.model_name = model
+        self.provider.set_model(model)
         logger.info(f"Model değiştirildi: {model}")
     
-    def analyze(self, package_name: str) -> Optional[AIAnalysis]:
+    def _get_cached(self, package_name: str) -> Optional[AIAnalysis]:
+        """Cache'de varsa analizi döndür."""
+        if not self.cache:
+            return None
+        
+        cached = self.cache.get(package_name)
+        if cached:
+            logger.debug(f"Cache'den alındı: {package_name}")
+            cached.is_cached = True
+        return cached
+    
+    def _get_similar(self, package_name: str, vector) -> Optional[AIAnalysis]:
+        """
+        Semantik cache'te benzer bir paket varsa onun analizini döndür.
+        
+        Sonuç similar_to ile işaretli bir kopyadır ve bu paket adıyla
+        cache'e yazılmaz: başka bir paketin kararı bu paketin kalıcı
+        analizi olmamalı.
+        """
+        match = self.semantic_cache.lookup(vector, package_name)
+        if not match:
+            return None
+        
+        similar_name, score = match
+        analysis = self.cache.get(similar_name)
+        if not analysis:
+            return None
+        
+        logger.debug(f"Semantik cache: {package_name} ~ {similar_name} ({score:.3f})")
+        return replace(analysis, is_cached=True, similar_to=similar_name)
+    
+    def _claim(self, package_names: List[str]) -> Tuple[List[str], Dict[str, Future]]:
+        """
+        Paketleri bu çağrı adına "uçuşta" olarak işaretle.
+        
+        Returns:
+            (claimed, waiting): Bu çağrının sorgulayacağı paketler ve başka
+            bir çağrının zaten sorguladığı paketlerin Future'ları
+        """
+        claimed = []
+        waiting = {}
+        with self._inflight_lock:
+            for name in package_names:
+                future = self._inflight.get(name)
+                if future is None:
+                    future = Future()
+                    # RUNNING durumundaki Future, bekleyen iptal edilince iptal olmaz
+                    future.set_running_or_notify_cancel()
+                    self._inflight[name] = future
+                    claimed.append(name)
+                else:
+                    waiting[name] = future
+        return claimed, waiting
+    
+    def _release(self, claimed: List[str], results: Dict[str, AIAnalysis]):
+        """Sahiplenilen paketleri bırak ve bekleyenlere sonucu ilet."""
+        with self._inflight_lock:
+            futures = [(name, self._inflight.pop(name, None)) for name in claimed]
+        
+        for name, future in futures:
+            if future is not None:
+                future.set_result(results.get(name))
+    
+    def _build_prompt(self, package_name: str) -> str:
+        """Tek paket için prompt oluştur (sadece değişen kısım)."""
+        return "Paket: " + package_name
+    
+    def analyze(
+        self,
+        package_name: str,
+        use_cache: bool = True,
+        priority: bool = False
+    ) -> Optional[AIAnalysis]:
         """
         Paketi analiz et.
         
         Args:
             package_name: Analiz edilecek paket adı
+            use_cache: False ise cache katmanları atlanır (zorla yenileme)
+            priority: True ise istek öncelikli katmanda gönderilir (kullanıcı bekliyor)
             
         Returns:
             AIAnalysis: Analiz sonucu veya None
         """
         # Önce cache'e bak
-        if self.cache:
-            cached = self.cache.get(package_name)
+        if use_cache:
+            cached = self._get_cached(package_name)
             if cached:
-                logger.debug(f"Cache'den alındı: {package_name}")
-                cached.is_cached = True
                 return cached
         
         # AI kullanılabilir değilse None dön
@@ -148,23 +349,49 @@ Kurallar:
             logger.warning("AI hizmeti kullanılamıyor")
             return None
         
+        # Aynı paket zaten sorgulanıyorsa onun sonucunu bekle
+        claimed, waiting = self._claim([package_name])
+        if waiting:
+            return waiting[package_name].result()
+        
+        analysis = None
+        try:
+            service_tier = INTERACTIVE_SERVICE_TIER if priority else None
+            analysis = self._fetch(package_name, use_cache, service_tier)
+        finally:
+            self._release(claimed, {package_name: analysis})
+        return analysis
+    
+    def _fetch(
+        self,
+        package_name: str,
+        use_cache: bool,
+        service_tier: Optional[str] = None
+    ) -> Optional[AIAnalysis]:
+        """Paketi semantik cache'ten veya API'den getir."""
+        vector = None
+        if self.semantic_cache and self._client:
+            vector = self.semantic_cache.embed(self._client, [package_name])
+            if use_cache and vector is not None:
+                similar = self._get_similar(package_name, vector[0])
+                if similar:
+                    return similar
+        
         try:
-            # Prompt oluştur
-            prompt = f"{self.SYSTEM_PROMPT}\n\nPaket: {package_name}"
+            self._limiter.acquire()
             
-            # Gemini'ye gönder (yeni basit API)
-            response = self._client.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
+            # Sağlayıcıya gönder
+            content = self.provider.complete(
+                self._build_prompt(package_name), ANALYSIS_SCHEMA, service_tier
             )
             
-            content = response.text
-            
             # JSON parse et
             analysis = self._parse_response(content)
             
             if analysis and self.cache:
                 self.cache.set(package_name, analysis)
+                if vector is not None:
+                    self.semantic_cache.add([package_name], vector)
             
             return analysis
             
@@ -172,47 +399,422 @@ Kurallar:
             logger.error(f"AI analizi başarısız ({package_name}): {e}")
             return None
     
-    def _parse_response(self, content: str) -> Optional[AIAnalysis]:
-        """API yanıtını parse et."""
+    async def _analyze_async(self, package_name: str) -> Optional[AIAnalysis]:
+        """analyze() metodunun asenkron karşılığı (client.aio kullanır)."""
+        cached = self._get_cached(package_name)
+        if cached:
+            return cached
+        
+        if not self.is_available:
+            return None
+        
+        claimed, waiting = self._claim([package_name])
+        if waiting:
+            return await asyncio.wrap_future(waiting[package_name])
+        
+        analysis = None
+        try:
+            analysis = await self._fetch_async(package_name)
+        finally:
+            self._release(claimed, {package_name: analysis})
+        return analysis
+    
+    async def _fetch_async(self, package_name: str) -> Optional[AIAnalysis]:
+        """_fetch() metodunun asenkron karşılığı."""
+        vector = None
+        if self.semantic_cache and self._client:
+            vector = await self.semantic_cache.embed_async(self._client, [package_name])
+            if vector is not None:
+                similar = self._get_similar(package_name, vector[0])
+                if similar:
+                    return similar
+        
+        try:
+            await self._limiter.acquire_async()
+            content = await self.provider.complete_async(
+                self._build_prompt(package_name), ANALYSIS_SCHEMA
+            )
+            
+            analysis = self._parse_response(content)
+            
+            if analysis and self.cache:
+                self.cache.set(package_name, analysis)
+                if vector is not None:
+                    self.semantic_cache.add([package_name], vector)
+            
+            return analysis
+            
+        except Exception as e:
+            logger.error(f"AI analizi başarısız ({package_name}): {e}")
+            # Kota/yetki hataları çağırana iletilir, toplu iş durabilsin
+            if is_fatal_error(e):
+                raise
+            return None
+    
+    async def analyze_many_async(
+        self,
+        package_names: list,
+        progress_callback=None
+    ) -> Dict[str, AIAnalysis]:
+        """
+        Paketleri eşzamanlı olarak analiz et.
+        
+        İstekler asyncio.gather ile aynı anda gönderilir, uçuştaki istek
+        sayısı max_concurrency ile sınırlandırılır. Böylece toplam süre
+        N × RTT yerine yaklaşık N / max_concurrency × RTT olur.
+        
+        Args:
+            package_names: Paket adları listesi
+            progress_callback: Her paket bittiğinde (current, total, name) ile çağrılır
+            
+        Returns:
+            Dict[str, AIAnalysis]: Paket adı -> Analiz sonucu
+            
+        Raises:
+            Exception: Kota/yetki hatası (is_fatal_error); kalan istekler iptal edilir
+        """
+        results: Dict[str, AIAnalysis] = {}
+        package_names = list(dict.fromkeys(package_names))
+        total = len(package_names)
+        if not total:
+            return results
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        completed = 0
+        
+        async def run_one(name: str):
+            nonlocal completed
+            try:
+                async with semaphore:
+                    analysis = await self._analyze_async(name)
+            except Exception as e:
+                if is_fatal_error(e):
+                    raise
+                logger.error(f"AI analizi başarısız ({name}): {e}")
+                analysis = None
+            
+            if analysis:
+                results[name] = analysis
+            
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, total, name)
+        
+        tasks = [asyncio.ensure_future(run_one(name)) for name in package_names]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception:
+            # Kota/yetki hatası: kalan istekler de aynı hatayı alacağı için iptal
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return results
+    
+    def analyze_many(self, package_names: list, progress_callback=None) -> Dict[str, AIAnalysis]:
+        """
+        analyze_many_async için senkron sarmalayıcı.
+        
+        İş run_async ile kalıcı loop'ta yürür ve sonucu beklenir; bu
+        yüzden o loop içinden değil, worker thread'lerden çağrılmalıdır.
+        """
+        return self.run_async(self.analyze_many_async(package_names, progress_callback)).result()
+    
+    def submit_batch_job(self, package_names: list) -> Optional[str]:
+        """
+        Paketleri Gemini Batch API'ye gönder.
+        
+        Batch API yarı fiyatına çalışır ve normal RPM limitine takılmaz,
+        ancak sonuçlar dakikalar/saatler içinde gelir. Bu yüzden yalnızca
+        arka plan taraması gibi beklemeye dayanıklı işler için kullanılır.
+        
+        Args:
+            package_names: Paket adları listesi
+            
+        Returns:
+            str: Batch iş adı (poll_batch_job için) veya None
+        """
+        if not self._client or not package_names:
+            return None
+        
+        # Her satır bir istek: key ile sonuçlar paketlere eşlenir
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for pkg in package_names:
+                    line = {
+                        "key": pkg,
+                        "request": {
+                            "contents": [{"parts": [{"text": self._build_prompt(pkg)}]}],
+                            "system_instruction": {"parts": [{"text": self.SYSTEM_PROMPT}]},
+                            "generation_config": {
+                                "response_mime_type": "application/json",
+                                "response_schema": ANALYSIS_SCHEMA,
+                            },
+                        },
+                    }
+                    f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            
+            uploaded = self._client.files.upload(
+                file=path,
+                config={"display_name": "adbui-batch", "mime_type": "jsonl"},
+            )
+            job = self._client.batches.create(
+                model=self.model_name,
+                src=uploaded.name,
+                config={"display_name": "adbui-batch"},
+            )
+            logger.info(f"Batch işi gönderildi: {job.name} ({len(package_names)} paket)")
+            return job.name
+            
+        except Exception as e:
+            logger.error(f"Batch işi gönderilemedi: {e}")
+            return None
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def poll_batch_job(self, job_name: str) -> Optional[Dict[str, AIAnalysis]]:
+        """
+        Batch işinin durumunu kontrol et.
+        
+        Args:
+            job_name: submit_batch_job'un döndürdüğü iş adı
+            
+        Returns:
+            None: İş hâlâ sürüyor
+            Dict[str, AIAnalysis]: İş bitti (başarısızsa boş); sonuçlar cache'e yazılır
+        """
+        job = self._client.batches.get(name=job_name)
+        state = job.state.name if job.state else ""
+        
+        if state in BATCH_FAILED_STATES:
+            logger.error(f"Batch işi başarısız: {job_name} ({state})")
+            return {}
+        
+        if state not in BATCH_DONE_STATES:
+            return None
+        
+        results: Dict[str, AIAnalysis] = {}
+        if not job.dest or not job.dest.file_name:
+            logger.warning(f"Batch işi sonuç dosyası yok: {job_name}")
+            return results
+        
+        content = self._client.files.download(file=job.dest.file_name)
+        
+        for line in content.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                pkg_name = item.get("key")
+                parts = item["response"]["candidates"][0]["content"]["parts"]
+                text = "".join(part.get("text", "") for part in parts)
+            except (json.JSONDecodeError, KeyError, IndexError, TypeError):
+                logger.debug(f"Batch sonuç satırı atlandı: {line[:200]}")
+                continue
+            
+            analysis = self._parse_response(text)
+            if pkg_name and analysis:
+                results[pkg_name] = analysis
+        
+        if self.cache:
+            self.cache.set_many(results.items())
+        
+        logger.info(f"Batch işi tamamlandı: {job_name} ({len(results)} sonuç)")
+        return results
+    
+    def warm_semantic_cache(
+        self,
+        package_names: Optional[list] = None,
+        should_stop: Optional[Callable[[], bool]] = None,
+        poll_interval: int = 30
+    ) -> int:
+        """
+        Daha önce analiz edilmiş paketleri semantik indekse ekle.
+        
+        Az sayıda eksik için tek embed_content isteği, çok sayıda eksik için
+        (yarı fiyatına) Embeddings Batch API kullanılır. İndeks sonunda
+        diske kaydedilir. Batch işi beklendiği için bloklayıcıdır; worker
+        thread'den çağrılmalıdır.
+        
+        Args:
+            package_names: Paket adları (None ise cache'deki tüm paketler)
+            should_stop: True döndürürse bekleme bırakılır ve iş iptal edilir
+            poll_interval: Batch işi sorgulama aralığı (saniye)
+            
+        Returns:
+            int: İndekse eklenen paket sayısı
+        """
+        if not self.semantic_cache or not self._client:
+            return 0
+        
+        if package_names is None:
+            package_names = self.cache.package_names()
+        
+        missing = self.semantic_cache.missing(package_names)
+        added = 0
+        
+        if len(missing) > EMBED_BATCH_THRESHOLD:
+            missing, vectors = self._embed_with_batch_job(missing, should_stop, poll_interval)
+        elif missing:
+            vectors = self.semantic_cache.embed(self._client, missing)
+        else:
+            vectors = None
+        
+        if vectors is not None and missing:
+            self.semantic_cache.add(missing, vectors)
+            added = len(missing)
+            logger.info(f"Semantik indeks güncellendi: {added} paket")
+        
+        self.semantic_cache.save()
+        return added
+    
+    def _embed_with_batch_job(self, names: list, should_stop, poll_interval: int):
+        """
+        Embedding'leri Embeddings Batch API ile al.
+        
+        Returns:
+            (names, vectors): Embedding'i gelen paketler ve normalize matris
+            (başarısızsa vectors None)
+        """
         try:
-            # JSON bloğunu bul
-            content = content.strip()
-            
-            # Markdown code block içinde olabilir
-            if '```' in content:
-                lines = content.split('\n')
-                json_lines = []
-                in_block = False
-                for line in lines:
-                    if line.strip().startswith('```'):
-                        in_block = not in_block
-                        continue
-                    if in_block:
-                        json_lines.append(line)
-                content = '\n'.join(json_lines)
-            
-            # JSON'u bul (süslü parantezler arası)
-            start = content.find('{')
-            end = content.rfind('}') + 1
-            if start != -1 and end > start:
-                content = content[start:end]
-            
-            data = json.loads(content)
-            
-            return AIAnalysis(
-                description=data.get('description', 'Açıklama yok'),
-                safety_score=int(data.get('safety_score', 5)),
-                safe_to_remove=bool(data.get('safe_to_remove', False)),
-                removal_impact=data.get('removal_impact', 'Bilinmiyor'),
-                alternative_action=data.get('alternative_action', 'Yok'),
-                recommendation=data.get('recommendation', 'Dikkatli olun')
+            job = self._client.batches.create_embeddings(
+                model=EMBEDDING_MODEL,
+                src={
+                    "inlined_requests": {
+                        "contents": names,
+                        "config": {"output_dimensionality": self.semantic_cache.dimensions},
+                    }
+                },
+                config={"display_name": "adbui-embeddings"},
             )
+            logger.info(f"Embedding batch işi gönderildi: {job.name} ({len(names)} paket)")
             
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON parse hatası: {e}\nİçerik: {content[:200]}")
+            while True:
+                job = self._client.batches.get(name=job.name)
+                state = job.state.name if job.state else ""
+                
+                if state in BATCH_DONE_STATES:
+                    break
+                if state in BATCH_FAILED_STATES:
+                    logger.error(f"Embedding batch işi başarısız: {job.name} ({state})")
+                    return names, None
+                
+                # Durdurma isteğine hızlı tepki için saniye saniye bekle
+                for _ in range(poll_interval):
+                    if should_stop and should_stop():
+                        self.cancel_batch_job(job.name)
+                        return names, None
+                    time.sleep(1)
+            
+            # Yanıtlar istek sırasıyla gelir
+            found_names = []
+            values = []
+            responses = job.dest.inlined_embed_content_responses if job.dest else None
+            for name, item in zip(names, responses or []):
+                if item.response and item.response.embedding:
+                    found_names.append(name)
+                    values.append(item.response.embedding.values)
+            
+            if not values:
+                return names, None
+            return found_names, self.semantic_cache.normalize(values)
+            
+        except Exception as e:
+            logger.error(f"Embedding batch işi başarısız: {e}")
+            return names, None
+    
+    def cancel_batch_job(self, job_name: str):
+        """Batch işini iptal et."""
+        try:
+            self._client.batches.cancel(name=job_name)
+            logger.info(f"Batch işi iptal edildi: {job_name}")
+        except Exception as e:
+            logger.warning(f"Batch işi iptal edilemedi: {e}")
+    
+    @staticmethod
+    def _to_analysis(data: Dict[str, Any]) -> AIAnalysis:
+        """Şemaya uygun JSON nesnesinden AIAnalysis oluştur."""
+        return AIAnalysis(
+            description=data.get('description', 'Açıklama yok'),
+            safety_score=int(data.get('safety_score', 5)),
+            safe_to_remove=bool(data.get('safe_to_remove', False)),
+            removal_impact=data.get('removal_impact', 'Bilinmiyor'),
+            alternative_action=data.get('alternative_action', 'Yok'),
+            recommendation=data.get('recommendation', 'Dikkatli olun')
+        )
+    
+    def _parse_response(self, content: str) -> Optional[AIAnalysis]:
+        """API yanıtını parse et (response_schema sayesinde saf JSON)."""
+        try:
+            return self._to_analysis(json.loads(content))
+        except (json.JSONDecodeError, TypeError, ValueError, AttributeError) as e:
+            logger.error(f"JSON parse hatası: {e}\nİçerik: {str(content)[:200]}")
             return None
     
     
+    def _split_cached(self, package_names: list):
+        """
+        Cache'de olanları ayır.
+        
+        Returns:
+            (results, packages_to_ask): Cache'ten gelenler ve sorulacaklar
+        """
+        if not self.cache:
+            return {}, list(package_names)
+        
+        results = self.cache.get_many(package_names)
+        for cached in results.values():
+            cached.is_cached = True
+        
+        packages_to_ask = [pkg for pkg in package_names if pkg not in results]
+        return results, packages_to_ask
+    
+    def _split_similar(self, packages_to_ask: list, embedded, results: dict):
+        """
+        Semantik cache'te benzeri olanları results'a ekle.
+        
+        Returns:
+            (remaining, vectors): Hâlâ sorulacaklar ve onların embedding'leri
+        """
+        if embedded is None:
+            return packages_to_ask, {}
+        
+        remaining = []
+        vectors = {}
+        for pkg, vector in zip(packages_to_ask, embedded):
+            similar = self._get_similar(pkg, vector)
+            if similar:
+                results[pkg] = similar
+            else:
+                vectors[pkg] = vector
+                remaining.append(pkg)
+        return remaining, vectors
+    
+    def _store_batch(self, batch_results: dict, results: dict, vectors: dict):
+        """Toplu analiz sonuçlarını cache'e, semantik indekse ve results'a yaz."""
+        results.update(batch_results)
+        
+        if not self.cache:
+            return
+        
+        self.cache.set_many(batch_results.items())
+        
+        # Yeni analiz edilenleri semantik indekse ekle
+        indexed_names = []
+        indexed_vectors = []
+        for pkg_name in batch_results:
+            vector = vectors.get(pkg_name)
+            if vector is not None:
+                indexed_names.append(pkg_name)
+                indexed_vectors.append(vector)
+        
+        if indexed_names:
+            self.semantic_cache.add(indexed_names, indexed_vectors)
+    
     def analyze_multiple(self, package_names: list) -> Dict[str, AIAnalysis]:
         """
         Birden fazla paketi tek bir API isteği ile analiz et (Batch Prompt).
@@ -226,133 +828,199 @@ Kurallar:
         # AI kullanılabilir değilse boş dön
         if not self.is_available or not package_names:
             return {}
-            
-        # Zaten cache'de olanları ele
-        results = {}
-        packages_to_ask = []
         
-        if self.cache:
-            for pkg in package_names:
-                cached = self.cache.get(pkg)
-                if cached:
-                    results[pkg] = cached
-                    cached.is_cached = True
-                else:
-                    packages_to_ask.append(pkg)
-        else:
-            packages_to_ask = package_names
+        # Tekrarları ele (sıra korunur), zaten cache'de olanları ayır
+        results, packages_to_ask = self._split_cached(list(dict.fromkeys(package_names)))
+        
+        # Başka bir çağrının sorguladığı paketler için tekrar istek atma
+        claimed, waiting = self._claim(packages_to_ask)
+        
+        try:
+            self._ask_multiple(claimed, results)
+        finally:
+            self._release(claimed, results)
+        
+        for name, future in waiting.items():
+            analysis = future.result()
+            if analysis:
+                results[name] = analysis
+        
+        return results
+    
+    def _ask_multiple(self, packages_to_ask: List[str], results: Dict[str, AIAnalysis]):
+        """Cache'te olmayan paketleri tek istekle sor, sonuçları results'a ekle."""
+        # Benzer paketleri semantik cache'ten karşıla (tek embedding isteği)
+        vectors = {}
+        if self.semantic_cache and self._client and packages_to_ask:
+            embedded = self.semantic_cache.embed(self._client, packages_to_ask)
+            packages_to_ask, vectors = self._split_similar(packages_to_ask, embedded, results)
             
         if not packages_to_ask:
-            return results
+            return
             
         try:
             # Batch prompt oluştur
-            pkg_list_str = "\n".join([f"- {pkg}" for pkg in packages_to_ask])
+            prompt = self.BATCH_PROMPT + "\n- ".join(packages_to_ask)
             
-            prompt = f"""{self.SYSTEM_PROMPT}
-
-Aşağıdaki paketleri analiz et. Yanıtını bir JSON Listesi olarak ver.
-Örnek:
-[
-  {{ "package": "com.ornek.paket", "description": "...", "safety_score": 5, ... }},
-  {{ "package": "com.diger.paket", ... }}
-]
-
-Analiz edilecek paketler:
-{pkg_list_str}"""
+            # Sağlayıcıya gönder
+            self._limiter.acquire()
+            content = self.provider.complete(prompt, BATCH_ANALYSIS_SCHEMA)
             
-            # Gemini'ye gönder
-            response = self._client.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-            )
+            # JSON parse et, cache'e kaydet ve results'a ekle
+            self._store_batch(self._parse_batch_response(content), results, vectors)
             
-            content = response.text
+        except Exception as e:
+            logger.error(f"Toplu AI analizi başarısız: {e}")
+            raise e
+    
+    async def analyze_multiple_async(
+        self,
+        package_names: list,
+        on_result: Optional[Callable[[str, AIAnalysis], None]] = None,
+        service_tier: Optional[str] = BACKGROUND_SERVICE_TIER
+    ) -> Dict[str, AIAnalysis]:
+        """
+        analyze_multiple() metodunun asenkron karşılığı.
+        
+        Yanıt akış (stream) olarak alınır; on_result verilmişse her paketin
+        analizi, JSON listesindeki nesnesi tamamlanır tamamlanmaz bildirilir.
+        Görev iptal edilirse (CancelledError) istek yarıda bırakılır.
+        
+        Args:
+            package_names: Paket adları listesi
+            on_result: Her sonuç için (paket_adı, analiz) ile bir kez çağrılır
+            service_tier: Servis katmanı (varsayılan: arka plan için flex)
+        """
+        if not self.is_available or not package_names:
+            return {}
+        
+        reported = set()
+        
+        def report(name: str, analysis: AIAnalysis):
+            if on_result and name not in reported:
+                reported.add(name)
+                on_result(name, analysis)
+        
+        results, packages_to_ask = self._split_cached(list(dict.fromkeys(package_names)))
+        claimed, waiting = self._claim(packages_to_ask)
+        
+        try:
+            await self._ask_multiple_async(claimed, results, report, service_tier)
+        finally:
+            self._release(claimed, results)
+        
+        for name, future in waiting.items():
+            analysis = await asyncio.wrap_future(future)
+            if analysis:
+                results[name] = analysis
+        
+        # Akıştan gelmeyenler (cache, semantik cache, başka çağrı)
+        for name, analysis in results.items():
+            report(name, analysis)
+        
+        return results
+    
+    async def _ask_multiple_async(
+        self,
+        packages_to_ask: List[str],
+        results: Dict[str, AIAnalysis],
+        report: Callable[[str, AIAnalysis], None],
+        service_tier: Optional[str] = None
+    ):
+        """_ask_multiple() metodunun asenkron karşılığı (akışlı)."""
+        vectors = {}
+        if self.semantic_cache and self._client and packages_to_ask:
+            embedded = await self.semantic_cache.embed_async(self._client, packages_to_ask)
+            packages_to_ask, vectors = self._split_similar(packages_to_ask, embedded, results)
+        
+        if not packages_to_ask:
+            return
+        
+        try:
+            prompt = self.BATCH_PROMPT + "\n- ".join(packages_to_ask)
             
-            # JSON parse et
-            batch_results = self._parse_batch_response(content)
+            await self._limiter.acquire_async()
             
-            # Cache'e kaydet ve results'a ekle
-            for pkg_name, analysis in batch_results.items():
-                if self.cache:
-                    self.cache.set(pkg_name, analysis)
-                results[pkg_name] = analysis
+            # Akış geldikçe tamamlanan nesneleri hemen işle
+            decoder = json.JSONDecoder()
+            buffer = ""
+            pos = 0
+            stream = self.provider.stream_async(prompt, BATCH_ANALYSIS_SCHEMA, service_tier)
+            async for text in stream:
+                buffer += text
+                items, pos = self._drain_json_items(buffer, pos, decoder)
                 
-            return results
+                batch_results = self._items_to_results(items)
+                self._store_batch(batch_results, results, vectors)
+                for name, analysis in batch_results.items():
+                    report(name, analysis)
+            
+            if not buffer.rstrip().endswith("]"):
+                logger.warning(f"Akış yanıtı eksik bitti: {buffer[-200:]}")
             
         except Exception as e:
             logger.error(f"Toplu AI analizi başarısız: {e}")
             raise e
 
     def _parse_batch_response(self, content: str) -> Dict[str, AIAnalysis]:
-        """Batch API yanıtını parse et."""
-        results = {}
-        raw_content = content
-        
+        """Batch API yanıtını parse et (response_schema sayesinde saf JSON listesi)."""
         try:
-            # JSON temizle
-            content = content.strip()
-            
-            # Markdown block temizliği
-            if '```' in content:
-                lines = content.split('\n')
-                json_lines = []
-                in_block = False
-                found_block = False
-                
-                for line in lines:
-                    stripped = line.strip()
-                    if stripped.startswith('```'):
-                        in_block = not in_block
-                        continue
-                    if in_block:
-                        json_lines.append(line)
-                        found_block = True
-                
-                if found_block:
-                    content = '\n'.join(json_lines)
+            data_list = json.loads(content)
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.error(f"JSON Decode hatası: {e}")
+            logger.debug(f"Hatalı İçerik: {content}")
+            return {}
+        
+        if not isinstance(data_list, list):
+            logger.warning(f"API yanıtı liste değil: {type(data_list)}")
+            return {}
+        
+        return self._items_to_results(data_list)
+    
+    @staticmethod
+    def _drain_json_items(buffer: str, pos: int, decoder: json.JSONDecoder):
+        """
+        Akışla gelen JSON listesinden tamamlanmış nesneleri çıkar.
+        
+        Args:
+            buffer: Şimdiye kadar gelen metin
+            pos: Önceki çağrıda kalınan konum
             
-            # JSON Array bul ([...])
-            start = content.find('[')
-            end = content.rfind(']') + 1
+        Returns:
+            (items, pos): Tamamlanan nesneler ve yeni konum
+        """
+        items = []
+        length = len(buffer)
+        while True:
+            # Liste başı, virgüller ve boşlukları atla
+            while pos < length and buffer[pos] in " \t\r\n,[":
+                pos += 1
+            if pos >= length or buffer[pos] != "{":
+                return items, pos
             
-            if start == -1 or end <= start:
-                logger.warning(f"Batch yanıtta JSON listesi ([...]) bulunamadı. Raw: {raw_content[:200]}")
-                return {}
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Nesne henüz tamamlanmadı, sonraki parçayı bekle
+                return items, pos
             
-            content = content[start:end]
+            if isinstance(item, dict):
+                items.append(item)
+    
+    def _items_to_results(self, data_list: list) -> Dict[str, AIAnalysis]:
+        """Şemaya uygun JSON nesnelerini paket adı -> analiz sözlüğüne çevir."""
+        results = {}
+        for item in data_list:
+            pkg_name = item.get('package')
+            if not pkg_name:
+                continue
             
             try:
-                data_list = json.loads(content)
-            except json.JSONDecodeError as je:
-                logger.error(f"JSON Decode hatası: {je}")
-                return {}
-            
-            if not isinstance(data_list, list):
-                logger.warning(f"API yanıtı liste değil: {type(data_list)}")
-                return {}
-            
-            for item in data_list:
-                pkg_name = item.get('package')
-                if not pkg_name:
-                    continue
-                    
-                analysis = AIAnalysis(
-                    description=item.get('description', 'Açıklama yok'),
-                    safety_score=int(item.get('safety_score', 5)),
-                    safe_to_remove=bool(item.get('safe_to_remove', False)),
-                    removal_impact=item.get('removal_impact', 'Bilinmiyor'),
-                    alternative_action=item.get('alternative_action', 'Yok'),
-                    recommendation=item.get('recommendation', 'Dikkatli olun')
-                )
-                results[pkg_name] = analysis
-                
-            return results
-            
-        except Exception as e:
-            logger.error(f"Batch JSON genel hata: {e}")
-            logger.debug(f"Hatalı İçerik: {raw_content}")
-            return {}
+                results[pkg_name] = self._to_analysis(item)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Batch öğesi atlandı ({pkg_name}): {e}")
+        
+        return results
 
     def analyze_batch(
         self, 
@@ -362,19 +1030,10 @@ Analiz edilecek paketler:
         """
         Birden fazla paketi analiz et (Eski metod).
         
+        Artık istekleri sırayla değil, analyze_many ile eşzamanlı gönderir.
+        
         Args:
             package_names: Paket adları listesi
             progress_callback: İlerleme callback fonksiyonu
         """
-        results = {}
-        total = len(package_names)
-        
-        for i, name in enumerate(package_names):
-            analysis = self.analyze(name)
-            if analysis:
-                results[name] = analysis
-            
-            if progress_callback:
-                progress_callback(i + 1, total, name)
-        
-        return results
+        return self.analyze_many(package_names, progress_callback)
@@ -4,9 +4,9 @@ Background Analyzer
 Arka planda toplu paket analizi yapar.
 """
 
-import time
+import asyncio
 import logging
-from typing import List
+from typing import List, Optional
 from PySide6.QtCore import QThread, Signal
 
 from .analyzer import PackageAnalyzer, AIAnalysis
@@ -15,12 +15,41 @@ from ..core.package_manager import Package
 
 logger = logging.getLogger(__name__)
 
+# Batch API açıksa bu sayının üzerindeki taramalar Batch API'ye gönderilir
+BATCH_API_THRESHOLD = 50
+
+# Batch işi durum sorgulama aralığı (saniye)
+BATCH_POLL_INTERVAL = 30
+
+
+def _is_quota_error(error: Exception) -> bool:
+    """Kota hatası mı? (429 RESOURCE_EXHAUSTED)"""
+    error_msg = str(error)
+    return "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg
+
+
+def _is_lost_job_error(error: Exception) -> bool:
+    """Batch işi artık erişilemez mi? (silinmiş veya başka bir API anahtarına ait)"""
+    if getattr(error, "code", None) in (403, 404):
+        return True
+    error_msg = str(error)
+    return "NOT_FOUND" in error_msg or "PERMISSION_DENIED" in error_msg
+
 
 class BackgroundAnalyzerThread(QThread):
     """
     Arka planda paket analizi yapan thread.
     
-    Paketleri 10'arlı gruplar halinde analiz eder.
+    Analiz, analyzer'ın kalıcı event loop'unda (run_async) yürür; thread
+    sonucu bekler. Her tarama için yeni loop açılmaz, çünkü sağlayıcının
+    async istemcisi ilk loop'a bağlı kalır. Paketler batch_size'lık
+    gruplar halinde, analyzer.max_concurrency kadar grup aynı anda uçuşta
+    olacak şekilde analiz edilir. stop() çağrıldığında bekleyen istekler
+    hemen iptal edilir.
+    
+    use_batch_api açıksa büyük taramalar Batch API'ye gönderilir. İş adı
+    AICache'te saklanır; durdurmada iş iptal edilmez, sonucu bir sonraki
+    taramada beklenmeye devam edilir.
     Her analiz tamamlandığında sinyal gönderir.
     """
     
@@ -30,84 +59,214 @@ class BackgroundAnalyzerThread(QThread):
     batch_completed = Signal(int)  # completed_count
     all_completed = Signal(int)  # total_analyzed
     error_occurred = Signal(str)  # error message
+    batch_job_pending = Signal(int)  # Batch API sonucu beklenen paket sayısı
     
-    def __init__(self, packages: List[Package], analyzer: PackageAnalyzer, 
-                 cache: AICache, batch_size: int = 20, parent=None):
+    def __init__(self, packages: List[Package], analyzer: PackageAnalyzer,
+                 cache: AICache, batch_size: int = 20, use_batch_api: bool = False,
+                 parent=None):
         super().__init__(parent)
         
         self.packages = packages
         self.analyzer = analyzer
         self.cache = cache
         self.batch_size = batch_size
+        self.use_batch_api = use_batch_api
         self._stop_requested = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
     
     def run(self):
         """Thread ana fonksiyonu."""
+        self.analyzer.run_async(self._run_async()).result()
+    
+    async def _run_async(self):
+        """Asıl analiz akışı (analyzer'ın event loop'unda çalışır)."""
+        self._stop_event = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        try:
+            if not self._stop_requested:
+                await self._analyze_all()
+        finally:
+            self._loop = None
+    
+    async def _analyze_all(self):
+        """Cache'te olmayan paketleri analiz et ve semantik indeksi tamamla."""
         total = len(self.packages)
-        analyzed = 0
-        skipped = 0
         
         logger.info(f"Arka plan analizi başladı: {total} paket")
         
-        # Cache'de olmayan paketleri filtrele
-        packages_to_analyze = []
-        for pkg in self.packages:
-            cached = self.cache.get(pkg.name)
-            if cached:
-                skipped += 1
-            else:
-                packages_to_analyze.append(pkg)
+        # Cache'de olmayan paketleri filtrele (tek sorgu)
+        hit_map = self.cache.get_many(pkg.name for pkg in self.packages)
+        packages_to_analyze = [pkg for pkg in self.packages if pkg.name not in hit_map]
+        skipped = total - len(packages_to_analyze)
         
         logger.info(f"{skipped} paket cache'den alındı, {len(packages_to_analyze)} paket analiz edilecek")
         
-        # Batch'ler halinde işle
-        for i in range(0, len(packages_to_analyze), self.batch_size):
-            if self._stop_requested:
-                logger.info("Arka plan analizi durduruldu")
-                break
+        # Önceki oturumdan kalan iş varsa yeni iş gönderilmez, sonucu beklenir
+        job = self.cache.pending_batch_job()
+        
+        # Büyük taramalar için Batch API (yarı fiyat, RPM limiti yok; isteğe bağlı)
+        if job is None and self.use_batch_api and len(packages_to_analyze) > BATCH_API_THRESHOLD:
+            names = [pkg.name for pkg in packages_to_analyze]
+            job_name = await asyncio.to_thread(self.analyzer.submit_batch_job, names)
+            if job_name:
+                self.cache.save_batch_job(job_name, names)
+                job = (job_name, names)
+            else:
+                logger.warning("Batch API kullanılamadı, normal analize geçiliyor")
+        
+        # İşteki paketler ayrıca (ikinci kez ücret ödenerek) analiz edilmez
+        waiting = []
+        if job is not None:
+            in_job = set(job[1])
+            waiting = [pkg.name for pkg in packages_to_analyze if pkg.name in in_job]
+            packages_to_analyze = [pkg for pkg in packages_to_analyze if pkg.name not in in_job]
+        
+        analyzed = await self._run_batches(packages_to_analyze, skipped, total)
+        
+        if job is not None and not self._stop_event.is_set():
+            self.batch_job_pending.emit(len(waiting))
+            analyzed += await self._wait_batch_job(job[0], waiting, skipped + analyzed, total)
+        
+        self.all_completed.emit(analyzed)
+        logger.info(f"Arka plan analizi tamamlandı: {analyzed} yeni, {skipped} cache'den")
+        
+        # Semantik indekste eksik kalan paketleri tamamla (sonraki açılışta hazır olur)
+        if not self._stop_event.is_set():
+            try:
+                await asyncio.to_thread(
+                    self.analyzer.warm_semantic_cache,
+                    None,
+                    lambda: self._stop_requested
+                )
+            except Exception as e:
+                logger.warning(f"Semantik indeks güncellenemedi: {e}")
+    
+    async def _run_batches(self, packages: List[Package], skipped: int, total: int) -> int:
+        """
+        Paketleri gruplar halinde eşzamanlı analiz et.
+        
+        Returns:
+            int: Analiz edilen paket sayısı
+        """
+        analyzed = 0
+        semaphore = asyncio.Semaphore(self.analyzer.max_concurrency)
+        
+        async def run_batch(batch: List[Package]):
+            names = [pkg.name for pkg in batch]
+            requested = set(names)
             
-            batch = packages_to_analyze[i:i + self.batch_size]
-            batch_names = [pkg.name for pkg in batch]
+            # Sonuçlar akıştan geldikçe (batch bitmeden) arayüze iletilir
+            def on_result(name: str, analysis: AIAnalysis):
+                nonlocal analyzed
+                if name in requested:
+                    analyzed += 1
+                    self.package_analyzed.emit(name, analysis)
+                    self.progress_updated.emit(analyzed + skipped, total)
             
-            try:
-                # Toplu AI analizi yap (Tek istek = 10 paket)
-                results = self.analyzer.analyze_multiple(batch_names)
-                
-                if results:
-                    for pkg in batch:
-                        if pkg.name in results:
-                            analysis = results[pkg.name]
-                            analyzed += 1
-                            self.package_analyzed.emit(pkg.name, analysis)
-                else:
-                    logger.warning(f"Batch analizi ({i}) boş sonuç döndü. Parse hatası detayları için loglara bakın.")
-
-                # Progress güncelle
-                self.progress_updated.emit(analyzed + skipped, total)
+            async with semaphore:
+                return await self.analyzer.analyze_multiple_async(names, on_result)
+        
+        pending = {
+            asyncio.ensure_future(run_batch(packages[i:i + self.batch_size]))
+            for i in range(0, len(packages), self.batch_size)
+        }
+        stop_task = asyncio.ensure_future(self._stop_event.wait())
+        
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending | {stop_task},
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if stop_task in done:
+                    logger.info("Arka plan analizi durduruldu")
+                    break
                 
-                # Batch tamamlandı
-                self.batch_completed.emit(analyzed)
+                pending -= done
+                quota_exceeded = False
                 
-            except Exception as e:
-                error_msg = str(e)
-                logger.error(f"Batch analiz hatası: {e}")
+                for task in done:
+                    try:
+                        results = task.result()
+                    except Exception as e:
+                        logger.error(f"Batch analiz hatası: {e}")
+                        
+                        if _is_quota_error(e):
+                            quota_exceeded = True
+                        else:
+                            self.error_occurred.emit(str(e))
+                        continue
+                    
+                    if not results:
+                        logger.warning("Batch analizi boş sonuç döndü. Parse hatası detayları için loglara bakın.")
+                    
+                    # Batch tamamlandı
+                    self.batch_completed.emit(analyzed)
                 
-                # Kota hatası kontrolü (429 RESOURCE_EXHAUSTED)
-                if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
+                if quota_exceeded:
                     logger.warning("AI Kotası aşıldı (Kritik), analiz durduruluyor.")
                     self.error_occurred.emit("⚠️ AI Kotası Doldu! Analiz Durduruldu.")
-                    # Döngüyü kır ve işlemi bitir (Sürekli deneyip uygulamayı yormaması için)
+                    # Sürekli deneyip uygulamayı yormaması için kalanları iptal et
                     break
+        finally:
+            stop_task.cancel()
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(stop_task, *pending, return_exceptions=True)
+        
+        return analyzed
+    
+    async def _wait_batch_job(self, job_name: str, names: List[str], done: int, total: int) -> int:
+        """
+        Batch API işinin sonucunu bekle.
+        
+        Durdurulursa iş iptal edilmez; AICache'te kayıtlı kalır ve bir
+        sonraki taramada beklemeye devam edilir.
+        
+        Returns:
+            int: Sonucu gelen (bu taramadaki) paket sayısı
+        """
+        wanted = set(names)
+        
+        while not self._stop_event.is_set():
+            try:
+                results = await asyncio.to_thread(self.analyzer.poll_batch_job, job_name)
+            except Exception as e:
+                logger.error(f"Batch işi sorgulanamadı: {e}")
+                if _is_lost_job_error(e):
+                    self.cache.remove_batch_job(job_name)
+                self.error_occurred.emit(str(e))
+                return 0
+            
+            if results is not None:
+                # İş bitti (başarısızsa boş); eksikler sonraki taramada normal analiz edilir
+                self.cache.remove_batch_job(job_name)
+                for name, analysis in results.items():
+                    self.package_analyzed.emit(name, analysis)
                 
-                self.error_occurred.emit(error_msg)
+                found = len(wanted.intersection(results))
+                self.progress_updated.emit(done + found, total)
+                self.batch_completed.emit(found)
+                return found
             
-            # Rate limit koruması (5 RPM = 12sn/istek)
-            if not self._stop_requested and i + self.batch_size < len(packages_to_analyze):
-                time.sleep(15)
+            # Bir sonraki sorguya kadar bekle; stop() beklemeyi hemen keser
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), BATCH_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
         
-        self.all_completed.emit(analyzed)
-        logger.info(f"Arka plan analizi tamamlandı: {analyzed} yeni, {skipped} cache'den")
+        logger.info(f"Arka plan analizi durduruldu, Batch işi sonraki taramada beklenecek: {job_name}")
+        return 0
     
     def stop(self):
-        """Thread'i durdur."""
+        """Thread'i durdur (herhangi bir thread'den çağrılabilir)."""
         self._stop_requested = True
+        
+        loop = self._loop
+        if loop is not None and self._stop_event is not None:
+            try:
+                loop.call_soon_threadsafe(self._stop_event.set)
+            except RuntimeError:
+                # Loop zaten kapandı
+                pass
@@ -7,21 +7,123 @@ AI yanıtlarını SQLite'da saklar.
 import sqlite3
 import json
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import replace
 from pathlib import Path
-from typing import Optional
-from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional, Dict, Iterable, List, Tuple
 import logging
 
+if TYPE_CHECKING:
+    # Çalışma anında döngüsel import olmaması için metot içinde import edilir
+    from .analyzer import AIAnalysis
+
 logger = logging.getLogger(__name__)
 
+# Tek sorguda kullanılacak maksimum parametre (eski SQLite sürümlerinde limit 999)
+MAX_QUERY_PARAMS = 900
+
+# UPDATE ... RETURNING desteği (SQLite 3.35+)
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Sayfa boyutu: büyük sayfalar B-tree'yi sığlaştırır. Yeni dosyada WAL'dan
+# önce ayarlanmalıdır; mevcut dosyalar _init_db'de bir kez dönüştürülür.
+PAGE_SIZE = 8192
+
+# Bağlantı açılırken bir kez uygulanan ayarlar (sıra önemli)
+CONNECTION_PRAGMAS = (
+    f"page_size={PAGE_SIZE}",
+    "journal_mode=WAL",         # Okuyucular yazıcıyı beklemez
+    "synchronous=NORMAL",       # WAL ile güvenli; her commit'te fsync yok
+    "wal_autocheckpoint=1000",  # WAL ~1000 sayfada bir ana dosyaya aktarılır
+    "busy_timeout=5000",        # Başka bağlantı yazarken hemen hata verme
+    "temp_store=MEMORY",
+    "cache_size=-10000",        # ~10 MB sayfa cache'i
+    "mmap_size=268435456",      # 256 MB'a kadar okuma mmap ile (sanal bellek, RSS değil)
+)
+
+# PRAGMA user_version ile tutulan şema sürümü
+#   0: analysis_json TEXT (anahtarlı JSON nesnesi)
+#   1: analysis_blob BLOB (alan sırasına göre kompakt JSON dizisi, UTF-8)
+#   2: created_at / accessed_at INTEGER (unix epoch, saniye)
+SCHEMA_VERSION = 2
+
+# Sorgu planlayıcı istatistiklerinin tazelenme aralığı (saniye)
+OPTIMIZE_INTERVAL = 15 * 60
+
+# Yazıcı thread'in ilk kayıttan sonra diğerlerini toplamak için beklediği süre (saniye)
+WRITE_BATCH_WINDOW = 0.05
+
+# Yazıcı thread'i durdurma işareti
+_STOP_WRITER = object()
+
+# Bellekte tutulan en fazla analiz (sık bakılan paketler SQLite'a inmez)
+MEMORY_CACHE_SIZE = 1024
+
+# İstatistiklerde "yeni" sayılan kayıtların yaşı (saniye)
+RECENT_WINDOW_SECONDS = 7 * 24 * 3600
+
+# BLOB içindeki alanların sırası (AIAnalysis alan sırasıyla aynı)
+PAYLOAD_FIELDS = (
+    'description',
+    'safety_score',
+    'safe_to_remove',
+    'removal_impact',
+    'alternative_action',
+    'recommendation',
+)
+
+# Şu anki unix zamanı; SQLite tarafında hesaplanır (unixepoch() 3.38+ gerektirir)
+_SQL_NOW = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+# Zaman damgaları INSERT'te verilmez, varsayılan değerle dolar
+_CREATE_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS analysis_cache (
+        package_name TEXT PRIMARY KEY,
+        analysis_blob BLOB NOT NULL,
+        created_at INTEGER DEFAULT ({_SQL_NOW}),
+        accessed_at INTEGER DEFAULT ({_SQL_NOW})
+    )
+"""
+
+# Gönderilmiş Batch API işleri: uygulama kapansa da sonuç sonraki açılışta alınır
+_CREATE_BATCH_JOBS_SQL = f"""
+    CREATE TABLE IF NOT EXISTS batch_jobs (
+        job_name TEXT PRIMARY KEY,
+        package_names TEXT NOT NULL,
+        created_at INTEGER DEFAULT ({_SQL_NOW})
+    )
+"""
+
 
 class AICache:
     """
     AI analiz sonuçlarını cache'leyen sınıf.
     
     SQLite veritabanı kullanarak paket analizlerini saklar.
+    Tek bir kalıcı bağlantı tüm thread'ler arasında bir kilitle paylaşılır.
+    
+    Dayanıklılık: WAL + synchronous=NORMAL ile commit'ler fsync beklemez;
+    elektrik kesintisinde son birkaç kayıt kaybolabilir. Cache yeniden
+    üretilebilir olduğu için bu kabul edilebilir.
+    
+    Yazmalar bir kuyruğa atılır ve tek bir arka plan thread'i tarafından
+    gruplar halinde (tek işlemde) diske yazılır; set() fsync beklemez.
+    
+    Son kullanılan analizler ayrıca bellekte (LRU) tutulur. Dönen AIAnalysis
+    nesneleri bu katmanla paylaşılır ve is_cached=True işaretlidir;
+    çağıranlar alanlarını değiştirmemelidir.
+    
+    Uygulama genelinde instance() ile tek bir örnek paylaşılır; böylece
+    bellek katmanı ve bağlantı tüm pencerelerde ortaktır.
     """
     
+    _instance: Optional["AICache"] = None
+    _instance_lock = threading.Lock()
+    
     def __init__(self, cache_dir: Optional[str] = None):
         """
         Cache'i başlat.
@@ -37,27 +139,222 @@ class AICache:
         cache_dir.mkdir(parents=True, exist_ok=True)
         self.db_path = cache_dir / "ai_cache.db"
         
+        # Autocommit modu: tek ifadeler hemen yazılır, çoklu ifadeler _transaction ile
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        self._lock = threading.Lock()
+        
+        # Paket adı -> AIAnalysis (en son kullanılan sonda)
+        self._mem: "OrderedDict[str, AIAnalysis]" = OrderedDict()
+        self._mem_lock = threading.Lock()
+        
+        self._closed = False
+        self._optimize_timer: Optional[threading.Timer] = None
+        
         self._init_db()
+        self._schedule_optimize()
+        
+        # Her öğe: [(paket adı, AIAnalysis), ...]
+        self._write_queue: "queue.Queue" = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="AICacheWriter", daemon=True
+        )
+        self._writer.start()
+    
+    @classmethod
+    def instance(cls) -> "AICache":
+        """Varsayılan dizindeki paylaşılan cache'i döndür (kapatıldıysa yeniden açar)."""
+        with cls._instance_lock:
+            if cls._instance is None or cls._instance._closed:
+                cls._instance = cls()
+            return cls._instance
+    
+    @contextmanager
+    def _locked(self):
+        """Kalıcı bağlantıyı kilit altında kullan."""
+        with self._lock:
+            yield self._conn
+    
+    @contextmanager
+    def _transaction(self):
+        """Kilit altında tek bir işlem (BEGIN ... COMMIT) aç."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
     
     def _init_db(self):
-        """Veritabanını oluştur."""
-        with sqlite3.connect(self.db_path) as conn:
-            # Performans ve eşzamanlılık için WAL modu
-            conn.execute("PRAGMA journal_mode=WAL;")
+        """Veritabanını oluştur ve gerekiyorsa şemayı güncelle."""
+        with self._locked() as conn:
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(f"PRAGMA {pragma}")
             
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS analysis_cache (
-                    package_name TEXT PRIMARY KEY,
-                    analysis_json TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION and self._has_table(conn):
+                self._migrate(conn, version)
+            
+            conn.execute(_CREATE_TABLE_SQL)
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_created_at 
                 ON analysis_cache(created_at)
             """)
-            conn.commit()
+            conn.execute(_CREATE_BATCH_JOBS_SQL)
+            if version < SCHEMA_VERSION:
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            
+            if conn.execute("PRAGMA page_size").fetchone()[0] != PAGE_SIZE:
+                self._convert_page_size(conn)
+    
+    @staticmethod
+    def _convert_page_size(conn):
+        """
+        Mevcut veritabanını PAGE_SIZE sayfalarla yeniden yaz.
+        
+        WAL modunda sayfa boyutu değişmez; geçici olarak DELETE moduna
+        geçilip VACUUM yapılır. Başka bir bağlantı açıksa atlanır.
+        """
+        try:
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.execute(f"PRAGMA page_size={PAGE_SIZE}")
+            conn.execute("VACUUM")
+            logger.info(f"AI cache sayfa boyutu {PAGE_SIZE} olarak güncellendi")
+        except sqlite3.OperationalError as e:
+            logger.debug(f"Sayfa boyutu değiştirilemedi: {e}")
+        finally:
+            conn.execute("PRAGMA journal_mode=WAL")
+    
+    def _schedule_optimize(self):
+        """Bir sonraki PRAGMA optimize çalışmasını zamanla."""
+        timer = threading.Timer(OPTIMIZE_INTERVAL, self._optimize)
+        timer.daemon = True
+        self._optimize_timer = timer
+        timer.start()
+    
+    def _optimize(self):
+        """Planlayıcı istatistiklerini tazele ve yeniden zamanla."""
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.debug(f"PRAGMA optimize başarısız: {e}")
+        self._schedule_optimize()
+    
+    def close(self):
+        """
+        Bekleyen yazmaları bitir, zamanlayıcıyı durdur ve bağlantıyı kapat.
+        
+        Birden fazla çağrılabilir.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        
+        self._write_queue.put(_STOP_WRITER)
+        self._writer.join()
+        
+        with self._lock:
+            if self._optimize_timer is not None:
+                self._optimize_timer.cancel()
+            try:
+                # Kapanışta önerilen: ihtiyaç varsa istatistikleri güncelle
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            self._conn.close()
+    
+    @staticmethod
+    def _has_table(conn) -> bool:
+        """analysis_cache tablosu var mı?"""
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'analysis_cache'"
+        ).fetchone()
+        return row is not None
+    
+    def _migrate(self, conn, version: int):
+        """
+        Eski şemadaki tabloyu güncel şemaya taşı.
+        
+        Tablo tek işlemde yeniden oluşturulur:
+          - sürüm < 1: analysis_json TEXT -> analysis_blob BLOB
+          - sürüm < 2: ISO-8601 (yerel saat) metin zamanlar -> unix epoch
+        Okunamayan eski satırlar atlanır (bir sonraki analizde yeniden üretilirler).
+        """
+        payload_column = "analysis_json" if version < 1 else "analysis_blob"
+        if version < 2:
+            # datetime.now().isoformat() yerel saattir; 'utc' ile epoch'a çevrilir
+            timestamps = ", ".join(
+                f"CAST(strftime('%s', {column}, 'utc') AS INTEGER)"
+                for column in ("created_at", "accessed_at")
+            )
+        else:
+            timestamps = "created_at, accessed_at"
+        
+        now = int(time.time())
+        
+        conn.execute("BEGIN")
+        try:
+            rows = conn.execute(
+                f"SELECT package_name, {payload_column}, {timestamps} FROM analysis_cache"
+            ).fetchall()
+            
+            migrated = []
+            for package_name, payload, created_at, accessed_at in rows:
+                if version < 1:
+                    try:
+                        data = json.loads(payload)
+                        payload = self._pack([data[field] for field in PAYLOAD_FIELDS])
+                    except Exception:
+                        continue
+                migrated.append((package_name, payload, created_at or now, accessed_at or now))
+            
+            conn.execute("ALTER TABLE analysis_cache RENAME TO analysis_cache_old")
+            conn.execute(_CREATE_TABLE_SQL)
+            conn.executemany(
+                """
+                INSERT INTO analysis_cache 
+                (package_name, analysis_blob, created_at, accessed_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                migrated
+            )
+            conn.execute("DROP TABLE analysis_cache_old")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        
+        logger.info(
+            f"AI cache şeması güncellendi (v{version} -> v{SCHEMA_VERSION}): "
+            f"{len(migrated)}/{len(rows)} kayıt taşındı"
+        )
+    
+    def _mem_get(self, package_name: str):
+        """Bellek katmanından analiz al (yoksa None)."""
+        with self._mem_lock:
+            analysis = self._mem.get(package_name)
+            if analysis is not None:
+                self._mem.move_to_end(package_name)
+            return analysis
+    
+    def _mem_put(self, items: Iterable[Tuple[str, "AIAnalysis"]]):
+        """Analizleri bellek katmanına ekle, kapasite aşılırsa en eskiyi at."""
+        with self._mem_lock:
+            for package_name, analysis in items:
+                self._mem[package_name] = analysis
+                self._mem.move_to_end(package_name)
+            while len(self._mem) > MEMORY_CACHE_SIZE:
+                self._mem.popitem(last=False)
     
     def get(self, package_name: str):
         """
@@ -69,39 +366,136 @@ class AICache:
         Returns:
             AIAnalysis veya None
         """
+        analysis = self._mem_get(package_name)
+        if analysis is not None:
+            return analysis
+        
         # Gecikmeli import (circular import önlemi)
         from .analyzer import AIAnalysis
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                """
-                SELECT analysis_json, created_at 
-                FROM analysis_cache 
-                WHERE package_name = ?
-                """,
-                (package_name,)
-            )
-            row = cursor.fetchone()
-            
-            if not row:
-                return None
-            
-            analysis_json, created_at = row
-            
-            # Erişim zamanını güncelle
-            conn.execute(
-                "UPDATE analysis_cache SET accessed_at = ? WHERE package_name = ?",
-                (datetime.now().isoformat(), package_name)
-            )
-            conn.commit()
+        if HAS_RETURNING:
+            # Erişim zamanını güncelle ve satırı tek ifadede oku
+            with self._locked() as conn:
+                row = conn.execute(
+                    f"""
+                    UPDATE analysis_cache SET accessed_at = {_SQL_NOW}
+                    WHERE package_name = ?
+                    RETURNING analysis_blob
+                    """,
+                    (package_name,)
+                ).fetchone()
+        else:
+            with self._transaction() as conn:
+                row = conn.execute(
+                    "SELECT analysis_blob FROM analysis_cache WHERE package_name = ?",
+                    (package_name,)
+                ).fetchone()
+                
+                if row:
+                    # Erişim zamanını güncelle
+                    conn.execute(
+                        f"UPDATE analysis_cache SET accessed_at = {_SQL_NOW} WHERE package_name = ?",
+                        (package_name,)
+                    )
+        
+        if not row:
+            return None
+        
+        # BLOB'dan AIAnalysis oluştur (kilit dışında)
+        try:
+            analysis = AIAnalysis(*json.loads(row[0]), is_cached=True)
+        except Exception as e:
+            logger.error(f"Cache parse hatası: {e}")
+            return None
+        analysis._packed = row[0]
+        
+        self._mem_put([(package_name, analysis)])
+        return analysis
+    
+    def get_many(self, package_names: Iterable[str]) -> Dict[str, "AIAnalysis"]:
+        """
+        Birden fazla paketin analizini tek sorguda al.
+        
+        Args:
+            package_names: Paket adları
             
-            # JSON'dan AIAnalysis oluştur
-            try:
-                data = json.loads(analysis_json)
-                return AIAnalysis(**data)
-            except Exception as e:
-                logger.error(f"Cache parse hatası: {e}")
-                return None
+        Returns:
+            Dict[str, AIAnalysis]: Cache'de bulunanlar (paket adı -> analiz)
+        """
+        # Gecikmeli import (circular import önlemi)
+        from .analyzer import AIAnalysis
+        
+        results = {}
+        names = []
+        for package_name in dict.fromkeys(package_names):
+            analysis = self._mem_get(package_name)
+            if analysis is not None:
+                results[package_name] = analysis
+            else:
+                names.append(package_name)
+        if not names:
+            return results
+        
+        loaded = []
+        
+        with self._transaction() as conn:
+            for i in range(0, len(names), MAX_QUERY_PARAMS):
+                chunk = names[i:i + MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                
+                rows = conn.execute(
+                    f"""
+                    SELECT package_name, analysis_blob
+                    FROM analysis_cache
+                    WHERE package_name IN ({placeholders})
+                    """,
+                    chunk
+                ).fetchall()
+                
+                found = []
+                for package_name, payload in rows:
+                    try:
+                        analysis = AIAnalysis(*json.loads(payload), is_cached=True)
+                        analysis._packed = payload
+                        results[package_name] = analysis
+                        loaded.append((package_name, analysis))
+                        found.append(package_name)
+                    except Exception as e:
+                        logger.error(f"Cache parse hatası ({package_name}): {e}")
+                
+                # Erişim zamanını güncelle
+                if found:
+                    conn.execute(
+                        f"""
+                        UPDATE analysis_cache SET accessed_at = {_SQL_NOW}
+                        WHERE package_name IN ({",".join("?" * len(found))})
+                        """,
+                        found
+                    )
+        
+        self._mem_put(loaded)
+        return results
+    
+    @staticmethod
+    def _pack(values: list) -> bytes:
+        """Alan değerlerini kompakt JSON dizisi olarak UTF-8 byte'lara çevir."""
+        return json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    
+    @classmethod
+    def _serialize(cls, analysis) -> bytes:
+        """
+        AIAnalysis'i BLOB'a çevir.
+        
+        Anahtar adları her satırda tekrarlanmaz; alanlar PAYLOAD_FIELDS
+        sırasıyla yazılır ve okurken AIAnalysis(*değerler) ile açılır.
+        Sonuç nesnenin _packed alanında saklanır; aynı nesne tekrar
+        yazılırsa JSON yeniden üretilmez.
+        """
+        packed = analysis._packed
+        if packed is None:
+            packed = cls._pack([getattr(analysis, field) for field in PAYLOAD_FIELDS])
+            analysis._packed = packed
+        return packed
     
     def set(self, package_name: str, analysis) -> bool:
         """
@@ -114,67 +508,161 @@ class AICache:
         Returns:
             bool: Başarılı mı?
         """
-        try:
-            analysis_dict = {
-                'description': analysis.description,
-                'safety_score': analysis.safety_score,
-                'safe_to_remove': analysis.safe_to_remove,
-                'removal_impact': analysis.removal_impact,
-                'alternative_action': analysis.alternative_action,
-                'recommendation': analysis.recommendation,
-            }
+        return self.set_many([(package_name, analysis)])
+    
+    def set_many(self, items: Iterable[Tuple[str, "AIAnalysis"]]) -> bool:
+        """
+        Birden fazla analizi cache'e kaydet.
+        
+        Analizler hemen bellek katmanına girer (sonraki get() görür);
+        diske yazma arka plan thread'inde, aynı pencerede gelen diğer
+        kayıtlarla birlikte tek işlemde yapılır.
+        
+        Args:
+            items: (paket adı, AIAnalysis) çiftleri
             
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
+        Returns:
+            bool: Kayıt kuyruğa alındı mı? (cache kapalıysa False)
+        """
+        if self._closed:
+            return False
+        
+        # Çağıranın nesnesi paylaşılmaz; cache kendi kopyasını tutar.
+        # BLOB burada (bir kez) üretilir ve kopyaya taşınır.
+        entries = []
+        for package_name, analysis in items:
+            packed = self._serialize(analysis)
+            copy = replace(analysis, is_cached=True)
+            copy._packed = packed
+            entries.append((package_name, copy))
+        if not entries:
+            return True
+        
+        self._mem_put(entries)
+        self._write_queue.put(entries)
+        return True
+    
+    def flush(self):
+        """Kuyruktaki tüm yazmalar diske geçene kadar bekle."""
+        if not self._closed:
+            self._write_queue.join()
+    
+    def _writer_loop(self):
+        """Kuyruktaki yazmaları gruplar halinde diske aktar (yazıcı thread)."""
+        while True:
+            batch = [self._write_queue.get()]
+            if batch[0] is not _STOP_WRITER:
+                # Aynı anda gelen diğer kayıtları da bu işleme kat
+                time.sleep(WRITE_BATCH_WINDOW)
+            while True:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            rows = []
+            for item in batch:
+                if item is _STOP_WRITER:
+                    continue
+                rows.extend(
+                    (package_name, analysis._packed)
+                    for package_name, analysis in item
+                )
+            if rows:
+                self._write_rows(rows)
+            
+            for _ in batch:
+                self._write_queue.task_done()
+            if any(item is _STOP_WRITER for item in batch):
+                return
+    
+    def _write_rows(self, rows: list):
+        """Satırları tek işlemde yaz (aynı hazırlanmış ifade executemany ile)."""
+        try:
+            with self._transaction() as conn:
+                conn.executemany(
                     """
                     INSERT OR REPLACE INTO analysis_cache 
-                    (package_name, analysis_json, created_at, accessed_at)
-                    VALUES (?, ?, ?, ?)
+                    (package_name, analysis_blob)
+                    VALUES (?, ?)
                     """,
-                    (
-                        package_name,
-                        json.dumps(analysis_dict, ensure_ascii=False),
-                        datetime.now().isoformat(),
-                        datetime.now().isoformat()
-                    )
+                    rows
                 )
-                conn.commit()
-            
-            logger.debug(f"Cache'e kaydedildi: {package_name}")
-            return True
-            
+            logger.debug(f"Cache'e kaydedildi: {len(rows)} paket")
         except Exception as e:
             logger.error(f"Cache kayıt hatası: {e}")
-            return False
     
     def delete(self, package_name: str) -> bool:
         """Cache'den sil."""
+        # Kuyrukta bekleyen bir yazma silinen satırı geri getirmesin
+        self.flush()
+        with self._mem_lock:
+            self._mem.pop(package_name, None)
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._locked() as conn:
                 conn.execute(
                     "DELETE FROM analysis_cache WHERE package_name = ?",
                     (package_name,)
                 )
-                conn.commit()
             return True
         except Exception:
             return False
     
     def clear(self) -> bool:
         """Tüm cache'i temizle."""
+        self.flush()
+        with self._mem_lock:
+            self._mem.clear()
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._locked() as conn:
                 conn.execute("DELETE FROM analysis_cache")
-                conn.commit()
             logger.info("Cache temizlendi")
             return True
         except Exception as e:
             logger.error(f"Cache temizleme hatası: {e}")
             return False
     
+    def is_empty(self) -> bool:
+        """Cache'de hiç kayıt yok mu? (tabloyu saymadan, ilk satıra bakar)"""
+        self.flush()
+        with self._locked() as conn:
+            return conn.execute("SELECT 1 FROM analysis_cache LIMIT 1").fetchone() is None
+    
+    def save_batch_job(self, job_name: str, package_names: List[str]):
+        """Gönderilen Batch API işini kaydet (sonucu alınana kadar saklanır)."""
+        with self._locked() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO batch_jobs (job_name, package_names) VALUES (?, ?)",
+                (job_name, json.dumps(package_names))
+            )
+    
+    def pending_batch_job(self) -> Optional[Tuple[str, List[str]]]:
+        """Sonucu henüz alınmamış en eski Batch API işi: (iş adı, paketler) veya None."""
+        with self._locked() as conn:
+            row = conn.execute(
+                "SELECT job_name, package_names FROM batch_jobs ORDER BY created_at LIMIT 1"
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+    
+    def remove_batch_job(self, job_name: str):
+        """Sonucu alınan (veya artık erişilemeyen) Batch API işini sil."""
+        with self._locked() as conn:
+            conn.execute("DELETE FROM batch_jobs WHERE job_name = ?", (job_name,))
+    
+    def package_names(self) -> list:
+        """Cache'deki tüm paket adlarını döndür."""
+        self.flush()
+        with self._locked() as conn:
+            return [row[0] for row in conn.execute("SELECT package_name FROM analysis_cache")]
+    
     def get_stats(self) -> dict:
         """Cache istatistiklerini al."""
-        with sqlite3.connect(self.db_path) as conn:
+        self.flush()
+        with self._locked() as conn:
             cursor = conn.execute("SELECT COUNT(*) FROM analysis_cache")
             total = cursor.fetchone()[0]
             
@@ -183,7 +671,7 @@ class AICache:
                 SELECT COUNT(*) FROM analysis_cache 
                 WHERE created_at > ?
                 """,
-                ((datetime.now() - timedelta(days=7)).isoformat(),)
+                (int(time.time()) - RECENT_WINDOW_SECONDS,)
             )
             recent = cursor.fetchone()[0]
         
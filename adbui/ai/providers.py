@@ -0,0 +1,238 @@
+"""
+LLM Providers
+=============
+PackageAnalyzer'ın kullandığı dil modeli sağlayıcıları.
+
+Analyzer yalnızca LLMProvider arayüzünü bilir; prompt, cache ve parse
+mantığı sağlayıcıdan bağımsızdır. Yeni bir servis eklemek için bu
+sınıftan türetmek yeterlidir.
+"""
+
+import importlib.util
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any, AsyncIterator
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Google GenAI paketi (Lazy import yapılacak)
+GEMINI_AVAILABLE = None  # İlk kullanımda kontrol edilecek
+
+# Eşzamanlı isteklerin TCP/TLS bağlantılarını yeniden kullanabilmesi için havuz boyutu
+HTTP_MAX_CONNECTIONS = 64
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 32
+
+
+def is_gemini_installed() -> bool:
+    """
+    google-genai paketi yüklü mü?
+
+    Paketi import etmeden (find_spec ile) kontrol eder; AI kapalıyken
+    SDK'nın yükleme maliyeti ödenmez.
+    """
+    global GEMINI_AVAILABLE
+
+    if GEMINI_AVAILABLE is None:
+        try:
+            GEMINI_AVAILABLE = importlib.util.find_spec("google.genai") is not None
+        except (ImportError, ValueError):
+            GEMINI_AVAILABLE = False
+    return GEMINI_AVAILABLE
+
+
+class LLMProvider(ABC):
+    """Dil modeli sağlayıcısı için ortak arayüz."""
+
+    def __init__(self, model: str, system_instruction: str = ""):
+        self.model_name = model
+        self.system_instruction = system_instruction
+
+    @property
+    @abstractmethod
+    def is_available(self) -> bool:
+        """Sağlayıcı istek göndermeye hazır mı?"""
+
+    @abstractmethod
+    def configure(self, api_key: str):
+        """API anahtarı ile istemciyi (yeniden) oluştur."""
+
+    def set_model(self, model: str):
+        """Modeli değiştir."""
+        self.model_name = model
+
+    @abstractmethod
+    def complete(
+        self,
+        prompt: str,
+        schema: Optional[Dict[str, Any]] = None,
+        service_tier: Optional[str] = None
+    ) -> str:
+        """
+        Prompt'u gönder ve yanıt metnini döndür.
+
+        Args:
+            prompt: Kullanıcı mesajı (sistem talimatı hariç)
+            schema: Yanıtın uyması gereken JSON şeması (opsiyonel)
+            service_tier: "priority" / "standard" / "flex" (destekleyen
+                sağlayıcılarda; None ise varsayılan)
+        """
+
+    @abstractmethod
+    async def complete_async(
+        self,
+        prompt: str,
+        schema: Optional[Dict[str, Any]] = None,
+        service_tier: Optional[str] = None
+    ) -> str:
+        """complete() metodunun asenkron karşılığı."""
+
+    async def stream_async(
+        self,
+        prompt: str,
+        schema: Optional[Dict[str, Any]] = None,
+        service_tier: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Yanıt metnini geldikçe parça parça döndür.
+
+        Akış desteklemeyen sağlayıcılar için varsayılan: tek parça.
+        """
+        yield await self.complete_async(prompt, schema, service_tier)
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini (google-genai) sağlayıcısı."""
+
+    def __init__(self, api_key: Optional[str] = None, model: str = "", system_instruction: str = ""):
+        super().__init__(model, system_instruction)
+        self.client = None
+        self._api_key: Optional[str] = None
+        # (şema, servis katmanı) başına bir kez oluşturulan GenerateContentConfig'ler
+        self._configs: Dict[tuple, Any] = {}
+
+        if api_key:
+            self.configure(api_key)
+
+    @property
+    def is_available(self) -> bool:
+        return self.client is not None
+
+    def configure(self, api_key: str):
+        """Gemini API'yi yapılandır (anahtar değişmediyse mevcut istemci korunur)."""
+        global GEMINI_AVAILABLE
+
+        # İstemciyi yeniden oluşturmak bağlantı havuzunu da çöpe atar
+        if self.client is not None and api_key == self._api_key:
+            return
+
+        if not is_gemini_installed():
+            logger.warning("google-genai paketi yüklü değil. AI özellikleri devre dışı.")
+            self.client = None
+            return
+
+        try:
+            # Lazy import
+            from google import genai
+
+            # Eski istemci kapatılmaz: arka plan analizinde uçuşta istek olabilir
+            self.client = genai.Client(api_key=api_key, http_options=self._http_options())
+            self._api_key = api_key
+            self._configs = {}
+
+            logger.info(f"Gemini API yapılandırıldı: {self.model_name}")
+        except ImportError:
+            GEMINI_AVAILABLE = False
+            logger.warning("google-genai paketi yüklü değil. AI özellikleri devre dışı.")
+            self.client = None
+        except Exception as e:
+            logger.error(f"Gemini yapılandırma hatası: {e}")
+            self.client = None
+
+    @staticmethod
+    def _http_options():
+        """
+        SDK'nın httpx istemcileri için bağlantı havuzu ayarları.
+
+        Eski google-genai sürümlerinde client_args yoksa None döner
+        (SDK varsayılanları kullanılır).
+        """
+        from google.genai import types
+
+        if "async_client_args" not in types.HttpOptions.model_fields:
+            return None
+
+        # google-genai'nin kendi bağımlılığı
+        import httpx
+
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        )
+        return types.HttpOptions(
+            client_args={"limits": limits},
+            async_client_args={"limits": limits},
+        )
+
+    def _config_for(self, schema: Optional[Dict[str, Any]], service_tier: Optional[str] = None):
+        """
+        Şemaya ve servis katmanına ait GenerateContentConfig'i döndür.
+
+        Sabit sistem prompt'u her istekte metne gömülmez; system_instruction
+        olarak gider, böylece Gemini'nin örtük prefix cache'i devreye girer.
+        """
+        key = (id(schema), service_tier)
+        config = self._configs.get(key)
+        if config is None:
+            from google.genai import types
+
+            kwargs = {"system_instruction": self.system_instruction or None}
+            if schema is not None:
+                kwargs["response_mime_type"] = "application/json"
+                kwargs["response_schema"] = schema
+            # Eski google-genai sürümlerinde service_tier alanı yok
+            if service_tier and "service_tier" in types.GenerateContentConfig.model_fields:
+                kwargs["service_tier"] = service_tier
+            config = types.GenerateContentConfig(**kwargs)
+            self._configs[key] = config
+        return config
+
+    def complete(
+        self,
+        prompt: str,
+        schema: Optional[Dict[str, Any]] = None,
+        service_tier: Optional[str] = None
+    ) -> str:
+        response = self.client.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config=self._config_for(schema, service_tier),
+        )
+        return response.text
+
+    async def complete_async(
+        self,
+        prompt: str,
+        schema: Optional[Dict[str, Any]] = None,
+        service_tier: Optional[str] = None
+    ) -> str:
+        response = await self.client.aio.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config=self._config_for(schema, service_tier),
+        )
+        return response.text
+
+    async def stream_async(
+        self,
+        prompt: str,
+        schema: Optional[Dict[str, Any]] = None,
+        service_tier: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model_name,
+            contents=prompt,
+            config=self._config_for(schema, service_tier),
+        )
+        async for chunk in stream:
+            if chunk.text:
+                yield chunk.text
@@ -0,0 +1,109 @@
+"""
+Rate Limiter Module
+===================
+API istekleri için token bucket hız sınırlayıcı.
+"""
+
+import time
+import asyncio
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket.
+
+    Kova saniyede rate_per_sec token ile dolar, en fazla capacity token
+    biriktirir. Her istek bir token harcar; token yoksa eksik kadar beklenir.
+    Aynı örnek UI thread'i, arka plan thread'i ve asyncio görevleri
+    arasında paylaşılabilir.
+
+    acquire() kullanıcının beklediği tekil istekler içindir ve token'ı
+    borç olarak ayırır. acquire_async() arka plan istekleri içindir:
+    borç almaz ve kovada BACKGROUND_HEADROOM kadar pay bırakır, böylece
+    tekil istekler arka plan kuyruğunun arkasında beklemez.
+    """
+
+    # Arka plan isteklerinin tekil istekler için kovada bıraktığı token
+    BACKGROUND_HEADROOM = 1.0
+
+    def __init__(self, rate_per_sec: float, capacity: float = 1.0):
+        """
+        Limiter'ı başlat.
+
+        Args:
+            rate_per_sec: Saniye başına izin verilen istek
+            capacity: Anlık patlama (burst) için biriktirilebilecek token
+        """
+        self.rate_per_sec = rate_per_sec
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, rpm: int, capacity: float = 1.0) -> "RateLimiter":
+        """Dakika başına istek (RPM) değerinden limiter oluştur."""
+        return cls(max(1, rpm) / 60.0, capacity)
+
+    def _refill(self) -> None:
+        """Geçen süre kadar token ekle (kilit altında çağrılır)."""
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.last) * self.rate_per_sec
+        )
+        self.last = now
+
+    def _reserve(self) -> float:
+        """
+        Bir token ayır ve beklenmesi gereken süreyi döndür.
+
+        Token borç olarak düşülür, böylece bekleyen çağıranlar sırayla
+        (FIFO'ya yakın) ve kovayı fazla doldurmadan uyanır.
+        """
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate_per_sec
+
+    def _try_take(self, minimum: float) -> float:
+        """
+        Kovada en az minimum token varsa birini al.
+
+        Returns:
+            0 (token alındı) veya yeniden denemeden önce beklenecek süre
+        """
+        with self._lock:
+            self._refill()
+            if self.tokens >= minimum:
+                self.tokens -= 1
+                return 0.0
+            return (minimum - self.tokens) / self.rate_per_sec
+
+    def acquire(self) -> None:
+        """Token alınana kadar thread'i beklet."""
+        wait = self._reserve()
+        if wait > 0:
+            logger.debug(f"Rate limit: {wait:.2f}sn bekleniyor")
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """
+        Token alınana kadar event loop'u bloklamadan bekle (arka plan).
+
+        Beklerken token ayrılmaz; görev iptal edilirse kova borçlu kalmaz.
+        """
+        minimum = min(self.capacity, 1.0 + self.BACKGROUND_HEADROOM)
+        while True:
+            wait = self._try_take(minimum)
+            if wait <= 0:
+                return
+            logger.debug(f"Rate limit: {wait:.2f}sn bekleniyor")
+            await asyncio.sleep(wait)
@@ -0,0 +1,290 @@
+"""
+Semantic Cache Module
+=====================
+Paket adlarının embedding'leri üzerinden benzer paket araması yapar.
+
+Birebir cache (AICache) ıskaladığında, aynı üreticiye ait ve adı çok
+benzeyen bir paket varsa onun analizi "benzer paket" olarak gösterilir;
+bu sonuç yeni paket adıyla cache'e yazılmaz. NumPy opsiyoneldir, yüklü
+değilse bu katman devre dışı kalır.
+"""
+
+import os
+import json
+import threading
+import importlib.util
+import logging
+from pathlib import Path
+from typing import List, Optional, Tuple, Iterable
+
+logger = logging.getLogger(__name__)
+
+# NumPy (Lazy import yapılacak)
+NUMPY_AVAILABLE = None  # İlk kullanımda kontrol edilecek
+
+EMBEDDING_MODEL = "gemini-embedding-001"
+EMBEDDING_DIMENSIONS = 768
+
+# Bu benzerliğin altındaki eşleşmeler ıskalama sayılır. Yanlış eşleşme
+# kritik bir paketi "kaldırılabilir" gösterebileceği için eşik yüksek tutulur.
+DEFAULT_THRESHOLD = 0.97
+
+# Eşleşme yalnızca aynı üretici önekini (com.samsung, com.google...) taşıyan
+# paketler arasında aranır
+VENDOR_PREFIX_PARTS = 2
+
+# Kalıcı indeks dosyaları (cache dizininde)
+MATRIX_FILENAME = "embeddings.npy"
+META_FILENAME = "embeddings.json"
+
+
+def vendor_prefix(package_name: str) -> str:
+    """Paket adının üretici öneki (ilk iki bileşen)."""
+    return ".".join(package_name.split(".")[:VENDOR_PREFIX_PARTS])
+
+
+class SemanticCache:
+    """
+    Paket adı embedding'leri için bellek içi benzerlik indeksi.
+
+    L2-normalize edilmiş embedding'ler (N, D) float32 bir matriste,
+    paket adları ise paralel bir listede tutulur. Arama tek bir
+    matris-vektör çarpımıdır (kosinüs benzerliği).
+
+    storage_dir verilirse indeks .npy olarak saklanır ve bir sonraki
+    açılışta mmap ile (kopyalanmadan) yüklenir.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        dimensions: int = EMBEDDING_DIMENSIONS,
+        storage_dir: Optional[str] = None
+    ):
+        """
+        Semantic cache'i başlat.
+
+        Args:
+            threshold: Eşleşme için minimum kosinüs benzerliği
+            dimensions: Embedding boyutu
+            storage_dir: Kalıcı indeks dizini (None ise sadece bellekte)
+        """
+        global NUMPY_AVAILABLE
+
+        self.threshold = threshold
+        self.dimensions = dimensions
+        self._names: List[str] = []
+        self._name_set = set()
+        self._matrix = None
+        self._lock = threading.Lock()
+        self._np_module = None
+        self._storage_dir = Path(storage_dir) if storage_dir else None
+        self._loaded = self._storage_dir is None
+        self._dirty = False
+
+        # numpy import edilmeden kontrol edilir, ilk embedding'de yüklenir
+        if NUMPY_AVAILABLE is None:
+            NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+            if not NUMPY_AVAILABLE:
+                logger.info("numpy yüklü değil. Semantik cache devre dışı.")
+
+    @property
+    def is_available(self) -> bool:
+        """Semantik katman kullanılabilir mi?"""
+        return bool(NUMPY_AVAILABLE)
+
+    @property
+    def _np(self):
+        """numpy modülü (Lazy import)."""
+        if self._np_module is None:
+            import numpy
+            self._np_module = numpy
+        return self._np_module
+
+    def _embed_config(self) -> dict:
+        return {"output_dimensionality": self.dimensions}
+
+    def normalize(self, values: list):
+        """Embedding listesini L2-normalize edilmiş matrise çevir."""
+        np = self._np
+        matrix = np.asarray(values, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def embed(self, client, texts: List[str]):
+        """
+        Metinleri tek istekle embedding'e çevir.
+
+        Returns:
+            np.ndarray (len(texts), D) veya None
+        """
+        if not self.is_available or not texts:
+            return None
+
+        try:
+            response = client.models.embed_content(
+                model=EMBEDDING_MODEL,
+                contents=texts,
+                config=self._embed_config(),
+            )
+            return self.normalize([e.values for e in response.embeddings])
+        except Exception as e:
+            logger.warning(f"Embedding alınamadı: {e}")
+            return None
+
+    async def embed_async(self, client, texts: List[str]):
+        """embed() metodunun asenkron karşılığı."""
+        if not self.is_available or not texts:
+            return None
+
+        try:
+            response = await client.aio.models.embed_content(
+                model=EMBEDDING_MODEL,
+                contents=texts,
+                config=self._embed_config(),
+            )
+            return self.normalize([e.values for e in response.embeddings])
+        except Exception as e:
+            logger.warning(f"Embedding alınamadı: {e}")
+            return None
+
+    def _ensure_loaded(self) -> None:
+        """Kalıcı indeksi ilk kullanımda yükle (kilit altında çağrılır)."""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        matrix_path = self._storage_dir / MATRIX_FILENAME
+        meta_path = self._storage_dir / META_FILENAME
+        if not (matrix_path.exists() and meta_path.exists()):
+            return
+
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+
+            # Model veya boyut değiştiyse eski vektörler karşılaştırılamaz
+            if meta.get("model") != EMBEDDING_MODEL or meta.get("dimensions") != self.dimensions:
+                logger.info("Embedding modeli değişmiş, semantik indeks yeniden oluşturulacak")
+                return
+
+            matrix = self._np.load(matrix_path, mmap_mode="r")
+            names = meta.get("names", [])
+            if len(names) != matrix.shape[0]:
+                logger.warning("Semantik indeks bozuk, yok sayılıyor")
+                return
+
+            self._matrix = matrix
+            self._names = names
+            self._name_set = set(names)
+            logger.debug(f"Semantik indeks yüklendi: {len(names)} paket")
+        except Exception as e:
+            logger.warning(f"Semantik indeks yüklenemedi: {e}")
+
+    def missing(self, names: Iterable[str]) -> List[str]:
+        """İndekste olmayan paket adlarını döndür."""
+        if not self.is_available:
+            return []
+
+        with self._lock:
+            self._ensure_loaded()
+            return [name for name in dict.fromkeys(names) if name not in self._name_set]
+
+    def add(self, names: List[str], vectors) -> None:
+        """Paket adlarını ve embedding'lerini indekse ekle."""
+        if not self.is_available or vectors is None or not len(names):
+            return
+
+        np = self._np
+        with self._lock:
+            self._ensure_loaded()
+            if self._matrix is None:
+                self._matrix = np.array(vectors, dtype=np.float32)
+            else:
+                self._matrix = np.vstack([self._matrix, vectors])
+            self._names.extend(names)
+            self._name_set.update(names)
+            self._dirty = True
+
+    def save(self) -> bool:
+        """İndeksi diske yaz (değişiklik yoksa bir şey yapmaz)."""
+        if self._storage_dir is None or not self.is_available:
+            return False
+
+        with self._lock:
+            if not self._dirty or self._matrix is None:
+                return False
+            matrix = self._np.ascontiguousarray(self._matrix, dtype=self._np.float32)
+            meta = {
+                "model": EMBEDDING_MODEL,
+                "dimensions": self.dimensions,
+                "names": list(self._names),
+            }
+            self._dirty = False
+
+        try:
+            self._storage_dir.mkdir(parents=True, exist_ok=True)
+            matrix_path = self._storage_dir / MATRIX_FILENAME
+            meta_path = self._storage_dir / META_FILENAME
+
+            # Yarım yazılmış dosya kalmaması için geçici dosya + replace
+            tmp_matrix = matrix_path.with_suffix(".tmp.npy")
+            tmp_meta = meta_path.with_suffix(".tmp")
+            self._np.save(tmp_matrix, matrix)
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(tmp_matrix, matrix_path)
+            os.replace(tmp_meta, meta_path)
+
+            logger.debug(f"Semantik indeks kaydedildi: {len(meta['names'])} paket")
+            return True
+        except Exception as e:
+            logger.warning(f"Semantik indeks kaydedilemedi: {e}")
+            return False
+
+    def lookup(self, vector, package_name: str) -> Optional[Tuple[str, float]]:
+        """
+        Aynı üreticiye ait en benzer paketi bul.
+
+        Args:
+            vector: Normalize edilmiş sorgu embedding'i (D,)
+            package_name: Sorgulanan paket adı (üretici öneki için)
+
+        Returns:
+            (paket_adı, benzerlik) veya eşik üstünde eşleşme yoksa None
+        """
+        if vector is None:
+            return None
+
+        np = self._np
+        prefix = vendor_prefix(package_name)
+        with self._lock:
+            self._ensure_loaded()
+            if self._matrix is None:
+                return None
+
+            scores = self._matrix @ vector
+            candidates = np.flatnonzero(scores >= self.threshold)
+            # Eşik üstündekiler azdır; en benzerden başlayarak öneki tutanı seç
+            for idx in candidates[np.argsort(scores[candidates])[::-1]]:
+                name = self._names[int(idx)]
+                if vendor_prefix(name) == prefix:
+                    return name, float(scores[idx])
+        return None
+
+    def clear(self) -> None:
+        """İndeksi temizle."""
+        with self._lock:
+            self._names = []
+            self._name_set = set()
+            self._matrix = None
+            self._loaded = True
+            self._dirty = False
+
+        if self._storage_dir is not None:
+            for filename in (MATRIX_FILENAME, META_FILENAME):
+                try:
+                    (self._storage_dir / filename).unlink()
+                except OSError:
+                    pass
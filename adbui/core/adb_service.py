@@ -2,18 +2,73 @@
 ADB Service Module
 ==================
 ADB executable ile iletişim kuran temel servis sınıfı.
-Tüm ADB komutlarını subprocess üzerinden çalıştırır.
+ADB komutlarını subprocess üzerinden çalıştırır; shell komutları mümkünse
+doğrudan ADB server soketi üzerinden gönderilir (her komut için yeni adb
+process'i başlatılmaz).
 """
 
 import subprocess
 import os
+import socket
+import struct
+import threading
+import time
+import uuid
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Dict, NamedTuple
 from dataclasses import dataclass
 import logging
 
 logger = logging.getLogger(__name__)
 
+# ADB server adresi (adb CLI ile aynı ortam değişkenine uyar)
+ADB_SERVER_HOST = "127.0.0.1"
+ADB_SERVER_PORT = int(os.environ.get("ANDROID_ADB_SERVER_PORT", "5037"))
+
+# adb process'ine aktarılan ortam değişkenleri (tüm ortam kopyalanmaz).
+# Windows'ta os.environ anahtarları büyük harflidir, karşılaştırma büyük harfle yapılır.
+ADB_ENV_KEYS = frozenset({
+    "PATH", "SYSTEMROOT", "SYSTEMDRIVE", "TEMP", "TMP",
+    "USERPROFILE", "HOMEDRIVE", "HOMEPATH", "HOME", "APPDATA", "LOCALAPPDATA",
+})
+ADB_ENV_PREFIXES = ("ANDROID_", "ADB_")
+
+# Server'a bağlanma süresi sınırı (saniye); yerel soket, kısa tutulur
+ADB_CONNECT_TIMEOUT = 2.0
+
+# Toplu shell çağrısında komut çıktılarını ayıran satır
+BATCH_SEPARATOR = "__ADBUI_SEP__"
+
+# Toplu çağrıda bir komut zincirinin başarıyla bittiğini gösteren çıktı
+BATCH_OK_MARKER = "__ADBUI_OK__"
+
+# Private DNS modu ve sunucusu (bu sırayla)
+PRIVATE_DNS_QUERY = [
+    "settings get global private_dns_mode",
+    "settings get global private_dns_specifier",
+]
+
+# is_device_connected() için 'adb devices' sonucunun geçerli kaldığı süre (saniye)
+DEVICE_STATE_TTL = 2.0
+
+# shell v2 paket türleri: [id: 1 byte][uzunluk: 4 byte LE][veri]
+SHELL_V2_STDIN = 0
+SHELL_V2_STDOUT = 1
+SHELL_V2_STDERR = 2
+SHELL_V2_EXIT = 3
+_SHELL_V2_HEADER = struct.Struct("<BI")
+
+
+class ADBProtocolError(Exception):
+    """ADB server isteği reddetti (FAIL) veya beklenmeyen yanıt verdi."""
+
+
+class DnsStatus(NamedTuple):
+    """Cihazın Private DNS durumu."""
+    mode: str  # 'off', 'hostname', 'opportunistic' veya 'unknown'
+    hostname: str
+    is_adguard: bool  # AdGuard sunucusu hostname modunda etkin mi?
+
 
 @dataclass
 class ADBResult:
@@ -45,6 +100,26 @@ class ADBService:
                 "adb.exe bulunamadı. Lütfen platform-tools klasörünü kontrol edin."
             )
         logger.info(f"ADB yolu: {self.adb_path}")
+        
+        # False ise shell komutları her zaman adb process'i ile çalışır
+        self.use_server_socket = True
+        
+        # adb'nin ihtiyaç duyduğu minimal ortam (anahtarlar ~/.android altında)
+        self._adb_env = self._build_adb_env()
+        
+        # Son 'adb devices' sonucu: seri no -> durum (device, offline, unauthorized...)
+        self._device_states: Dict[str, str] = {}
+        self._device_states_at = 0.0
+        self._device_states_lock = threading.Lock()
+    
+    @staticmethod
+    def _build_adb_env() -> dict:
+        """Ortamdan yalnızca adb için gerekli değişkenleri seç."""
+        return {
+            key: value
+            for key, value in os.environ.items()
+            if key.upper() in ADB_ENV_KEYS or key.upper().startswith(ADB_ENV_PREFIXES)
+        }
     
     def _find_adb(self) -> Optional[str]:
         """Proje klasöründe adb.exe'yi bul."""
@@ -88,18 +163,20 @@ class ADBService:
         logger.debug(f"ADB komutu: {' '.join(cmd)}")
         
         try:
+            # Byte olarak al, tek seferde UTF-8 çöz (cihaz çıktısı UTF-8'dir;
+            # text=True Windows'ta sistem kod sayfasıyla çözerdi)
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
                 timeout=timeout,
+                env=self._adb_env,
                 creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
             )
             
             return ADBResult(
                 success=result.returncode == 0,
-                stdout=result.stdout.strip(),
-                stderr=result.stderr.strip(),
+                stdout=result.stdout.decode("utf-8", "replace").strip(),
+                stderr=result.stderr.decode("utf-8", "replace").strip(),
                 return_code=result.returncode
             )
             
@@ -129,6 +206,9 @@ class ADBService:
         """
         ADB shell komutu çalıştır.
         
+        Komut önce ADB server soketi üzerinden gönderilir; server'a
+        ulaşılamazsa veya istek reddedilirse adb process'i ile çalıştırılır.
+        
         Args:
             command: Shell komutu
             device_serial: Hedef cihaz seri numarası
@@ -137,8 +217,161 @@ class ADBService:
         Returns:
             ADBResult: Komut sonucu
         """
+        if self.use_server_socket:
+            result = self._socket_shell(command, device_serial, timeout)
+            if result is not None:
+                return result
+        
         return self.execute(["shell", command], device_serial, timeout)
     
+    # --- ADB server soket protokolü ---
+    
+    @staticmethod
+    def _recv_exact(sock: socket.socket, size: int) -> bytes:
+        """Soketten tam olarak size byte oku."""
+        buffer = bytearray()
+        while len(buffer) < size:
+            chunk = sock.recv(size - len(buffer))
+            if not chunk:
+                raise ConnectionError("ADB server bağlantıyı kapattı")
+            buffer += chunk
+        return bytes(buffer)
+    
+    def _send_request(self, sock: socket.socket, request: str):
+        """
+        Server'a "<4 hex uzunluk><istek>" gönder ve OKAY yanıtını bekle.
+        
+        Raises:
+            ADBProtocolError: Server FAIL döndürürse
+        """
+        payload = request.encode("utf-8")
+        sock.sendall(b"%04x" % len(payload) + payload)
+        
+        status = self._recv_exact(sock, 4)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            length = int(self._recv_exact(sock, 4), 16)
+            message = self._recv_exact(sock, length).decode("utf-8", "replace")
+            raise ADBProtocolError(message)
+        raise ADBProtocolError(f"Beklenmeyen yanıt: {status!r}")
+    
+    def _open_shell_socket(
+        self,
+        service: str,
+        device_serial: Optional[str],
+        timeout: float
+    ) -> Optional[socket.socket]:
+        """
+        Server'a bağlan, cihazı seç ve shell servisini aç.
+        
+        Returns:
+            Açık soket veya server'a ulaşılamadıysa / istek reddedildiyse None
+        """
+        transport = f"host:transport:{device_serial}" if device_serial else "host:transport-any"
+        
+        try:
+            sock = socket.create_connection(
+                (ADB_SERVER_HOST, ADB_SERVER_PORT),
+                timeout=ADB_CONNECT_TIMEOUT
+            )
+        except OSError:
+            # Server çalışmıyor; adb CLI gerekirse server'ı kendisi başlatır
+            return None
+        
+        try:
+            # Küçük istek/yanıtlar Nagle gecikmesine takılmasın
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.settimeout(timeout)
+            self._send_request(sock, transport)
+            self._send_request(sock, service)
+        except (ADBProtocolError, OSError) as e:
+            logger.debug(f"ADB server shell isteği reddedildi ({e}), adb process'i kullanılacak")
+            sock.close()
+            return None
+        
+        return sock
+    
+    def _recv_packet(self, sock: socket.socket) -> Tuple[int, bytes]:
+        """Bir shell v2 paketi oku: (paket türü, veri)."""
+        packet_id, length = _SHELL_V2_HEADER.unpack(
+            self._recv_exact(sock, _SHELL_V2_HEADER.size)
+        )
+        return packet_id, self._recv_exact(sock, length) if length else b""
+    
+    def open_shell_session(self, device_serial: Optional[str] = None) -> Optional["ADBShellSession"]:
+        """
+        Art arda komutlar için kalıcı bir shell oturumu aç.
+        
+        Returns:
+            ADBShellSession veya server soketi kullanılamıyorsa None
+        """
+        if not self.use_server_socket:
+            return None
+        
+        sock = self._open_shell_socket("shell,v2,raw:", device_serial, ADB_CONNECT_TIMEOUT)
+        if sock is None:
+            return None
+        return ADBShellSession(self, sock, device_serial)
+    
+    def _socket_shell(
+        self,
+        command: str,
+        device_serial: Optional[str],
+        timeout: int
+    ) -> Optional[ADBResult]:
+        """
+        Shell komutunu ADB server soketi üzerinden (shell v2) çalıştır.
+        
+        Returns:
+            ADBResult veya komut cihaza hiç ulaşmadıysa None
+            (çağıran adb process'ine geri düşer)
+        """
+        sock = self._open_shell_socket(f"shell,v2,raw:{command}", device_serial, timeout)
+        if sock is None:
+            return None
+        
+        with sock:
+            logger.debug(f"ADB shell (soket): {command}")
+            
+            # Bu noktadan sonra komut cihazda çalışmıştır; tekrar denenmez
+            stdout = bytearray()
+            stderr = bytearray()
+            exit_code = None
+            try:
+                while exit_code is None:
+                    packet_id, data = self._recv_packet(sock)
+                    
+                    if packet_id == SHELL_V2_STDOUT:
+                        stdout += data
+                    elif packet_id == SHELL_V2_STDERR:
+                        stderr += data
+                    elif packet_id == SHELL_V2_EXIT:
+                        exit_code = data[0] if data else 0
+            except socket.timeout:
+                logger.error(f"ADB komutu zaman aşımına uğradı: shell {command}")
+                return ADBResult(
+                    success=False,
+                    stdout="",
+                    stderr="Komut zaman aşımına uğradı",
+                    return_code=-1
+                )
+            except OSError as e:
+                logger.error(f"ADB komutu başarısız: {e}")
+                return ADBResult(
+                    success=False,
+                    stdout=stdout.decode("utf-8", "replace").strip(),
+                    stderr=str(e),
+                    return_code=-1
+                )
+        
+        return ADBResult(
+            success=exit_code == 0,
+            stdout=stdout.decode("utf-8", "replace").strip(),
+            stderr=stderr.decode("utf-8", "replace").strip(),
+            return_code=exit_code
+        )
+    
     def start_server(self) -> ADBResult:
         """ADB server'ı başlat."""
         return self.execute(["start-server"])
@@ -149,38 +382,256 @@ class ADBService:
     
     def get_devices_raw(self) -> ADBResult:
         """Bağlı cihazların ham listesini al."""
-        return self.execute(["devices", "-l"])
+        result = self.execute(["devices", "-l"])
+        if result.success:
+            self._store_device_states(result.stdout)
+        return result
+    
+    def _store_device_states(self, output: str):
+        """'adb devices' çıktısındaki cihaz durumlarını sakla."""
+        states = {}
+        for line in output.splitlines():
+            # Header ve "* daemon started" gibi server mesajları atlanır
+            if not line or line.startswith(("List of", "*")):
+                continue
+            parts = line.split(None, 2)
+            if len(parts) >= 2:
+                states[parts[0]] = parts[1]
+        
+        with self._device_states_lock:
+            self._device_states = states
+            self._device_states_at = time.monotonic()
+    
+    def is_device_connected(self, device_serial: Optional[str] = None) -> bool:
+        """
+        Cihaz bağlı ve komut almaya hazır mı?
+        
+        Son DEVICE_STATE_TTL saniye içinde alınmış cihaz listesi (periyodik
+        cihaz taraması dahil) yeniden kullanılır.
+        
+        Args:
+            device_serial: Cihaz seri numarası (None ise herhangi bir cihaz)
+        """
+        with self._device_states_lock:
+            fresh = time.monotonic() - self._device_states_at < DEVICE_STATE_TTL
+        
+        if not fresh:
+            result = self.execute(["devices"])
+            if not result.success:
+                return False
+            self._store_device_states(result.stdout)
+        
+        with self._device_states_lock:
+            states = self._device_states
+        
+        if device_serial is None:
+            return "device" in states.values()
+        return states.get(device_serial) == "device"
+
+    # --- Toplu shell komutları ---
+    
+    @staticmethod
+    def join_batch(commands: List[str]) -> str:
+        """Komutları çıktıları BATCH_SEPARATOR satırıyla ayrılacak şekilde birleştir."""
+        return f"; echo {BATCH_SEPARATOR}; ".join(commands)
+    
+    @staticmethod
+    def split_batch(result: ADBResult, count: int) -> Optional[List[str]]:
+        """
+        join_batch() ile çalıştırılan komutların çıktılarını ayır.
+        
+        Çıkış kodu yalnızca son komutu yansıttığından ayraçlar geldiyse
+        bölümler kullanılır; eksik bölümler boş metin olur.
+        
+        Returns:
+            Komut sırasıyla çıktılar veya çağrı tamamen başarısızsa None
+        """
+        sections = result.stdout.split(BATCH_SEPARATOR)
+        if not result.success and len(sections) < count:
+            return None
+        
+        sections += [""] * (count - len(sections))
+        return sections[:count]
+    
+    def run_batch(
+        self,
+        commands: List[str],
+        device_serial: Optional[str] = None,
+        timeout: int = 30
+    ) -> Optional[List[str]]:
+        """
+        Komutları tek adb shell çağrısında çalıştır, her birinin çıktısını ayrı döndür.
+        
+        Returns:
+            Komut sırasıyla çıktılar veya çağrı tamamen başarısızsa None
+        """
+        result = self.shell(self.join_batch(commands), device_serial, timeout)
+        sections = self.split_batch(result, len(commands))
+        if sections is None:
+            logger.debug(f"Toplu shell komutu başarısız: {result.stderr}")
+        return sections
 
     # --- Private DNS Methods ---
     
-    def get_private_dns(self, device_serial: str) -> dict:
+    @staticmethod
+    def _parse_private_dns(sections: Optional[List[str]]) -> DnsStatus:
+        """PRIVATE_DNS_QUERY çıktılarını DnsStatus'a çevir."""
+        if sections is None:
+            return DnsStatus("unknown", "", False)
+        
+        mode, hostname = (section.strip() for section in sections)
+        mode = mode or "unknown"
+        return DnsStatus(mode, hostname, mode == "hostname" and "adguard" in hostname)
+    
+    def get_private_dns(self, device_serial: str) -> DnsStatus:
         """
-        Cihazın Private DNS ayarlarını al.
+        Cihazın Private DNS ayarlarını al (tek adb çağrısı).
         Returns:
-            dict: {'mode': str, 'hostname': str}
+            DnsStatus: (mode, hostname, is_adguard)
+        """
+        return self._parse_private_dns(self.run_batch(PRIVATE_DNS_QUERY, device_serial))
+    
+    def apply_private_dns(self, device_serial: str, hostname: Optional[str]) -> Optional[DnsStatus]:
         """
-        mode_res = self.shell("settings get global private_dns_mode", device_serial)
-        specifier_res = self.shell("settings get global private_dns_specifier", device_serial)
+        Private DNS'i ayarla ve yeni durumu aynı adb çağrısında oku.
         
-        return {
-            "mode": mode_res.stdout.strip() if mode_res.success else "unknown",
-            "hostname": specifier_res.stdout.strip() if specifier_res.success else ""
-        }
+        Args:
+            hostname: DNS sunucusu (None ise Private DNS kapatılır)
+            
+        Returns:
+            DnsStatus: Yeni durum veya ayarlanamadıysa None
+        """
+        if hostname:
+            # Önce hostname, ardından mod; biri başarısız olursa zincir durur
+            apply = (
+                f"settings put global private_dns_specifier {hostname}"
+                " && settings put global private_dns_mode hostname"
+            )
+        else:
+            # Genellikle off yapmak yeterlidir, bazı cihazlarda 'opportunistic' (otomatik) varsayılan olabilir.
+            apply = "settings put global private_dns_mode off"
+        
+        sections = self.run_batch(
+            [f"{apply} && echo {BATCH_OK_MARKER}", *PRIVATE_DNS_QUERY],
+            device_serial
+        )
+        if sections is None or BATCH_OK_MARKER not in sections[0]:
+            return None
+        return self._parse_private_dns(sections[1:])
 
     def set_private_dns(self, device_serial: str, hostname: str) -> bool:
         """
         Private DNS'i belirli bir sunucuya ayarla.
         """
-        # 1. Hostname'i ayarla
-        res1 = self.shell(f"settings put global private_dns_specifier {hostname}", device_serial)
-        if not res1.success:
-            return False
-            
-        # 2. Modu 'hostname' olarak ayarla
-        res2 = self.shell("settings put global private_dns_mode hostname", device_serial)
-        return res2.success
+        return self.apply_private_dns(device_serial, hostname) is not None
 
     def disable_private_dns(self, device_serial: str) -> bool:
         """Private DNS'i kapat (Otomatik değil, tamamen kapalı veya off)."""
-        # Genellikle off yapmak yeterlidir, bazı cihazlarda 'opportunistic' (otomatik) varsayılan olabilir.
-        return self.shell("settings put global private_dns_mode off", device_serial).success
+        return self.apply_private_dns(device_serial, None) is not None
+
+class ADBShellSession:
+    """
+    Tek bir shell v2 akışı üzerinden art arda komut çalıştıran oturum.
+    
+    Her komut için cihaz seçimi ve yeni shell process'i maliyeti ödenmez:
+    komut stdin paketi olarak yazılır, ardından çıkış kodunu içeren tekil
+    bir ayraç satırı basılır ve çıktı bu satıra kadar okunur.
+    
+    Oturum aynı anda tek komut çalıştırır; meşgulse run() None döner ve
+    çağıran tek seferlik shell'e geçer (paralel istekler beklemez).
+    """
+    
+    def __init__(self, service: ADBService, sock: socket.socket, device_serial: Optional[str]):
+        self._service = service
+        self._sock = sock
+        self.device_serial = device_serial
+        self._lock = threading.Lock()
+        self.closed = False
+    
+    def run(self, command: str, timeout: int = 30) -> Optional[ADBResult]:
+        """
+        Komutu oturumda çalıştır.
+        
+        Returns:
+            ADBResult veya oturum meşgul/kapalıysa None (komut çalışmamıştır)
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            if self.closed:
+                return None
+            return self._run(command, timeout)
+        finally:
+            self._lock.release()
+    
+    def _run(self, command: str, timeout: int) -> Optional[ADBResult]:
+        sentinel = f"__ADBUI_DONE_{uuid.uuid4().hex}__"
+        # stdin /dev/null'a bağlanır: komut oturumun girdisini (sonraki komutları) okuyamaz
+        script = (
+            f"{{ {command}\n}} </dev/null\n"
+            f"printf '\\n%s %s\\n' {sentinel} \"$?\"\n"
+        ).encode("utf-8")
+        
+        try:
+            self._sock.settimeout(timeout)
+            self._sock.sendall(_SHELL_V2_HEADER.pack(SHELL_V2_STDIN, len(script)) + script)
+        except OSError:
+            # Komut gönderilemedi; çağıran tek seferlik shell'e geçebilir
+            self.close()
+            return None
+        
+        logger.debug(f"ADB shell (oturum): {command}")
+        
+        marker = f"\n{sentinel} ".encode()
+        stdout = bytearray()
+        stderr = bytearray()
+        try:
+            while True:
+                packet_id, data = self._service._recv_packet(self._sock)
+                if packet_id == SHELL_V2_STDOUT:
+                    stdout += data
+                    index = stdout.find(marker)
+                    if index >= 0:
+                        end = stdout.find(b"\n", index + len(marker))
+                        if end >= 0:
+                            exit_code = int(stdout[index + len(marker):end] or b"-1")
+                            del stdout[index:]
+                            break
+                elif packet_id == SHELL_V2_STDERR:
+                    stderr += data
+                elif packet_id == SHELL_V2_EXIT:
+                    raise ConnectionError("Shell oturumu sonlandı")
+        except socket.timeout:
+            # Komut hâlâ çalışıyor olabilir; akış artık senkron değil
+            self.close()
+            logger.error(f"ADB komutu zaman aşımına uğradı: shell {command}")
+            return ADBResult(
+                success=False,
+                stdout="",
+                stderr="Komut zaman aşımına uğradı",
+                return_code=-1
+            )
+        except (OSError, ValueError) as e:
+            self.close()
+            logger.error(f"ADB komutu başarısız: {e}")
+            return ADBResult(
+                success=False,
+                stdout=stdout.decode("utf-8", "replace").strip(),
+                stderr=str(e),
+                return_code=-1
+            )
+        
+        return ADBResult(
+            success=exit_code == 0,
+            stdout=stdout.decode("utf-8", "replace").strip(),
+            stderr=stderr.decode("utf-8", "replace").strip(),
+            return_code=exit_code
+        )
+    
+    def close(self):
+        """Oturumu kapat (birden fazla çağrılabilir)."""
+        self.closed = True
+        try:
+            self._sock.close()
+        except OSError:
+            pass
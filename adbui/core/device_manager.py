@@ -5,7 +5,8 @@ Android cihaz tespiti ve yönetimi.
 """
 
 import re
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import logging
@@ -14,6 +15,15 @@ from .adb_service import ADBService
 
 logger = logging.getLogger(__name__)
 
+# Sürüm ve model tek shell çağrısında, tek satırda "<sürüm>|<model>" olarak okunur
+ENRICH_COMMAND = 'echo "$(getprop ro.build.version.release)|$(getprop ro.product.model)"'
+
+# Aynı anda sorgulanacak en fazla cihaz
+MAX_ENRICH_WORKERS = 8
+
+# 'adb devices -l' satırındaki ek bilgiler (key:value)
+_DEVICE_PROP_RE = re.compile(r'\b(model|product|transport_id):(\S+)')
+
 
 class DeviceStatus(Enum):
     """Cihaz bağlantı durumu."""
@@ -62,6 +72,8 @@ class DeviceManager:
         """
         self.adb = adb_service
         self._current_device: Optional[Device] = None
+        # Seri no -> (android sürümü, model); cihaz listeden düşünce silinir
+        self._enrich_cache: Dict[str, Tuple[str, str]] = {}
     
     @property
     def current_device(self) -> Optional[Device]:
@@ -99,12 +111,21 @@ class DeviceManager:
             
             device = self._parse_device_line(line)
             if device:
-                # Cihaz ready ise ek bilgileri al
-                if device.is_ready:
-                    device = self._enrich_device_info(device)
                 devices.append(device)
         
-        if self._current_device and self._current_device.serial not in [d.serial for d in devices]:
+        # Hazır cihazların ek bilgilerini al (her cihaz ayrı adb çağrısı, paralel)
+        ready = [d for d in devices if d.is_ready]
+        if len(ready) > 1:
+            with ThreadPoolExecutor(max_workers=min(MAX_ENRICH_WORKERS, len(ready))) as executor:
+                list(executor.map(self._enrich_device_info, ready))
+        elif ready:
+            self._enrich_device_info(ready[0])
+        
+        serials = {d.serial for d in devices}
+        for serial in self._enrich_cache.keys() - serials:
+            del self._enrich_cache[serial]
+        
+        if self._current_device and self._current_device.serial not in serials:
              logger.info(f"Cihaz bağlantısı koptu: {self._current_device.display_name}")
         
         logger.debug(f"{len(devices)} cihaz bulundu")
@@ -118,7 +139,7 @@ class DeviceManager:
         RFXXXXXXX device product:dreamltexx model:SM_G950F transport_id:1
         """
         # Temel pattern: serial status [ek bilgiler]
-        parts = line.split()
+        parts = line.split(None, 2)
         if len(parts) < 2:
             return None
         
@@ -133,37 +154,42 @@ class DeviceManager:
         
         device = Device(serial=serial, status=status)
         
-        # Ek bilgileri parse et
-        for part in parts[2:]:
-            if ':' in part:
-                key, value = part.split(':', 1)
+        # Ek bilgileri parse et (tek regex taraması)
+        if len(parts) > 2:
+            for key, value in _DEVICE_PROP_RE.findall(parts[2]):
                 if key == 'model':
                     device.model = value.replace('_', ' ')
                 elif key == 'product':
                     device.product = value
-                elif key == 'transport_id':
+                else:
                     device.transport_id = value
         
         return device
     
     def _enrich_device_info(self, device: Device) -> Device:
-        """Cihaza ek bilgiler ekle (Android versiyon vs.)."""
-        # Android versiyonunu al
-        result = self.adb.shell(
-            "getprop ro.build.version.release",
-            device_serial=device.serial
-        )
-        if result.success:
-            device.android_version = result.stdout.strip()
-        
-        # Model bilgisi yoksa getprop ile al
-        if not device.model:
-            result = self.adb.shell(
-                "getprop ro.product.model",
-                device_serial=device.serial
-            )
-            if result.success:
-                device.model = result.stdout.strip()
+        """
+        Cihaza ek bilgiler ekle (Android versiyon vs.).
+        
+        Sürüm ve model tek adb çağrısıyla alınır ve seri numarasına göre
+        cache'lenir; cihaz bağlı kaldıkça tekrar sorgulanmaz.
+        """
+        props = self._enrich_cache.get(device.serial)
+        if props is None:
+            result = self.adb.shell(ENRICH_COMMAND, device_serial=device.serial)
+            if not result.success:
+                return device
+            
+            version, _, model = result.stdout.partition('|')
+            props = (version.strip(), model.strip())
+            self._enrich_cache[device.serial] = props
+        
+        version, model = props
+        if version:
+            device.android_version = version
+        
+        # Model bilgisi yoksa getprop sonucunu kullan
+        if not device.model and model:
+            device.model = model
         
         return device
     
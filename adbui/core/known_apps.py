@@ -5,11 +5,14 @@ Bilinen (bloatware/kaldırılabilir) uygulamalar listesini yönetir.
 GitHub veya başka bir uzak kaynaktan JSON formatında liste çeker.
 """
 
+import gzip
 import json
 import logging
+import sys
 import urllib.request
 import urllib.error
-from typing import List, Dict, Optional
+from types import MappingProxyType
+from typing import List, Dict, Optional, Mapping
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -20,9 +23,18 @@ from ..utils.config import get_config
 # Varsayılan Veri Kaynağı
 DEFAULT_SOURCE_URL = "https://raw.githubusercontent.com/Sauth-09/ADBUI-Android_Uygulama_Yoneticisi/main/apps.json" 
 
-@dataclass
+# Python 3.10+ dataclass'ları __slots__ ile oluşturabilir (örnek başına __dict__ yok)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class KnownApp:
-    """Bilinen bir uygulama tanımı."""
+    """
+    Bilinen bir uygulama tanımı.
+    
+    Binlerce örnek tutulduğu için değiştirilemez ve (3.10+) slot'lu.
+    Paket adı ile risk/öneri değerleri intern edilir: risk ve öneri
+    yalnızca birkaç farklı değer alır, tüm örnekler aynı nesneleri paylaşır.
+    """
     package: str
     name: str
     description: str
@@ -32,11 +44,28 @@ class KnownApp:
     @classmethod
     def from_dict(cls, data: Dict) -> 'KnownApp':
         return cls(
-            package=data.get('package', ''),
+            package=sys.intern(data.get('package') or ''),
             name=data.get('name', ''),
             description=data.get('description', ''),
-            risk=data.get('risk', 'Unknown'),
-            recommendation=data.get('recommendation', 'Unknown')
+            risk=sys.intern(data.get('risk') or 'Unknown'),
+            recommendation=sys.intern(data.get('recommendation') or 'Unknown')
+        )
+    
+    @classmethod
+    def from_row(cls, row: List) -> 'KnownApp':
+        """
+        Konumsal satırdan oluştur: [package, name, description, risk, recommendation].
+        
+        Anahtar adlarını her kayıtta tekrarlamayan kompakt liste formatı içindir;
+        eksik sondaki alanlar varsayılan değer alır.
+        """
+        package, name, description, risk, recommendation = (list(row) + [None] * 5)[:5]
+        return cls(
+            package=sys.intern(package or ''),
+            name=name or '',
+            description=description or '',
+            risk=sys.intern(risk or 'Unknown'),
+            recommendation=sys.intern(recommendation or 'Unknown')
         )
 
 class KnownAppsManager:
@@ -47,24 +76,46 @@ class KnownAppsManager:
         self.source_url = get_config().get('known_apps_url', DEFAULT_SOURCE_URL)
         self._apps: Dict[str, KnownApp] = {}
         self._cache_file = Path("known_apps_cache.json")
+        # Koşullu GET için sunucunun verdiği ETag / Last-Modified değerleri
+        self._validators_file = Path("known_apps_cache.etag")
     
     def fetch_remote_list(self) -> bool:
         """
         Uzak sunucudan listeyi çeker.
         Başarılı olursa True, değilse False döner.
+        
+        Önbellek varsa koşullu istek gönderilir; liste değişmediyse sunucu
+        304 döner ve gövde indirilmez.
         """
+        request = urllib.request.Request(
+            self.source_url,
+            headers={"Accept-Encoding": "gzip", **self._conditional_headers()}
+        )
+        
         try:
             logger.info(f"Liste güncelleniyor: {self.source_url}")
-            with urllib.request.urlopen(self.source_url, timeout=10) as response:
+            with urllib.request.urlopen(request, timeout=10) as response:
                 if response.status == 200:
-                    content = response.read().decode('utf-8')
+                    content = response.read()
+                    if response.headers.get('Content-Encoding', '').lower() == 'gzip':
+                        content = gzip.decompress(content)
+                    # json.loads byte'ları doğrudan çözer (ayrı decode kopyası yok)
                     data = json.loads(content)
                     self._parse_and_update(data)
                     self._save_cache(content)
+                    self._save_validators(response.headers)
                     return True
                 else:
                     logger.error(f"Sunucu hatası: {response.status}")
                     return False
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                logger.info("Liste değişmemiş, önbellek kullanılıyor")
+                if not self._apps:
+                    self.load_local_cache()
+                return True
+            logger.error(f"Sunucu hatası: {e.code}")
+            return False
         except urllib.error.URLError as e:
             logger.warning(f"Bağlantı hatası: {e}")
             return False
@@ -74,6 +125,40 @@ class KnownAppsManager:
         except Exception as e:
             logger.error(f"Beklenmeyen hata: {e}")
             return False
+    
+    def _conditional_headers(self) -> Dict[str, str]:
+        """Kayıtlı ETag / Last-Modified değerlerinden koşullu istek başlıkları."""
+        # Önbellek dosyası yoksa 304 işe yaramaz, tam liste istenir
+        if not self._cache_file.exists() or not self._validators_file.exists():
+            return {}
+        
+        try:
+            with open(self._validators_file, 'r', encoding='utf-8') as f:
+                validators = json.load(f)
+        except Exception:
+            return {}
+        
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+    
+    def _save_validators(self, response_headers):
+        """Yanıttaki ETag / Last-Modified değerlerini sakla."""
+        validators = {
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+        }
+        try:
+            if any(validators.values()):
+                with open(self._validators_file, 'w', encoding='utf-8') as f:
+                    json.dump(validators, f)
+            elif self._validators_file.exists():
+                self._validators_file.unlink()
+        except Exception as e:
+            logger.error(f"Önbellek kayıt hatası: {e}")
             
     def load_local_cache(self) -> bool:
         """Yerel önbelleği yükler."""
@@ -92,24 +177,34 @@ class KnownAppsManager:
             logger.error(f"Önbellek yükleme hatası: {e}")
             return False
             
-    def _parse_and_update(self, data: List[Dict]):
-        """JSON verisini parse et ve listeyi güncelle."""
+    def _parse_and_update(self, data: List):
+        """
+        JSON verisini parse et ve listeyi güncelle.
+        
+        Liste öğeleri nesne ({"package": ...}) veya konumsal satır
+        ([package, name, description, risk, recommendation]) olabilir.
+        """
         if not isinstance(data, list):
             logger.error("Veri formatı hatalı: Liste bekleniyor")
             return
             
         self._apps = {}
         for item in data:
-            app = KnownApp.from_dict(item)
+            if isinstance(item, list):
+                app = KnownApp.from_row(item)
+            elif isinstance(item, dict):
+                app = KnownApp.from_dict(item)
+            else:
+                continue
             if app.package:
                 self._apps[app.package] = app
                 
         logger.info(f"{len(self._apps)} bilinen uygulama yüklendi")
 
-    def _save_cache(self, content: str):
-        """Veriyi önbelleğe kaydeder."""
+    def _save_cache(self, content: bytes):
+        """Veriyi (sunucudan gelen UTF-8 byte'lar) önbelleğe kaydeder."""
         try:
-            with open(self._cache_file, 'w', encoding='utf-8') as f:
+            with open(self._cache_file, 'wb') as f:
                 f.write(content)
         except Exception as e:
             logger.error(f"Önbellek kayıt hatası: {e}")
@@ -124,46 +219,49 @@ class KnownAppsManager:
 
     def _get_hardcoded_defaults(self) -> Dict[str, KnownApp]:
         """İnternet yoksa ve cache yoksa kullanılacak varsayılan liste."""
-        defaults = [
-            {
-                "package": "com.miui.daemon",
-                "name": "MIUI Daemon",
-                "description": "Xiaomi veri toplama ve analiz servisi.",
-                "risk": "Safe",
-                "recommendation": "Remove"
-            },
-            {
-                "package": "com.miui.analytics",
-                "name": "MIUI Analytics",
-                "description": "Xiaomi analitik ve reklam servisi.",
-                "risk": "Safe",
-                "recommendation": "Remove"
-            },
-            {
-                "package": "com.miui.msa.global",
-                "name": "MSA (MIUI System Ads)",
-                "description": "Xiaomi sistem reklam servisi.",
-                "risk": "Safe",
-                "recommendation": "Remove"
-            },
-             {
-                "package": "com.google.android.apps.tachyon",
-                "name": "Google Duo / Meet",
-                "description": "Google görüntülü görüşme uygulaması.",
-                "risk": "Safe",
-                "recommendation": "Disable"
-            },
-            {
-                "package": "com.google.android.videos",
-                "name": "Google TV",
-                "description": "Google film ve dizi kiralama servisi.",
-                "risk": "Safe",
-                "recommendation": "Remove"
-            }
-        ]
-        
-        apps = {}
-        for item in defaults:
-            app = KnownApp.from_dict(item)
-            apps[app.package] = app
-        return apps
+        # Modül yüklenirken bir kez oluşturulur; KnownApp değiştirilemez, sığ kopya yeterli
+        return dict(_DEFAULT_APPS)
+
+
+# İnternet ve önbellek yokken kullanılan gömülü liste
+_DEFAULT_APPS_RAW = [
+    {
+        "package": "com.miui.daemon",
+        "name": "MIUI Daemon",
+        "description": "Xiaomi veri toplama ve analiz servisi.",
+        "risk": "Safe",
+        "recommendation": "Remove"
+    },
+    {
+        "package": "com.miui.analytics",
+        "name": "MIUI Analytics",
+        "description": "Xiaomi analitik ve reklam servisi.",
+        "risk": "Safe",
+        "recommendation": "Remove"
+    },
+    {
+        "package": "com.miui.msa.global",
+        "name": "MSA (MIUI System Ads)",
+        "description": "Xiaomi sistem reklam servisi.",
+        "risk": "Safe",
+        "recommendation": "Remove"
+    },
+    {
+        "package": "com.google.android.apps.tachyon",
+        "name": "Google Duo / Meet",
+        "description": "Google görüntülü görüşme uygulaması.",
+        "risk": "Safe",
+        "recommendation": "Disable"
+    },
+    {
+        "package": "com.google.android.videos",
+        "name": "Google TV",
+        "description": "Google film ve dizi kiralama servisi.",
+        "risk": "Safe",
+        "recommendation": "Remove"
+    }
+]
+
+_DEFAULT_APPS: Mapping[str, KnownApp] = MappingProxyType({
+    item["package"]: KnownApp.from_dict(item) for item in _DEFAULT_APPS_RAW
+})
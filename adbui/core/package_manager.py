@@ -5,16 +5,96 @@ Android paket yönetimi - listeleme, kaldırma, dondurma işlemleri.
 """
 
 import re
-from typing import List, Optional, Dict, Any
+import sys
+import time
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple, Iterable, Iterator, FrozenSet
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
 
-from .adb_service import ADBService
+from .adb_service import ADBService, ADBResult, ADBShellSession
 from ..data.permissions import get_appops_for_permission
 
 logger = logging.getLogger(__name__)
 
+# Kalıcı shell oturumu açılamazsa yeniden denemeden önce beklenen süre (saniye)
+SESSION_RETRY_INTERVAL = 30.0
+
+# Toplu detay sorgusunda aynı anda çalışan en fazla adb çağrısı
+MAX_DETAIL_WORKERS = 8
+
+# dumpsys package çıktısı için önceden derlenmiş desenler
+_RE_VERSION_NAME = re.compile(r'versionName=([^\s]+)')
+_RE_VERSION_CODE = re.compile(r'versionCode=(\d+)')
+
+# get_advanced_details: grup adları details anahtarlarıyla aynı
+_RE_DUMPSYS_DETAILS = re.compile(
+    r'versionName=(?P<version>[^\r\n]+)|firstInstallTime=(?P<install_time>[^\r\n]+)'
+)
+
+# 'pm disable-user' / 'pm enable' çıktısındaki yeni durum (new state: ...)
+_RE_DISABLED = re.compile(r'disabled', re.IGNORECASE)
+_RE_ENABLED = re.compile(r'enabled', re.IGNORECASE)
+
+# 'cmd appops get' çıktısındaki mod ve arayüz etiketi
+_RE_APPOPS_MODE = re.compile(r'\b(allow|ignore|deny)\b', re.IGNORECASE)
+_APPOPS_LABELS = {
+    "allow": "✅ İzin Verildi",
+    "ignore": "⚠️ Yoksay (Ignore)",
+    "deny": "⛔ Engellendi",
+}
+
+# 'pm list packages' satırları: package:<ad>
+_RE_PACKAGE_LINE = re.compile(r'(?m)^\s*package:(\S+)')
+
+# Python 3.10+ dataclass'ları __slots__ ile oluşturabilir (örnek başına __dict__ yok)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Paket listesinin parmak izi: zaman damgası ve boyut. Kurulu paket kümesi
+# packages.xml'de, etkin/devre dışı durumu ise kullanıcının (0)
+# package-restrictions.xml dosyasında tutulur; ikisi birlikte izlenir.
+PACKAGES_FINGERPRINT_COMMAND = (
+    "stat -c '%Y %s' /data/system/packages.xml"
+    " /data/system/users/0/package-restrictions.xml"
+)
+
+# Kritik sistem paketleri - kaldırılmamalı
+_CRITICAL_PACKAGES = frozenset({
+    'com.android.systemui',
+    'com.android.settings',
+    'com.android.phone',
+    'com.android.launcher',
+    'com.android.launcher3',
+    'com.android.vending',  # Play Store
+    'com.google.android.gms',  # Google Play Services
+    'com.android.providers.settings',
+    'com.android.providers.contacts',
+    'com.android.providers.telephony',
+    'com.android.inputmethod.latin',
+    'com.android.packageinstaller',
+    'com.android.shell',
+    'android',
+})
+
+# Paket adının ikinci bileşeninden üretici adına eşleme (com.samsung -> Samsung)
+_VENDOR_MAP = {
+    'samsung': 'Samsung',
+    'google': 'Google',
+    'android': 'Android',
+    'huawei': 'Huawei',
+    'xiaomi': 'Xiaomi',
+    'miui': 'MIUI',
+    'oppo': 'OPPO',
+    'vivo': 'Vivo',
+    'oneplus': 'OnePlus',
+    'facebook': 'Facebook',
+    'meta': 'Meta',
+    'microsoft': 'Microsoft',
+}
+
 
 class PackageCategory(Enum):
     """Paket kategorisi."""
@@ -33,14 +113,14 @@ class StandbyBucket(Enum):
     RESTRICTED = "restricted"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class AppOpsState:
     """AppOps izin durumu."""
     run_in_background: Optional[str] = None  # allow/deny
     wake_lock: Optional[str] = None  # allow/deny
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Package:
     """Android paketi."""
     name: str
@@ -58,33 +138,83 @@ class Package:
     def display_name(self) -> str:
         """Kısa görüntüleme adı."""
         # com.samsung.android.app.tips -> tips
-        parts = self.name.split('.')
-        return parts[-1] if parts else self.name
+        return self.name.rpartition('.')[2] or self.name
     
     @property
     def vendor(self) -> Optional[str]:
         """Paket üreticisi (com.samsung -> Samsung)."""
-        parts = self.name.split('.')
+        # Yalnızca ikinci bileşen gerekli, kalanı bölünmez
+        parts = self.name.split('.', 2)
         if len(parts) >= 2:
             vendor = parts[1].lower()
-            vendor_map = {
-                'samsung': 'Samsung',
-                'google': 'Google',
-                'android': 'Android',
-                'huawei': 'Huawei',
-                'xiaomi': 'Xiaomi',
-                'miui': 'MIUI',
-                'oppo': 'OPPO',
-                'vivo': 'Vivo',
-                'oneplus': 'OnePlus',
-                'facebook': 'Facebook',
-                'meta': 'Meta',
-                'microsoft': 'Microsoft',
-            }
-            return vendor_map.get(vendor, vendor.capitalize())
+            return _VENDOR_MAP.get(vendor, vendor.capitalize())
         return None
 
 
+# _package_rows() satırı: (ad, kategori, etkin mi, kritik mi)
+PackageRow = Tuple[str, PackageCategory, bool, bool]
+
+# PackageArray.categories dizisinde kategorilerin byte kodları
+_CATEGORIES = tuple(PackageCategory)
+_CATEGORY_CODES = {category: code for code, category in enumerate(_CATEGORIES)}
+
+
+class PackageArray:
+    """
+    Paket listesinin sütun bazlı (struct-of-arrays) gösterimi.
+    
+    Ad, kategori ve bayraklar paralel dizilerde tutulur; tüm listeyi
+    dolaşan filtreleme/sayma işlemleri Package nesnelerine dokunmadan
+    bitişik bellek üzerinde çalışır.
+    """
+    
+    __slots__ = ("names", "categories", "is_enabled", "is_critical")
+    
+    def __init__(self):
+        self.names: List[str] = []
+        self.categories = array("B")
+        self.is_enabled = bytearray()
+        self.is_critical = bytearray()
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def append(
+        self,
+        name: str,
+        category: PackageCategory,
+        is_enabled: bool = True,
+        is_critical: bool = False
+    ):
+        """Sona bir paket ekle."""
+        self.names.append(name)
+        self.categories.append(_CATEGORY_CODES[category])
+        self.is_enabled.append(is_enabled)
+        self.is_critical.append(is_critical)
+    
+    def append_package(self, package: Package):
+        """Package nesnesini sona ekle."""
+        self.append(package.name, package.category, package.is_enabled, package.is_critical)
+    
+    def category_at(self, index: int) -> PackageCategory:
+        """index'teki paketin kategorisi."""
+        return _CATEGORIES[self.categories[index]]
+    
+    def indices_of(self, category: PackageCategory) -> List[int]:
+        """Verilen kategorideki paketlerin sıra numaraları."""
+        code = _CATEGORY_CODES[category]
+        return [i for i, value in enumerate(self.categories) if value == code]
+    
+    def to_records(self) -> List[Package]:
+        """Package listesine dönüştür (eski API'yi bekleyen çağıranlar için)."""
+        return [
+            Package(name, _CATEGORIES[code], bool(enabled), bool(critical))
+            for name, code, enabled, critical in zip(
+                self.names, self.categories, self.is_enabled, self.is_critical
+            )
+        ]
+
+
 class PackageManager:
     """
     Paket yönetim sınıfı.
@@ -93,22 +223,7 @@ class PackageManager:
     """
     
     # Kritik sistem paketleri - kaldırılmamalı
-    CRITICAL_PACKAGES = {
-        'com.android.systemui',
-        'com.android.settings',
-        'com.android.phone',
-        'com.android.launcher',
-        'com.android.launcher3',
-        'com.android.vending',  # Play Store
-        'com.google.android.gms',  # Google Play Services
-        'com.android.providers.settings',
-        'com.android.providers.contacts',
-        'com.android.providers.telephony',
-        'com.android.inputmethod.latin',
-        'com.android.packageinstaller',
-        'com.android.shell',
-        'android',
-    }
+    CRITICAL_PACKAGES = _CRITICAL_PACKAGES
     
     def __init__(self, adb_service: ADBService, device_serial: Optional[str] = None):
         """
@@ -120,67 +235,255 @@ class PackageManager:
         """
         self.adb = adb_service
         self.device_serial = device_serial
+        
+        # Cihaz başına kalıcı shell oturumu (ilk komutta açılır)
+        self._session: Optional[ADBShellSession] = None
+        self._session_retry_at = 0.0
+        self._session_lock = threading.Lock()
+        
+        # Cihaz seri no -> (parmak izi, paket listesi)
+        self._packages_cache: Dict[str, Tuple[str, List[Package]]] = {}
     
     def set_device(self, serial: str):
         """Hedef cihazı ayarla."""
+        if serial != self.device_serial:
+            self.close()
         self.device_serial = serial
     
-    def get_all_packages(self) -> List[Package]:
-        """Tüm paketleri al (sistem + kullanıcı + devre dışı)."""
-        packages: Dict[str, Package] = {}
+    def close(self):
+        """Kalıcı shell oturumunu kapat."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            self._session_retry_at = 0.0
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def _get_session(self) -> Optional[ADBShellSession]:
+        """Geçerli cihazın shell oturumunu döndür (gerekirse aç)."""
+        with self._session_lock:
+            if self._session is not None and not self._session.closed:
+                return self._session
+            if time.monotonic() < self._session_retry_at:
+                return None
+            
+            self._session = self.adb.open_shell_session(self.device_serial)
+            if self._session is None:
+                # Server soketi / shell v2 yok; bir süre tek seferlik shell kullanılır
+                self._session_retry_at = time.monotonic() + SESSION_RETRY_INTERVAL
+            return self._session
+    
+    def _device_available(self) -> bool:
+        """Hedef cihaz bağlı mı? Değilse tek bir uyarı loglanır."""
+        if self.adb.is_device_connected(self.device_serial):
+            return True
+        logger.warning("Cihaz bağlı değil, işlem atlandı: %s", self.device_serial or "varsayılan cihaz")
+        return False
+    
+    def _shell(self, command: str, timeout: int = 30) -> ADBResult:
+        """
+        Shell komutunu çalıştır.
+        
+        Önce kalıcı oturum kullanılır; oturum açılamazsa veya başka bir
+        thread tarafından meşgulse tek seferlik adb shell'e düşülür.
+        """
+        session = self._get_session()
+        if session is not None:
+            result = session.run(command, timeout)
+            if result is not None:
+                return result
+        
+        return self.adb.shell(command, device_serial=self.device_serial, timeout=timeout)
+    
+    def invalidate_cache(self):
+        """Önbellekteki paket listelerini geçersiz kıl."""
+        self._packages_cache.clear()
+    
+    def _packages_fingerprint(self) -> Optional[str]:
+        """
+        Kurulu paketlerin ve etkin/devre dışı durumlarının parmak izini al.
+        
+        packages.xml veya package-restrictions.xml okunamıyorsa (bazı
+        cihazlarda shell kullanıcısına kapalı) None döner; bu durumda
+        liste önbelleğe alınmaz.
+        """
+        result = self._shell(PACKAGES_FINGERPRINT_COMMAND)
+        fingerprint = result.stdout.strip()
+        if not result.success or not fingerprint[:1].isdigit():
+            return None
+        return fingerprint
+    
+    def get_all_packages(
+        self,
+        use_cache: bool = True,
+        cancel: Optional[threading.Event] = None
+    ) -> List[Package]:
+        """
+        Tüm paketleri al (sistem + kullanıcı + devre dışı).
+        
+        Kurulu paketler ve etkin/devre dışı durumları değişmediyse son liste
+        cihaza tekrar sorulmadan döndürülür. Bu sınıf üzerinden yapılan kaldırma/dondurma işlemleri
+        önbelleği ayrıca geçersiz kılar.
+        
+        Args:
+            use_cache: False ise liste her durumda yeniden alınır
+            cancel: Kurulursa yükleme adb çağrıları arasında durur ve
+                boş liste döner
+        """
+        if not self._device_available() or (cancel is not None and cancel.is_set()):
+            return []
+        
+        serial = self.device_serial
+        fingerprint = self._packages_fingerprint()
+        cached = self._packages_cache.get(serial)
+        if use_cache and fingerprint and cached and cached[0] == fingerprint:
+            logger.debug("Paket listesi değişmemiş, önbellekten döndürülüyor (%s paket)", len(cached[1]))
+            return list(cached[1])
+        
+        if cancel is not None and cancel.is_set():
+            return []
+        
+        result = list(self._generate_packages(None))
+        logger.info("Toplam %s paket bulundu", len(result))
+        
+        # İptal edilen yüklemenin (yarım kalmış olabilecek) listesi saklanmaz
+        if cancel is not None and cancel.is_set():
+            return []
+        
+        if fingerprint:
+            self._packages_cache[serial] = (fingerprint, result)
+        return list(result)
+    
+    def get_all_packages_soa(self) -> "PackageArray":
+        """
+        Tüm paketleri Package nesnesi oluşturmadan PackageArray olarak al.
+        
+        Paket listesi önbelleği kullanılmaz.
+        """
+        packages = PackageArray()
+        if not self._device_available():
+            return packages
+        
+        for row in self._package_rows(None):
+            packages.append(*row)
+        return packages
+    
+    def iter_packages(
+        self,
+        categories: Optional[Iterable[PackageCategory]] = None
+    ) -> Iterator[Package]:
+        """
+        Paketleri liste oluşturmadan tek tek üret.
         
-        # Sistem paketleri
-        system_packages = self._get_packages_by_flag("-s")
+        Yalnızca istenen kategoriler için gereken 'pm list' çıktıları alınır;
+        paket listesi önbelleği kullanılmaz.
+        
+        Args:
+            categories: Döndürülecek kategoriler (None ise hepsi)
+        """
+        if not self._device_available():
+            return
+        
+        wanted = None if categories is None else frozenset(categories)
+        yield from self._generate_packages(wanted)
+    
+    def _generate_packages(self, wanted: Optional[FrozenSet[PackageCategory]]) -> Iterator[Package]:
+        """Paketleri sistem, kullanıcı, yalnızca devre dışı sırasıyla üret."""
+        for row in self._package_rows(wanted):
+            yield Package(*row)
+    
+    def _package_rows(self, wanted: Optional[FrozenSet[PackageCategory]]) -> Iterator[PackageRow]:
+        """Paket satırlarını (ad, kategori, etkin, kritik) Package oluşturmadan üret."""
+        def want(category: PackageCategory) -> bool:
+            return wanted is None or category in wanted
+        
+        # Devre dışı liste diğer kategorileri de etkilediği için her zaman alınır;
+        # devre dışı sistem paketlerinin kritikliği için sistem listesi de gerekir
+        flags = []
+        if want(PackageCategory.SYSTEM) or want(PackageCategory.DISABLED):
+            flags.append("-s")
+        if want(PackageCategory.USER):
+            flags.append("-3")
+        flags.append("-d")
+        
+        # Listeler tek adb çağrısında alınır
+        lists = dict(zip(flags, self._get_packages_multi(flags)))
+        system_packages = lists.get("-s", [])
+        disabled = set(lists["-d"])
+        seen = set()
+        
+        # Sistem paketleri (kritikler tek küme kesişimiyle belirlenir)
+        critical = self.CRITICAL_PACKAGES.intersection(system_packages)
         for name in system_packages:
-            packages[name] = Package(
-                name=name,
-                category=PackageCategory.SYSTEM,
-                is_critical=name in self.CRITICAL_PACKAGES
-            )
+            seen.add(name)
+            category = PackageCategory.DISABLED if name in disabled else PackageCategory.SYSTEM
+            if want(category):
+                yield name, category, name not in disabled, name in critical
         
         # Kullanıcı paketleri (3rd party)
-        user_packages = self._get_packages_by_flag("-3")
-        for name in user_packages:
-            packages[name] = Package(
-                name=name,
-                category=PackageCategory.USER
-            )
+        for name in lists.get("-3", []):
+            if name in seen:
+                continue
+            seen.add(name)
+            category = PackageCategory.DISABLED if name in disabled else PackageCategory.USER
+            if want(category):
+                yield name, category, name not in disabled, False
+        
+        # Yukarıdaki listelerde olmayan devre dışı paketler
+        if want(PackageCategory.DISABLED):
+            for name in lists["-d"]:
+                if name not in seen:
+                    yield name, PackageCategory.DISABLED, False, False
+    
+    def _get_packages_multi(self, flags) -> List[List[str]]:
+        """
+        Birden fazla flag için paket listelerini tek shell çağrısında al.
         
-        # Devre dışı paketler
-        disabled_packages = self._get_packages_by_flag("-d")
-        for name in disabled_packages:
-            if name in packages:
-                packages[name].is_enabled = False
-                packages[name].category = PackageCategory.DISABLED
-            else:
-                packages[name] = Package(
-                    name=name,
-                    category=PackageCategory.DISABLED,
-                    is_enabled=False
-                )
+        Dönen listeler flags sırasıyladır.
+        """
+        sections = self._shell_sections([f"pm list packages {flag}" for flag in flags])
+        if sections is None:
+            logger.error("Paket listesi alınamadı (%s)", " ".join(flags))
+            return [[] for _ in flags]
         
-        result = list(packages.values())
-        logger.info(f"Toplam {len(result)} paket bulundu")
-        return result
+        return [self._parse_package_lines(section) for section in sections]
+    
+    def _shell_sections(self, commands: List[str]) -> Optional[List[str]]:
+        """
+        Komutları tek shell çağrısında çalıştır, her birinin çıktısını ayrı döndür.
+        
+        ADBService.run_batch() ile aynı biçimdedir, ancak komut kalıcı
+        oturum üzerinden gönderilir.
+        
+        Returns:
+            Komut sırasıyla çıktılar veya çağrı tamamen başarısızsa None
+        """
+        result = self._shell(ADBService.join_batch(commands))
+        
+        sections = ADBService.split_batch(result, len(commands))
+        if sections is None:
+            logger.debug("Birleşik shell komutu başarısız: %s", result.stderr)
+        return sections
     
     def _get_packages_by_flag(self, flag: str) -> List[str]:
         """Belirli bir flag ile paket listesi al."""
-        result = self.adb.shell(
-            f"pm list packages {flag}",
-            device_serial=self.device_serial
-        )
+        result = self._shell(f"pm list packages {flag}")
         
         if not result.success:
-            logger.error(f"Paket listesi alınamadı ({flag}): {result.stderr}")
+            logger.error("Paket listesi alınamadı (%s): %s", flag, result.stderr)
             return []
         
-        packages = []
-        for line in result.stdout.split('\n'):
-            line = line.strip()
-            if line.startswith('package:'):
-                packages.append(line[8:])  # 'package:' prefix'ini kaldır
-        
-        return packages
+        return self._parse_package_lines(result.stdout)
+    
+    @staticmethod
+    def _parse_package_lines(output: str) -> List[str]:
+        """'pm list packages' çıktısından paket adlarını çıkar."""
+        return _RE_PACKAGE_LINE.findall(output)
     
     def uninstall(self, package_name: str, user_id: int = 0) -> bool:
         """
@@ -194,19 +497,20 @@ class PackageManager:
             bool: İşlem başarılı mı?
         """
         if package_name in self.CRITICAL_PACKAGES:
-            logger.warning(f"Kritik paket kaldırılamaz: {package_name}")
+            logger.warning("Kritik paket kaldırılamaz: %s", package_name)
             return False
         
-        result = self.adb.shell(
-            f"pm uninstall --user {user_id} {package_name}",
-            device_serial=self.device_serial
-        )
+        if not self._device_available():
+            return False
+        
+        result = self._shell(f"pm uninstall --user {user_id} {package_name}")
+        self.invalidate_cache()
         
         success = result.success and "Success" in result.stdout
         if success:
-            logger.info(f"Paket kaldırıldı: {package_name}")
+            logger.info("Paket kaldırıldı: %s", package_name)
         else:
-            logger.error(f"Paket kaldırılamadı: {package_name} - {result.stderr}")
+            logger.error("Paket kaldırılamadı: %s - %s", package_name, result.stderr)
         
         return success
     
@@ -221,16 +525,17 @@ class PackageManager:
         Returns:
             bool: İşlem başarılı mı?
         """
-        result = self.adb.shell(
-            f"pm disable-user --user {user_id} {package_name}",
-            device_serial=self.device_serial
-        )
+        if not self._device_available():
+            return False
         
-        success = result.success and "disabled" in result.stdout.lower()
+        result = self._shell(f"pm disable-user --user {user_id} {package_name}")
+        self.invalidate_cache()
+        
+        success = result.success and _RE_DISABLED.search(result.stdout) is not None
         if success:
-            logger.info(f"Paket donduruldu: {package_name}")
+            logger.info("Paket donduruldu: %s", package_name)
         else:
-            logger.error(f"Paket dondurulamadı: {package_name} - {result.stderr}")
+            logger.error("Paket dondurulamadı: %s - %s", package_name, result.stderr)
         
         return success
     
@@ -244,16 +549,17 @@ class PackageManager:
         Returns:
             bool: İşlem başarılı mı?
         """
-        result = self.adb.shell(
-            f"pm enable {package_name}",
-            device_serial=self.device_serial
-        )
+        if not self._device_available():
+            return False
+        
+        result = self._shell(f"pm enable {package_name}")
+        self.invalidate_cache()
         
-        success = result.success and "enabled" in result.stdout.lower()
+        success = result.success and _RE_ENABLED.search(result.stdout) is not None
         if success:
-            logger.info(f"Paket etkinleştirildi: {package_name}")
+            logger.info("Paket etkinleştirildi: %s", package_name)
         else:
-            logger.error(f"Paket etkinleştirilemedi: {package_name} - {result.stderr}")
+            logger.error("Paket etkinleştirilemedi: %s - %s", package_name, result.stderr)
         
         return success
     
@@ -274,15 +580,15 @@ class PackageManager:
         Returns:
             bool: İşlem başarılı mı?
         """
-        result = self.adb.shell(
-            f"appops set {package_name} {operation} {mode}",
-            device_serial=self.device_serial
-        )
+        if not self._device_available():
+            return False
+        
+        result = self._shell(f"appops set {package_name} {operation} {mode}")
         
         if result.success:
-            logger.info(f"AppOps ayarlandı: {package_name} {operation}={mode}")
+            logger.info("AppOps ayarlandı: %s %s=%s", package_name, operation, mode)
         else:
-            logger.error(f"AppOps ayarlanamadı: {result.stderr}")
+            logger.error("AppOps ayarlanamadı: %s", result.stderr)
         
         return result.success
     
@@ -301,15 +607,15 @@ class PackageManager:
         Returns:
             bool: İşlem başarılı mı?
         """
-        result = self.adb.shell(
-            f"am set-standby-bucket {package_name} {bucket.value}",
-            device_serial=self.device_serial
-        )
+        if not self._device_available():
+            return False
+        
+        result = self._shell(f"am set-standby-bucket {package_name} {bucket.value}")
         
         if result.success:
-            logger.info(f"Standby bucket ayarlandı: {package_name} -> {bucket.value}")
+            logger.info("Standby bucket ayarlandı: %s -> %s", package_name, bucket.value)
         else:
-            logger.error(f"Standby bucket ayarlanamadı: {result.stderr}")
+            logger.error("Standby bucket ayarlanamadı: %s", result.stderr)
         
         return result.success
     
@@ -323,9 +629,8 @@ class PackageManager:
         Returns:
             Dict: Paket bilgileri veya None
         """
-        result = self.adb.shell(
+        result = self._shell(
             f"dumpsys package {package_name}",
-            device_serial=self.device_serial,
             timeout=10
         )
         
@@ -338,11 +643,11 @@ class PackageManager:
         }
         
         # Version bilgisini parse et
-        version_match = re.search(r'versionName=([^\s]+)', result.stdout)
+        version_match = _RE_VERSION_NAME.search(result.stdout)
         if version_match:
             info['version_name'] = version_match.group(1)
         
-        code_match = re.search(r'versionCode=(\d+)', result.stdout)
+        code_match = _RE_VERSION_CODE.search(result.stdout)
         if code_match:
             info['version_code'] = int(code_match.group(1))
         
@@ -361,54 +666,80 @@ class PackageManager:
         }
         
         try:
+            # Dört sorgu tek adb çağrısında
+            sections = self._shell_sections([
+                f"cmd appops get {package_name} RUN_IN_BACKGROUND",
+                f"cmd appops get {package_name} WAKE_LOCK",
+                f"am get-standby-bucket {package_name}",
+                f"dumpsys package {package_name}",
+            ])
+            if sections is None:
+                return details
+            appops_bg, appops_wake, bucket_out, dumpsys_out = sections
+            
             # 1. RUN_IN_BACKGROUND
-            res = self.adb.shell(f"cmd appops get {package_name} RUN_IN_BACKGROUND", device_serial=self.device_serial)
-            if res.success:
-                stdout = res.stdout.lower()
-                if "allow" in stdout: details["run_in_background"] = "✅ İzin Verildi"
-                elif "ignore" in stdout: details["run_in_background"] = "⚠️ Yoksay (Ignore)"
-                elif "deny" in stdout: details["run_in_background"] = "⛔ Engellendi"
-                else: details["run_in_background"] = "❓ Bilinmiyor"
+            details["run_in_background"] = self._appops_label(appops_bg)
             
             # 2. WAKE_LOCK
-            res = self.adb.shell(f"cmd appops get {package_name} WAKE_LOCK", device_serial=self.device_serial)
-            if res.success:
-                stdout = res.stdout.lower()
-                if "allow" in stdout: details["wake_lock"] = "✅ İzin Verildi"
-                elif "ignore" in stdout: details["wake_lock"] = "⚠️ Yoksay (Ignore)"
-                elif "deny" in stdout: details["wake_lock"] = "⛔ Engellendi"
-                else: details["wake_lock"] = "❓ Bilinmiyor"
+            details["wake_lock"] = self._appops_label(appops_wake)
                 
             # 3. STANDBY BUCKET
-            res = self.adb.shell(f"am get-standby-bucket {package_name}", device_serial=self.device_serial)
-            if res.success:
-                bucket_code = res.stdout.strip()
-                bucket_map = {
-                    "5": "💎 Muaf (Exempted)",
-                    "10": "🟢 Aktif (Active)",
-                    "20": "🟡 Çalışma Grubu (Working)",
-                    "30": "🟠 Sık (Frequent)",
-                    "40": "🔴 Nadir (Rare)",
-                    "45": "⛔ Kısıtlı (Restricted)",
-                    "50": "❄️ Hiç (Never)"
-                }
-                details["standby_bucket"] = bucket_map.get(bucket_code, f"Bilinmiyor ({bucket_code})")
+            bucket_code = bucket_out.strip()
+            bucket_map = {
+                "5": "💎 Muaf (Exempted)",
+                "10": "🟢 Aktif (Active)",
+                "20": "🟡 Çalışma Grubu (Working)",
+                "30": "🟠 Sık (Frequent)",
+                "40": "🔴 Nadir (Rare)",
+                "45": "⛔ Kısıtlı (Restricted)",
+                "50": "❄️ Hiç (Never)"
+            }
+            details["standby_bucket"] = bucket_map.get(bucket_code, f"Bilinmiyor ({bucket_code})")
             
             # 4. Versiyon ve Yükleme Zamanı (Dumpsys)
-            res = self.adb.shell(f"dumpsys package {package_name}", device_serial=self.device_serial)
-            if res.success:
-                import re
-                v_match = re.search(r"versionName=([^\r\n]+)", res.stdout)
-                if v_match: details["version"] = v_match.group(1)
-                
-                t_match = re.search(r"firstInstallTime=([^\r\n]+)", res.stdout)
-                if t_match: details["install_time"] = t_match.group(1)
+            # Tek taramada her alanın ilk geçtiği yer alınır
+            found = {}
+            for match in _RE_DUMPSYS_DETAILS.finditer(dumpsys_out):
+                found.setdefault(match.lastgroup, match.group(match.lastgroup))
+                if len(found) == 2:
+                    break
+            details.update(found)
                 
         except Exception as e:
-            logger.error(f"Gelişmiş detay hatası: {e}")
+            logger.error("Gelişmiş detay hatası: %s", e)
             
         return details
 
+    @staticmethod
+    def _appops_label(output: str) -> str:
+        """'cmd appops get' çıktısındaki modu arayüz etiketine çevir."""
+        match = _RE_APPOPS_MODE.search(output)
+        if match is None:
+            return "❓ Bilinmiyor"
+        return _APPOPS_LABELS[match.group(1).lower()]
+    
+    def get_advanced_details_bulk(
+        self,
+        package_names: List[str],
+        max_workers: int = MAX_DETAIL_WORKERS
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Birden fazla paketin gelişmiş detaylarını paralel al.
+        
+        Her paket ayrı bir adb çağrısıdır (G/Ç beklemesi); ADB server
+        bağımsız komutları aynı anda yürütür. Bir çağrı kalıcı oturumu
+        kullanırken diğerleri tek seferlik shell'e düşer.
+        
+        Returns:
+            Dict[str, Dict]: paket adı -> get_advanced_details sonucu
+        """
+        names = list(dict.fromkeys(package_names))
+        if len(names) <= 1:
+            return {name: self.get_advanced_details(name) for name in names}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as executor:
+            return dict(zip(names, executor.map(self.get_advanced_details, names)))
+
     def get_permissions(self, package_name: str) -> List[Dict[str, Any]]:
         """
         Paketin izinlerini ve durumlarını al.
@@ -419,13 +750,10 @@ class PackageManager:
         Returns:
             List[Dict]: İzin listesi [{'name': str, 'granted': bool}]
         """
-        result = self.adb.shell(
-            f"dumpsys package {package_name}", 
-            device_serial=self.device_serial
-        )
+        result = self._shell(f"dumpsys package {package_name}")
         
         if not result.success:
-            logger.error(f"İzinler alınamadı: {result.stderr}")
+            logger.error("İzinler alınamadı: %s", result.stderr)
             return []
             
         output = result.stdout
@@ -499,61 +827,99 @@ class PackageManager:
                 
         return permissions
 
+    def set_permissions(self, package_name: str, changes: List[Tuple[str, bool]]) -> List[bool]:
+        """
+        Birden fazla izni tek shell çağrısında ver / geri al.
+        
+        Her izin için grant_permission / revoke_permission ile aynı yol
+        izlenir: önce pm grant/revoke, başarısız olursa (eşleşmesi varsa)
+        AppOps.
+        
+        Args:
+            package_name: Paket adı
+            changes: (izin adı, verilsin mi) listesi
+            
+        Returns:
+            changes sırasıyla her işlemin başarılı olup olmadığı
+        """
+        if not changes:
+            return []
+        if not self._device_available():
+            return [False] * len(changes)
+        
+        commands = []
+        for permission, grant in changes:
+            command = f"pm {'grant' if grant else 'revoke'} {package_name} {permission}"
+            op_name = get_appops_for_permission(permission)
+            if op_name:
+                command += f" || cmd appops set {package_name} {op_name} {'allow' if grant else 'ignore'}"
+            # Bölümün son satırı zincirin çıkış kodu
+            commands.append(f"{command}; echo $?")
+        
+        sections = self._shell_sections(commands)
+        if sections is None:
+            logger.error("İzinler değiştirilemedi: %s", package_name)
+            return [False] * len(changes)
+        
+        results = []
+        for (permission, grant), section in zip(changes, sections):
+            success = section.strip().rpartition("\n")[2] == "0"
+            results.append(success)
+            if success:
+                logger.info("İzin %s: %s -> %s", "verildi" if grant else "geri alındı", package_name, permission)
+            else:
+                logger.error("İzin %s: %s -> %s", "verilemedi" if grant else "geri alınamadı", package_name, permission)
+        return results
+    
     def grant_permission(self, package_name: str, permission: str) -> bool:
         """
         İzni ver (Sadece runtime izinleri).
         """
+        if not self._device_available():
+            return False
+        
         # 1. PM Grant
-        result = self.adb.shell(
-            f"pm grant {package_name} {permission}",
-            device_serial=self.device_serial
-        )
+        result = self._shell(f"pm grant {package_name} {permission}")
         
         if result.success:
-            logger.info(f"İzin verildi (pm): {package_name} -> {permission}")
+            logger.info("İzin verildi (pm): %s -> %s", package_name, permission)
             return True
             
         # 2. AppOps Fallback
         op_name = get_appops_for_permission(permission)
         if op_name:
-            logger.warning(f"PM grant başarısız, AppOps deneniyor ({op_name})...")
-            result = self.adb.shell(
-                f"cmd appops set {package_name} {op_name} allow",
-                device_serial=self.device_serial
-            )
+            logger.warning("PM grant başarısız, AppOps deneniyor (%s)...", op_name)
+            result = self._shell(f"cmd appops set {package_name} {op_name} allow")
             if result.success:
-                 logger.info(f"İzin verildi (appops): {package_name} -> {permission}")
+                 logger.info("İzin verildi (appops): %s -> %s", package_name, permission)
                  return True
         
-        logger.error(f"İzin verilemedi: {result.stderr}")
+        logger.error("İzin verilemedi: %s", result.stderr)
         return False
 
     def revoke_permission(self, package_name: str, permission: str) -> bool:
         """
         İzni geri al (Sadece runtime izinleri).
         """
+        if not self._device_available():
+            return False
+        
         # 1. PM Revoke
-        result = self.adb.shell(
-            f"pm revoke {package_name} {permission}",
-            device_serial=self.device_serial
-        )
+        result = self._shell(f"pm revoke {package_name} {permission}")
         
         if result.success:
-            logger.info(f"İzin geri alındı (pm): {package_name} -> {permission}")
+            logger.info("İzin geri alındı (pm): %s -> %s", package_name, permission)
             return True
             
         # 2. AppOps Fallback
         op_name = get_appops_for_permission(permission)
         if op_name:
-            logger.warning(f"PM revoke başarısız, AppOps deneniyor ({op_name})...")
-            result = self.adb.shell(
-                f"cmd appops set {package_name} {op_name} ignore",
-                device_serial=self.device_serial
-            )
+            logger.warning("PM revoke başarısız, AppOps deneniyor (%s)...", op_name)
+            result = self._shell(f"cmd appops set {package_name} {op_name} ignore")
             if result.success:
-                 logger.info(f"İzin geri alındı (appops): {package_name} -> {permission}")
+                 logger.info("İzin geri alındı (appops): %s -> %s", package_name, permission)
                  return True
 
-        logger.error(f"İzin geri alınamadı: {result.stderr}")
+        logger.error("İzin geri alınamadı: %s", result.stderr)
         return False
 
@@ -4,61 +4,66 @@ Android İzin Tanımları
 Sık kullanılan Android izinleri ve açıklamaları.
 """
 
+from functools import lru_cache
+
+# Tablolarda android.permission. ön eki olmadan tutulur
+_ANDROID_PREFIX = "android.permission."
+
 PERMISSION_DESCRIPTIONS = {
     # Ağ ve İnternet
-    "android.permission.INTERNET": "Tam İnternet Erişimi",
-    "android.permission.ACCESS_NETWORK_STATE": "Ağ Bağlantılarını Görüntüleme",
-    "android.permission.ACCESS_WIFI_STATE": "Wi-Fi Bağlantılarını Görüntüleme",
-    "android.permission.CHANGE_WIFI_STATE": "Wi-Fi Durumunu Değiştirme",
-    "android.permission.BLUETOOTH": "Bluetooth Cihazlarla Eşleşme",
-    "android.permission.BLUETOOTH_ADMIN": "Bluetooth Ayarlarına Erişim",
+    "INTERNET": "Tam İnternet Erişimi",
+    "ACCESS_NETWORK_STATE": "Ağ Bağlantılarını Görüntüleme",
+    "ACCESS_WIFI_STATE": "Wi-Fi Bağlantılarını Görüntüleme",
+    "CHANGE_WIFI_STATE": "Wi-Fi Durumunu Değiştirme",
+    "BLUETOOTH": "Bluetooth Cihazlarla Eşleşme",
+    "BLUETOOTH_ADMIN": "Bluetooth Ayarlarına Erişim",
     
     # Konum
-    "android.permission.ACCESS_FINE_LOCATION": "Hassas Konum (GPS)",
-    "android.permission.ACCESS_COARSE_LOCATION": "Yaklaşık Konum (Ağ)",
-    "android.permission.ACCESS_BACKGROUND_LOCATION": "Arka Planda Konum Erişimi",
+    "ACCESS_FINE_LOCATION": "Hassas Konum (GPS)",
+    "ACCESS_COARSE_LOCATION": "Yaklaşık Konum (Ağ)",
+    "ACCESS_BACKGROUND_LOCATION": "Arka Planda Konum Erişimi",
     
     # Kamera ve Mikrofon
-    "android.permission.CAMERA": "Kamera Kullanımı",
-    "android.permission.RECORD_AUDIO": "Ses Kaydetme (Mikrofon)",
+    "CAMERA": "Kamera Kullanımı",
+    "RECORD_AUDIO": "Ses Kaydetme (Mikrofon)",
     
     # Depolama
-    "android.permission.READ_EXTERNAL_STORAGE": "Depolamayı Okuma",
-    "android.permission.WRITE_EXTERNAL_STORAGE": "Depolamaya Yazma",
-    "android.permission.MANAGE_EXTERNAL_STORAGE": "Tüm Dosyalara Erişim",
-    "android.permission.READ_MEDIA_IMAGES": "Fotoğraf ve Videolara Erişim",
-    "android.permission.READ_MEDIA_VIDEO": "Videolara Erişim",
-    "android.permission.READ_MEDIA_AUDIO": "Ses Dosyalarına Erişim",
+    "READ_EXTERNAL_STORAGE": "Depolamayı Okuma",
+    "WRITE_EXTERNAL_STORAGE": "Depolamaya Yazma",
+    "MANAGE_EXTERNAL_STORAGE": "Tüm Dosyalara Erişim",
+    "READ_MEDIA_IMAGES": "Fotoğraf ve Videolara Erişim",
+    "READ_MEDIA_VIDEO": "Videolara Erişim",
+    "READ_MEDIA_AUDIO": "Ses Dosyalarına Erişim",
     
     # Kişiler ve Takvim
-    "android.permission.READ_CONTACTS": "Kişileri Okuma",
-    "android.permission.WRITE_CONTACTS": "Kişileri Düzenleme",
-    "android.permission.READ_CALENDAR": "Takvim Etkinliklerini Okuma",
-    "android.permission.WRITE_CALENDAR": "Takvim Etkinlikleri Ekleme",
-    "android.permission.READ_CALL_LOG": "Arama Kayıtlarını Okuma",
-    "android.permission.WRITE_CALL_LOG": "Arama Kayıtlarını Düzenleme",
+    "READ_CONTACTS": "Kişileri Okuma",
+    "WRITE_CONTACTS": "Kişileri Düzenleme",
+    "READ_CALENDAR": "Takvim Etkinliklerini Okuma",
+    "WRITE_CALENDAR": "Takvim Etkinlikleri Ekleme",
+    "READ_CALL_LOG": "Arama Kayıtlarını Okuma",
+    "WRITE_CALL_LOG": "Arama Kayıtlarını Düzenleme",
     
     # Telefon ve SMS
-    "android.permission.CALL_PHONE": "Telefon Araması Yapma",
-    "android.permission.READ_PHONE_STATE": "Telefon Durumunu ve Kimliğini Okuma",
-    "android.permission.SEND_SMS": "SMS Gönderme",
-    "android.permission.READ_SMS": "SMS Okuma",
-    "android.permission.RECEIVE_SMS": "SMS Alma",
-    "android.permission.RECEIVE_MMS": "MMS Alma",
+    "CALL_PHONE": "Telefon Araması Yapma",
+    "READ_PHONE_STATE": "Telefon Durumunu ve Kimliğini Okuma",
+    "SEND_SMS": "SMS Gönderme",
+    "READ_SMS": "SMS Okuma",
+    "RECEIVE_SMS": "SMS Alma",
+    "RECEIVE_MMS": "MMS Alma",
     
     # Sistem
-    "android.permission.WAKE_LOCK": "Cihazın Uykuya Geçmesini Önleme",
-    "android.permission.RECEIVE_BOOT_COMPLETED": "Başlangıçta Çalışma",
-    "android.permission.FOREGROUND_SERVICE": "Ön Plan Hizmeti Çalıştırma",
-    "android.permission.SYSTEM_ALERT_WINDOW": "Diğer Uygulamaların Üzerinde Görüntüleme",
-    "android.permission.WRITE_SETTINGS": "Sistem Ayarlarını Değiştirme",
-    "android.permission.KILL_BACKGROUND_PROCESSES": "Arka Plan İşlemlerini Kapatma",
-    "android.permission.POST_NOTIFICATIONS": "Bildirim Gönderme",
+    "WAKE_LOCK": "Cihazın Uykuya Geçmesini Önleme",
+    "RECEIVE_BOOT_COMPLETED": "Başlangıçta Çalışma",
+    "FOREGROUND_SERVICE": "Ön Plan Hizmeti Çalıştırma",
+    "SYSTEM_ALERT_WINDOW": "Diğer Uygulamaların Üzerinde Görüntüleme",
+    "WRITE_SETTINGS": "Sistem Ayarlarını Değiştirme",
+    "KILL_BACKGROUND_PROCESSES": "Arka Plan İşlemlerini Kapatma",
+    "POST_NOTIFICATIONS": "Bildirim Gönderme",
     
     # Diğer
-    "android.permission.VIBRATE": "Titreşim Kontrolü",
-    "android.permission.FLASHLIGHT": "Feneri Açma/Kapama",
-    "android.permission.NFC": "NFC İletişimi",
+    "VIBRATE": "Titreşim Kontrolü",
+    "FLASHLIGHT": "Feneri Açma/Kapama",
+    "NFC": "NFC İletişimi",
     "com.android.vending.BILLING": "Google Play Ödeme Hizmeti",
     "com.google.android.c2dm.permission.RECEIVE": "Bulut Bildirimleri Alma (FCM)",
 }
@@ -66,55 +71,59 @@ PERMISSION_DESCRIPTIONS = {
 # İzin -> AppOps eşleşmesi (Legacy uygulamalar için)
 PERMISSION_TO_APPOPS = {
     # Konum
-    "android.permission.ACCESS_FINE_LOCATION": "FINE_LOCATION",
-    "android.permission.ACCESS_COARSE_LOCATION": "COARSE_LOCATION",
-    "android.permission.ACCESS_BACKGROUND_LOCATION": "FINE_LOCATION", # Genellikle FINE ile aynı gruptadır
+    "ACCESS_FINE_LOCATION": "FINE_LOCATION",
+    "ACCESS_COARSE_LOCATION": "COARSE_LOCATION",
+    "ACCESS_BACKGROUND_LOCATION": "FINE_LOCATION", # Genellikle FINE ile aynı gruptadır
     
     # Kamera / Mikrofon
-    "android.permission.CAMERA": "CAMERA",
-    "android.permission.RECORD_AUDIO": "RECORD_AUDIO",
+    "CAMERA": "CAMERA",
+    "RECORD_AUDIO": "RECORD_AUDIO",
     
     # Depolama (API < 30)
-    "android.permission.READ_EXTERNAL_STORAGE": "READ_EXTERNAL_STORAGE",
-    "android.permission.WRITE_EXTERNAL_STORAGE": "WRITE_EXTERNAL_STORAGE",
+    "READ_EXTERNAL_STORAGE": "READ_EXTERNAL_STORAGE",
+    "WRITE_EXTERNAL_STORAGE": "WRITE_EXTERNAL_STORAGE",
     
     # Medya (API >= 33)
-    "android.permission.READ_MEDIA_IMAGES": "READ_MEDIA_IMAGES",
-    "android.permission.READ_MEDIA_VIDEO": "READ_MEDIA_VIDEO",
-    "android.permission.READ_MEDIA_AUDIO": "READ_MEDIA_AUDIO",
+    "READ_MEDIA_IMAGES": "READ_MEDIA_IMAGES",
+    "READ_MEDIA_VIDEO": "READ_MEDIA_VIDEO",
+    "READ_MEDIA_AUDIO": "READ_MEDIA_AUDIO",
     
     # Kişiler
-    "android.permission.READ_CONTACTS": "READ_CONTACTS",
-    "android.permission.WRITE_CONTACTS": "WRITE_CONTACTS",
+    "READ_CONTACTS": "READ_CONTACTS",
+    "WRITE_CONTACTS": "WRITE_CONTACTS",
     
     # Takvim
-    "android.permission.READ_CALENDAR": "READ_CALENDAR",
-    "android.permission.WRITE_CALENDAR": "WRITE_CALENDAR",
+    "READ_CALENDAR": "READ_CALENDAR",
+    "WRITE_CALENDAR": "WRITE_CALENDAR",
     
     # Arama Kayıtları
-    "android.permission.READ_CALL_LOG": "READ_CALL_LOG",
-    "android.permission.WRITE_CALL_LOG": "WRITE_CALL_LOG",
+    "READ_CALL_LOG": "READ_CALL_LOG",
+    "WRITE_CALL_LOG": "WRITE_CALL_LOG",
     
     # Telefon
-    "android.permission.CALL_PHONE": "CALL_PHONE",
-    "android.permission.READ_PHONE_STATE": "READ_PHONE_STATE",
+    "CALL_PHONE": "CALL_PHONE",
+    "READ_PHONE_STATE": "READ_PHONE_STATE",
     
     # SMS
-    "android.permission.SEND_SMS": "SEND_SMS",
-    "android.permission.READ_SMS": "READ_SMS",
-    "android.permission.RECEIVE_SMS": "RECEIVE_SMS",
-    "android.permission.RECEIVE_MMS": "RECEIVE_MMS",
+    "SEND_SMS": "SEND_SMS",
+    "READ_SMS": "READ_SMS",
+    "RECEIVE_SMS": "RECEIVE_SMS",
+    "RECEIVE_MMS": "RECEIVE_MMS",
     
     # Diğer
-    "android.permission.SYSTEM_ALERT_WINDOW": "SYSTEM_ALERT_WINDOW",
-    "android.permission.WRITE_SETTINGS": "WRITE_SETTINGS",
-    "android.permission.POST_NOTIFICATIONS": "POST_NOTIFICATION",
+    "SYSTEM_ALERT_WINDOW": "SYSTEM_ALERT_WINDOW",
+    "WRITE_SETTINGS": "WRITE_SETTINGS",
+    "POST_NOTIFICATIONS": "POST_NOTIFICATION",
 }
 
+@lru_cache(maxsize=256)
 def get_permission_description(permission_name: str) -> str:
     """İzin adından açıklamasını döndürür."""
-    return PERMISSION_DESCRIPTIONS.get(permission_name, permission_name)
+    return PERMISSION_DESCRIPTIONS.get(
+        permission_name.removeprefix(_ANDROID_PREFIX), permission_name
+    )
 
+@lru_cache(maxsize=256)
 def get_appops_for_permission(permission_name: str) -> str:
     """İzin adına karşılık gelen AppOps operasyonunu döndürür."""
-    return PERMISSION_TO_APPOPS.get(permission_name)
+    return PERMISSION_TO_APPOPS.get(permission_name.removeprefix(_ANDROID_PREFIX))
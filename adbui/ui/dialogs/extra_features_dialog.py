@@ -9,14 +9,55 @@ from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGroupBox,
     QLabel, QPushButton, QMessageBox, QWidget
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, QThread, Signal, Slot
 from PySide6.QtGui import QIcon
 
-from ...core.adb_service import ADBService
+from typing import Optional
+
+from ...core.adb_service import ADBService, DnsStatus
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Reklam engelleme için kullanılan Private DNS sunucusu
+ADGUARD_DNS_HOST = "dns.adguard-dns.com"
+
+# DNS durum etiketi stilleri
+_STATUS_ACTIVE_STYLE = "color: #4cd964; font-weight: bold;"
+_STATUS_OFF_STYLE = "color: #ff3b30; font-weight: bold;"
+_STATUS_OTHER_STYLE = "color: #ffcc00; font-weight: bold;"
+
+
+class DnsStatusThread(QThread):
+    """Private DNS durumunu (istenirse önce ayarlayarak) arka planda alan thread."""
+    
+    loaded = Signal(object)  # DnsStatus veya ayarlanamadıysa None
+    error_occurred = Signal(str)
+    
+    def __init__(
+        self,
+        adb_service: ADBService,
+        device_serial: str,
+        apply: bool = False,
+        hostname: Optional[str] = None
+    ):
+        super().__init__()
+        self.adb_service = adb_service
+        self.device_serial = device_serial
+        self.apply = apply
+        self.hostname = hostname
+    
+    def run(self):
+        try:
+            if self.apply:
+                status = self.adb_service.apply_private_dns(self.device_serial, self.hostname)
+            else:
+                status = self.adb_service.get_private_dns(self.device_serial)
+            self.loaded.emit(status)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+
+
 class ExtraFeaturesDialog(QDialog):
     """Diğer Özellikler Penceresi."""
     
@@ -27,6 +68,8 @@ class ExtraFeaturesDialog(QDialog):
         
         self.adb_service = adb_service
         self.device_serial = device_serial
+        self._dns_thread: Optional[DnsStatusThread] = None
+        self._dns_action: Optional[str] = None
         
         if not self.device_serial:
             QMessageBox.warning(self, "Hata", "Lütfen önce bir cihaz seçin.")
@@ -86,47 +129,88 @@ class ExtraFeaturesDialog(QDialog):
         close_btn.clicked.connect(self.accept)
         layout.addWidget(close_btn, 0, Qt.AlignRight)
 
+    def _start_dns_task(self, action: Optional[str] = None, hostname: Optional[str] = None):
+        """
+        DNS işlemini arka planda başlat (butonlar işlem bitene kadar kilitli).
+        
+        Args:
+            action: None (sadece durum), "enable" veya "disable"
+            hostname: "enable" için DNS sunucusu
+        """
+        self._dns_action = action
+        self.enable_dns_btn.setEnabled(False)
+        self.disable_dns_btn.setEnabled(False)
+        
+        self._dns_thread = DnsStatusThread(
+            self.adb_service, self.device_serial,
+            apply=action is not None, hostname=hostname
+        )
+        self._dns_thread.loaded.connect(self._on_dns_loaded)
+        self._dns_thread.error_occurred.connect(self._on_dns_error)
+        self._dns_thread.start()
+    
+    def _finish_dns_task(self) -> Optional[str]:
+        """Butonları aç ve biten işlemin türünü döndür."""
+        self.enable_dns_btn.setEnabled(True)
+        self.disable_dns_btn.setEnabled(True)
+        return self._dns_action
+
+    @Slot()
     def _refresh_status(self):
         """Mevcut DNS durumunu kontrol et."""
-        try:
-            status = self.adb_service.get_private_dns(self.device_serial)
-            mode = status.get('mode', 'unknown')
-            hostname = status.get('hostname', '')
-            
-            if mode == 'hostname' and 'adguard' in hostname:
-                self.dns_status_text.setText(f"✅ Aktif ({hostname})")
-                self.dns_status_text.setStyleSheet("color: #4cd964; font-weight: bold;")
-            elif mode == 'off':
-                self.dns_status_text.setText("❌ Kapalı")
-                self.dns_status_text.setStyleSheet("color: #ff3b30; font-weight: bold;")
-            else:
-                self.dns_status_text.setText(f"⚠️ {mode} ({hostname})")
-                self.dns_status_text.setStyleSheet("color: #ffcc00; font-weight: bold;")
-                
-        except Exception as e:
-            self.dns_status_text.setText("Hata oluştu")
-            logger.error(f"DNS durumu alınamadı: {e}")
+        self._start_dns_task()
 
-    def _enable_adblock(self):
-        """AdGuard DNS'i aktif et."""
-        try:
-            success = self.adb_service.set_private_dns(self.device_serial, "dns.adguard-dns.com")
-            if success:
+    @Slot(object)
+    def _on_dns_loaded(self, status):
+        """DNS işlemi bitti (status: yeni durum veya ayarlanamadıysa None)."""
+        action = self._finish_dns_task()
+        if status is not None:
+            self._show_status(status)
+        
+        if action == "enable":
+            if status is not None:
                 QMessageBox.information(self, "Başarılı", "Reklam engelleyici aktif edildi!\nEtkisini görmek için Wifi/Mobil veriyi kapatıp açmanız gerekebilir.")
-                self._refresh_status()
             else:
                 QMessageBox.critical(self, "Hata", "DNS ayarlanamadı. Cihazın Android 9+ olduğundan emin olun.")
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"İşlem başarısız: {e}")
-
-    def _disable_dns(self):
-        """DNS'i kapat."""
-        try:
-            success = self.adb_service.disable_private_dns(self.device_serial)
-            if success:
+        elif action == "disable":
+            if status is not None:
                 QMessageBox.information(self, "Başarılı", "Private DNS kapatıldı.")
-                self._refresh_status()
             else:
                 QMessageBox.critical(self, "Hata", "DNS kapatılamadı.")
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"İşlem başarısız: {e}")
+
+    @Slot(str)
+    def _on_dns_error(self, message: str):
+        """DNS işlemi hata fırlattı."""
+        if self._finish_dns_task() is None:
+            self.dns_status_text.setText("Hata oluştu")
+            logger.error(f"DNS durumu alınamadı: {message}")
+        else:
+            QMessageBox.critical(self, "Hata", f"İşlem başarısız: {message}")
+
+    def _show_status(self, status: DnsStatus):
+        """Private DNS durumunu göster."""
+        if status.is_adguard:
+            self.dns_status_text.setText(f"✅ Aktif ({status.hostname})")
+            self.dns_status_text.setStyleSheet(_STATUS_ACTIVE_STYLE)
+        elif status.mode == 'off':
+            self.dns_status_text.setText("❌ Kapalı")
+            self.dns_status_text.setStyleSheet(_STATUS_OFF_STYLE)
+        else:
+            self.dns_status_text.setText(f"⚠️ {status.mode} ({status.hostname})")
+            self.dns_status_text.setStyleSheet(_STATUS_OTHER_STYLE)
+
+    @Slot()
+    def _enable_adblock(self):
+        """AdGuard DNS'i aktif et (ayar ve yeni durum tek adb çağrısında)."""
+        self._start_dns_task("enable", ADGUARD_DNS_HOST)
+
+    @Slot()
+    def _disable_dns(self):
+        """DNS'i kapat."""
+        self._start_dns_task("disable")
+
+    def done(self, result):
+        # Çalışan thread pencereyle birlikte yok edilmesin
+        if self._dns_thread is not None:
+            self._dns_thread.wait()
+        super().done(result)
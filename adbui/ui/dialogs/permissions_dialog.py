@@ -7,26 +7,188 @@ Paket izinlerini yöneten dialog penceresi.
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, 
     QTableWidgetItem, QPushButton, QLabel, QHeaderView,
-    QCheckBox, QWidget, QMessageBox, QAbstractItemView
+    QMessageBox, QAbstractItemView, QApplication,
+    QStyle, QStyledItemDelegate, QStyleOptionViewItem
+)
+from PySide6.QtCore import (
+    Qt, QCoreApplication, QEvent, QObject, QRunnable, QThreadPool, QTimer, Signal, Slot
 )
-from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtGui import QColor, QFont
 
 from ...core.package_manager import PackageManager
 from ...data.permissions import get_permission_description
 
-class PermissionLoaderThread(QThread):
-    """İzinleri arka planda yükleyen thread."""
+# Art arda yapılan izin değişikliklerinin tek adb çağrısında toplandığı süre (ms)
+PERMISSION_BATCH_DELAY_MS = 50
+
+# Stil sayfaları ve yazı tipleri (modül yüklenirken bir kez oluşturulur)
+_BOLD_FONT = QFont()
+_BOLD_FONT.setBold(True)
+
+_DIALOG_STYLE = """
+QDialog {
+    background-color: #1a1a2e;
+    color: #e8e8e8;
+}
+QTableWidget {
+    background-color: #16213e;
+    gridline-color: #2d2d44;
+    border: 1px solid #2d2d44;
+    border-radius: 8px;
+}
+QHeaderView::section {
+    background-color: #0f0f23;
+    color: #a0a0a0;
+    padding: 8px;
+    border: none;
+}
+QTableWidgetItem {
+    padding: 10px;
+}
+QLabel {
+    color: #e8e8e8;
+}
+"""
+
+_TABLE_STYLE = """
+QTableWidget { alternate-background-color: #1a1a2e; }
+QTableWidget::indicator { width: 20px; height: 20px; }
+"""
+
+# Sistem tarafından kilitli izinlerin gösterge dolgusu
+_LOCKED_INDICATOR_COLOR = QColor("#3d3d3d")
+
+_REFRESH_BUTTON_STYLE = """
+QPushButton {
+    background-color: #4a4e69;
+    color: white; border: none; padding: 8px 16px; border-radius: 6px;
+}
+QPushButton:hover { background-color: #6c757d; }
+"""
+
+_CLOSE_BUTTON_STYLE = """
+QPushButton {
+    background-color: #2d2d44;
+    color: white; border: none; padding: 8px 16px; border-radius: 6px;
+}
+QPushButton:hover { background-color: #3d3d5c; }
+"""
+
+class PermissionCheckDelegate(QStyledItemDelegate):
+    """
+    Durum sütununun checkbox'ını hücreye doğrudan çizen delegate.
+    
+    Satır başına checkbox widget'ı oluşturulmaz; işaret durumu öğenin
+    Qt.CheckStateRole verisinde, izin adı Qt.UserRole'de tutulur.
+    Değiştirilebilir izinler Qt.ItemIsUserCheckable bayrağı taşır;
+    Qt.ItemIsEnabled kaldırılan öğeler gri çizilir ve tıklanamaz.
+    """
+    
+    permission_toggled = Signal(str, bool)  # izin adı, verilsin mi
+    
+    def _indicator_option(self, option, index) -> QStyleOptionViewItem:
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        
+        rect = style.subElementRect(QStyle.SE_ItemViewItemCheckIndicator, opt, opt.widget)
+        rect.moveCenter(opt.rect.center())
+        opt.rect = rect
+        opt.state &= ~(QStyle.State_HasFocus | QStyle.State_On | QStyle.State_Off)
+        opt.state |= QStyle.State_On if opt.checkState == Qt.Checked else QStyle.State_Off
+        return opt
+    
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        widget = opt.widget
+        style = widget.style() if widget else QApplication.style()
+        
+        # Arka plan (alternatif satır rengi vb.)
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, opt, painter, widget)
+        
+        indicator = self._indicator_option(option, index)
+        if not index.flags() & Qt.ItemIsUserCheckable:
+            painter.fillRect(indicator.rect, _LOCKED_INDICATOR_COLOR)
+        style.drawPrimitive(QStyle.PE_IndicatorItemViewItemCheck, indicator, painter, widget)
+    
+    def editorEvent(self, event, model, option, index):
+        flags = index.flags()
+        if not (flags & Qt.ItemIsUserCheckable and flags & Qt.ItemIsEnabled):
+            return False
+        
+        # Hücrenin tamamı tıklanabilir
+        if event.type() in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick):
+            return event.button() == Qt.LeftButton
+        if event.type() != QEvent.MouseButtonRelease or event.button() != Qt.LeftButton:
+            return False
+        if not option.rect.contains(event.position().toPoint()):
+            return False
+        
+        checked = Qt.CheckState(index.data(Qt.CheckStateRole)) != Qt.Checked
+        model.setData(index, Qt.Checked if checked else Qt.Unchecked, Qt.CheckStateRole)
+        self.permission_toggled.emit(index.data(Qt.UserRole), checked)
+        return True
+
+
+class PermissionLoaderSignals(QObject):
+    """PermissionLoaderTask sinyalleri (QRunnable bir QObject değildir)."""
     loaded = Signal(list)
+
+
+class PermissionLoaderTask(QRunnable):
+    """İzinleri global QThreadPool'da yükleyen görev (yenilemede thread açılmaz)."""
     
-    def __init__(self, pm, package_name):
+    def __init__(self, pm, package_name, signals: PermissionLoaderSignals):
         super().__init__()
         self.pm = pm
         self.package_name = package_name
+        self.signals = signals
         
     def run(self):
         perms = self.pm.get_permissions(self.package_name)
-        self.loaded.emit(perms)
+        self.signals.loaded.emit(perms)
+
+
+_permission_pool = None
+
+
+def permission_pool() -> QThreadPool:
+    """
+    İzin değişikliklerinin uygulandığı tek thread'li havuz.
+    
+    Gruplar gönderildikleri sırayla uygulanır. Havuz uygulamaya bağlıdır;
+    pencere kapandıktan sonra gönderilen grup da tamamlanır.
+    """
+    global _permission_pool
+    if _permission_pool is None:
+        _permission_pool = QThreadPool(QCoreApplication.instance())
+        _permission_pool.setMaxThreadCount(1)
+    return _permission_pool
+
+
+class PermissionBatchSignals(QObject):
+    """PermissionBatchTask sinyalleri (QRunnable bir QObject değildir)."""
+    finished_ops = Signal(list)  # changes sırasıyla başarı durumları
+
+
+class PermissionBatchTask(QRunnable):
+    """Biriken izin değişikliklerini tek adb çağrısında uygulayan görev."""
+    
+    def __init__(self, pm, package_name, changes, signals: PermissionBatchSignals = None):
+        super().__init__()
+        self.pm = pm
+        self.package_name = package_name
+        self.changes = changes
+        self.signals = signals
+        
+    def run(self):
+        try:
+            results = self.pm.set_permissions(self.package_name, self.changes)
+        except Exception:
+            results = [False] * len(self.changes)
+        if self.signals is not None:
+            self.signals.finished_ops.emit(results)
 
 
 class PermissionsDialog(QDialog):
@@ -44,30 +206,25 @@ class PermissionsDialog(QDialog):
         self.setModal(True)
         
         # Stil
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #1a1a2e;
-                color: #e8e8e8;
-            }
-            QTableWidget {
-                background-color: #16213e;
-                gridline-color: #2d2d44;
-                border: 1px solid #2d2d44;
-                border-radius: 8px;
-            }
-            QHeaderView::section {
-                background-color: #0f0f23;
-                color: #a0a0a0;
-                padding: 8px;
-                border: none;
-            }
-            QTableWidgetItem {
-                padding: 10px;
-            }
-            QLabel {
-                color: #e8e8e8;
-            }
-        """)
+        self.setStyleSheet(_DIALOG_STYLE)
+        
+        # Bekleyen izin değişiklikleri: (izin adı, verilsin mi, durum öğesi)
+        # _batch_ops: uçuştaki grup (boş değilse sonucu bekleniyor)
+        self._pending_ops = []
+        self._batch_ops = []
+        self._batch_signals = None
+        # Yenileme istendiğinde değişiklikler bitene kadar ertelenir
+        self._reload_requested = False
+        # Tablo yenilendiğinde artar; eski satırların sonuçları yok sayılır
+        self._generation = 0
+        self._batch_generation = 0
+        # İzin adı -> durum sütunundaki öğe
+        self._state_items = {}
+        
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(PERMISSION_BATCH_DELAY_MS)
+        self._flush_timer.timeout.connect(self._flush_ops)
         
         self._setup_ui()
         self._load_permissions()
@@ -100,7 +257,11 @@ class PermissionsDialog(QDialog):
         self.table.verticalHeader().setVisible(False)
         self.table.setShowGrid(False)
         self.table.setAlternatingRowColors(True)
-        self.table.setStyleSheet("alternate-background-color: #1a1a2e;")
+        self.table.setStyleSheet(_TABLE_STYLE)
+        
+        self.check_delegate = PermissionCheckDelegate(self.table)
+        self.check_delegate.permission_toggled.connect(self._on_permission_toggled)
+        self.table.setItemDelegateForColumn(2, self.check_delegate)
         
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
@@ -119,55 +280,80 @@ class PermissionsDialog(QDialog):
         btn_layout.addStretch()
         
         refresh_btn = QPushButton("🔄 Yenile")
-        refresh_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4a4e69;
-                color: white; border: none; padding: 8px 16px; border-radius: 6px;
-            }
-            QPushButton:hover { background-color: #6c757d; }
-        """)
+        refresh_btn.setStyleSheet(_REFRESH_BUTTON_STYLE)
         refresh_btn.clicked.connect(self._load_permissions)
         btn_layout.addWidget(refresh_btn)
         
         close_btn = QPushButton("Kapat")
-        close_btn.setStyleSheet("""
-             QPushButton {
-                background-color: #2d2d44;
-                color: white; border: none; padding: 8px 16px; border-radius: 6px;
-            }
-            QPushButton:hover { background-color: #3d3d5c; }
-        """)
+        close_btn.setStyleSheet(_CLOSE_BUTTON_STYLE)
         close_btn.clicked.connect(self.accept)
         btn_layout.addWidget(close_btn)
         
         layout.addLayout(btn_layout)
         
+    @Slot()
     def _load_permissions(self):
-        self.table.setRowCount(0)
         self.table.hide()
         self.loading_label.show()
         
-        self.loader = PermissionLoaderThread(self.pm, self.package_name)
-        self.loader.loaded.connect(self._on_loaded)
-        self.loader.start()
+        # Bekleyen değişiklikler eski tabloyla birlikte kaybolmasın: önce
+        # uygulanır, yükleme _on_ops_finished'da başlar
+        if self._pending_ops or self._batch_ops:
+            self._reload_requested = True
+            self._flush_timer.stop()
+            self._flush_ops()
+            return
         
+        self._reload_requested = False
+        self._generation += 1
+        
+        self._state_items = {}
+        self.table.setRowCount(0)
+        
+        # Her yükleme kendi sinyal nesnesini alır; eski yüklemelerin
+        # sonuçları _on_loaded'da ayıklanır
+        self._loader_signals = PermissionLoaderSignals()
+        self._loader_signals.loaded.connect(self._on_loaded)
+        QThreadPool.globalInstance().start(
+            PermissionLoaderTask(self.pm, self.package_name, self._loader_signals)
+        )
+        
+    @Slot(list)
     def _on_loaded(self, permissions):
+        if self.sender() is not self._loader_signals:
+            return
+        
         self.loading_label.hide()
         self.table.show()
-        self.table.setRowCount(len(permissions))
         
         if not permissions:
             self.table.setRowCount(1)
             self.table.setItem(0, 1, QTableWidgetItem("İzin bulunamadı."))
             return
-            
-        font_bold = QFont()
-        font_bold.setBold(True)
+        
+        # Satırlar toplu eklenir; tablo her satırda yeniden düzenlenip boyanmaz
+        sorting = self.table.isSortingEnabled()
+        self.table.setSortingEnabled(False)
+        self.table.setUpdatesEnabled(False)
+        self.table.blockSignals(True)
+        try:
+            self._fill_rows(permissions)
+        finally:
+            self.table.blockSignals(False)
+            self.table.setUpdatesEnabled(True)
+            self.table.setSortingEnabled(sorting)
+        self.table.viewport().update()
+    
+    def _fill_rows(self, permissions):
+        """İzin satırlarını tabloya yaz."""
+        self.table.setRowCount(len(permissions))
+        
+        descriptions = [get_permission_description(perm['name']) for perm in permissions]
         
         for i, perm in enumerate(permissions):
             name = perm['name']
             granted = perm['granted']
-            desc = get_permission_description(name)
+            desc = descriptions[i]
             
             # Name
             name_item = QTableWidgetItem(name)
@@ -178,70 +364,114 @@ class PermissionsDialog(QDialog):
             # Desc
             desc_item = QTableWidgetItem(desc)
             desc_item.setFlags(Qt.ItemIsEnabled)
-            desc_item.setFont(font_bold)
+            desc_item.setFont(_BOLD_FONT)
             desc_item.setToolTip(desc)
             self.table.setItem(i, 1, desc_item)
             
             changeable = perm.get('changeable', False)
             
-            # Checkbox Widget
-            widget = QWidget()
-            chk = QCheckBox()
-            chk.setChecked(granted)
+            # Durum (checkbox'ı PermissionCheckDelegate çizer)
+            state_item = QTableWidgetItem()
+            state_item.setData(Qt.UserRole, name)
+            state_item.setCheckState(Qt.Checked if granted else Qt.Unchecked)
             
             if changeable:
-                 chk.setStyleSheet("""
-                    QCheckBox::indicator { width: 20px; height: 20px; }
-                 """)
-                 chk.setCursor(Qt.PointingHandCursor)
-                 # Lambda içinde default argümanlar
-                 chk.clicked.connect(lambda checked, n=name, c=chk: self._toggle_permission(n, checked, c))
-
+                 state_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsUserCheckable)
             else:
-                 chk.setEnabled(False)
-                 chk.setStyleSheet("""
-                    QCheckBox::indicator { width: 20px; height: 20px; background-color: #3d3d3d; border: 1px solid #555; }
-                 """)
-                 chk.setToolTip("Bu izin sistem tarafından kilitlidir (Install-time).")
+                 state_item.setFlags(Qt.NoItemFlags)
+                 state_item.setToolTip("Bu izin sistem tarafından kilitlidir (Install-time).")
             
-            layout = QHBoxLayout(widget)
-            layout.addWidget(chk)
-            layout.setAlignment(Qt.AlignCenter)
-            layout.setContentsMargins(0,0,0,0)
-            
-            self.table.setCellWidget(i, 2, widget)
+            self.table.setItem(i, 2, state_item)
+            self._state_items[name] = state_item
             
             self.table.setRowHeight(i, 45)
             
-    def _toggle_permission(self, name, checked, checkbox):
-        """İzni aç/kapat."""
+    @Slot(str, bool)
+    def _on_permission_toggled(self, name, checked):
+        """İzin checkbox'ına tıklandı."""
+        item = self._state_items.get(name)
+        if item is not None:
+            self._toggle_permission(name, checked, item)
+    
+    def _toggle_permission(self, name, checked, item):
+        """
+        İzni aç/kapat.
         
+        Değişiklik hemen gönderilmez; PERMISSION_BATCH_DELAY_MS içinde
+        gelen diğer tıklamalarla birlikte tek adb çağrısında uygulanır.
+        """
         # Kullanıcıya beklemesini hissettir
-        checkbox.setEnabled(False)
+        item.setFlags(item.flags() & ~Qt.ItemIsEnabled)
         self.setCursor(Qt.WaitCursor)
         
-        success = False
-        try:
-            if checked:
-                success = self.pm.grant_permission(self.package_name, name)
+        self._pending_ops.append((name, checked, item))
+        self._flush_timer.start()
+    
+    @Slot()
+    def _flush_ops(self):
+        """Biriken değişiklikleri arka planda uygula."""
+        if not self._pending_ops or self._batch_ops:
+            # Uçuştaki grup varsa _on_ops_finished bekleyenleri gönderir
+            return
+        
+        self._batch_ops, self._pending_ops = self._pending_ops, []
+        self._batch_generation = self._generation
+        
+        self._batch_signals = PermissionBatchSignals()
+        self._batch_signals.finished_ops.connect(self._on_ops_finished)
+        permission_pool().start(PermissionBatchTask(
+            self.pm, self.package_name,
+            [(name, checked) for name, checked, _ in self._batch_ops],
+            self._batch_signals
+        ))
+    
+    @Slot(list)
+    def _on_ops_finished(self, results):
+        """Grup tamamlandı: öğeleri aç, başarısızları geri al."""
+        ops, self._batch_ops = self._batch_ops, []
+        
+        # Bu arada tablo yenilendiyse öğeler artık yok
+        if self._batch_generation == self._generation:
+            self._apply_results(ops, results)
+        
+        if self._pending_ops:
+            # Grup sürerken gelen tıklamalar (yenileme istendiyse hemen)
+            if self._reload_requested:
+                self._flush_ops()
             else:
-                success = self.pm.revoke_permission(self.package_name, name)
-        except Exception as e:
-            pass
-            
-        checkbox.setEnabled(True)
+                self._flush_timer.start()
+            return
+        
         self.setCursor(Qt.ArrowCursor)
-            
-        if not success:
-            # Başarısız olursa eski haline getir (sinyal tetiklemeden)
-            checkbox.blockSignals(True)
-            checkbox.setChecked(not checked) # Revert
-            checkbox.blockSignals(False)
-            
+        if self._reload_requested:
+            self._load_permissions()
+    
+    def _apply_results(self, ops, results):
+        """Öğeleri tekrar aç, başarısız değişiklikleri geri al ve bildir."""
+        failed = []
+        for (name, checked, item), success in zip(ops, results):
+            item.setFlags(item.flags() | Qt.ItemIsEnabled)
+            if not success:
+                # Başarısız olursa eski haline getir
+                item.setCheckState(Qt.Unchecked if checked else Qt.Checked) # Revert
+                failed.append(name)
+        
+        if failed:
+            names = "\n".join(f"'{name}'" for name in failed)
             QMessageBox.warning(
                 self, 
                 "İşlem Başarısız", 
-                f"'{name}' izni değiştirilemedi.\n\n"
+                f"Şu izinler değiştirilemedi:\n{names}\n\n"
                 "Bu izin sistem tarafından kilitli olabilir veya root yetkisi gerektirebilir.\n"
                 "Normal (Install-time) izinler değiştirilemez."
             )
+    
+    def done(self, result):
+        # Gönderilmemiş değişiklikler aynı havuzda, uçuştaki gruptan sonra
+        # uygulanır; pencere adb yanıtını beklemez
+        self._flush_timer.stop()
+        if self._pending_ops:
+            changes = [(name, checked) for name, checked, _ in self._pending_ops]
+            self._pending_ops = []
+            permission_pool().start(PermissionBatchTask(self.pm, self.package_name, changes))
+        super().done(result)
@@ -9,15 +9,118 @@ from PySide6.QtWidgets import (
     QLineEdit, QPushButton, QCheckBox, QSpinBox, QComboBox,
     QTabWidget, QWidget, QLabel, QGroupBox, QMessageBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import (
+    Qt, QObject, QRegularExpression, QRunnable, QThreadPool, QUrl, Signal, Slot
+)
+from PySide6.QtGui import QDesktopServices, QRegularExpressionValidator
 import logging
+import os
 
+from dataclasses import replace
 from pathlib import Path
 from ...utils.config import get_config
+from ...utils.logger import get_log_dir
 from ...ai.cache import AICache
 
 logger = logging.getLogger(__name__)
 
+# Gemini API anahtarı biçimi (boş bırakılabilir; yapıştırırken gelen boşluklar kırpılır).
+# Doğrulayıcı tüm dialog örnekleri arasında paylaşılır.
+_API_KEY_VALIDATOR = QRegularExpressionValidator(
+    QRegularExpression(r"^\s*(AIza[0-9A-Za-z_-]{35})?\s*$")
+)
+
+# Bakım butonlarının stil sayfası (objectName seçicileriyle, dialog'a bir kez uygulanır)
+_MAINT_QSS = """
+QPushButton#warningButton, QPushButton#dangerButton, QPushButton#infoButton {
+    border: none;
+    padding: 5px;
+    border-radius: 4px;
+}
+QPushButton#warningButton {
+    background-color: #ffc107;
+    color: black;
+}
+QPushButton#warningButton:hover {
+    background-color: #e0a800;
+}
+QPushButton#dangerButton {
+    background-color: #dc3545;
+    color: white;
+}
+QPushButton#dangerButton:hover {
+    background-color: #c82333;
+}
+QPushButton#infoButton {
+    background-color: #17a2b8;
+    color: white;
+}
+QPushButton#infoButton:hover {
+    background-color: #138496;
+}
+"""
+
+
+class ConfigSaveSignals(QObject):
+    """ConfigSaveTask sinyalleri."""
+    finished = Signal(bool)  # kaydedildi mi
+
+
+class ConfigSaveTask(QRunnable):
+    """Konfigürasyonu global QThreadPool'da diske yazan görev."""
+    
+    def __init__(self, config_manager, signals: ConfigSaveSignals):
+        super().__init__()
+        self.config_manager = config_manager
+        self.signals = signals
+    
+    def run(self):
+        try:
+            saved = self.config_manager.save()
+        except Exception as e:
+            logger.error(f"Konfigürasyon kaydetme hatası: {e}")
+            saved = False
+        self.signals.finished.emit(saved)
+
+
+class LogCleanupSignals(QObject):
+    """LogCleanupTask sinyalleri."""
+    finished = Signal(int, int)  # silinen, atlanan
+    error_occurred = Signal(str)
+
+
+class LogCleanupTask(QRunnable):
+    """Log dosyalarını global QThreadPool'da silen görev."""
+    
+    def __init__(self, log_dir: Path, signals: LogCleanupSignals):
+        super().__init__()
+        self.log_dir = log_dir
+        self.signals = signals
+    
+    def run(self):
+        deleted_count = 0
+        skipped_count = 0
+        try:
+            # DirEntry adı ve türü önbellekte tutar; dosya başına Path oluşturulmaz
+            with os.scandir(self.log_dir) as entries:
+                for entry in entries:
+                    if not (entry.name.endswith(".log") and entry.is_file()):
+                        continue
+                    try:
+                        os.unlink(entry.path)
+                        deleted_count += 1
+                    except PermissionError:
+                        # Windows'ta açık dosyalar silinemez
+                        skipped_count += 1
+                    except Exception as e:
+                        logger.error(f"Dosya silme hatası ({entry.path}): {e}")
+                        skipped_count += 1
+        except Exception as e:
+            logger.error(f"Log temizleme hatası: {e}")
+            self.signals.error_occurred.emit(str(e))
+            return
+        self.signals.finished.emit(deleted_count, skipped_count)
+
 
 class SettingsDialog(QDialog):
     """
@@ -26,6 +129,17 @@ class SettingsDialog(QDialog):
     API anahtarları, güvenlik ve UI ayarlarını yönetir.
     """
     
+    # Model seçicideki (etiket, model adı) çiftleri
+    _MODELS = (
+        ("gemini-flash-latest (Varsayılan)", "gemini-flash-latest"),
+        ("gemini-3-pro-preview (Yeni)", "gemini-3-pro-preview"),
+        ("gemini-3-flash-preview (Yeni)", "gemini-3-flash-preview"),
+        ("gemini-2.5-flash (Stabil)", "gemini-2.5-flash"),
+        ("gemini-2.5-flash-lite (Hızlı)", "gemini-2.5-flash-lite"),
+    )
+    # Model adı -> combo indeksi
+    _MODEL_INDEX = {model: i for i, (_, model) in enumerate(_MODELS)}
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
@@ -34,18 +148,67 @@ class SettingsDialog(QDialog):
         self.setModal(True)
         
         self.config = get_config()
+        # Tüm mesajlar için tek QMessageBox (ilk kullanımda oluşturulur)
+        self._mbox = None
         self._setup_ui()
-        self._load_settings()
     
     def _setup_ui(self):
         """UI oluştur."""
+        self.setStyleSheet(_MAINT_QSS)
+        
         layout = QVBoxLayout(self)
         layout.setSpacing(12)
         
-        # Tab widget
-        tabs = QTabWidget()
+        # Tab widget (sekmeler ilk açıldıklarında oluşturulur)
+        self.tabs = QTabWidget()
+        self._tab_builders = [
+            ("🤖 AI", self._build_ai_tab, self._load_ai_settings, self._save_ai_settings),
+            ("🔒 Güvenlik", self._build_security_tab, self._load_security_settings, self._save_security_settings),
+        ]
+        self._built_tabs = set()
+        for label, *_ in self._tab_builders:
+            self.tabs.addTab(QWidget(), label)
+        self.tabs.currentChanged.connect(self._ensure_tab_built)
+        self._ensure_tab_built(self.tabs.currentIndex())
         
-        # AI Ayarları
+        layout.addWidget(self.tabs)
+        
+        # Butonlar
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        
+        cancel_btn = QPushButton("İptal")
+        cancel_btn.clicked.connect(self.reject)
+        buttons.addWidget(cancel_btn)
+        
+        self.save_btn = QPushButton("Kaydet")
+        self.save_btn.setObjectName("successButton")
+        self.save_btn.clicked.connect(self._save_settings)
+        buttons.addWidget(self.save_btn)
+        
+        layout.addLayout(buttons)
+    
+    @Slot(int)
+    def _ensure_tab_built(self, index: int):
+        """index'teki sekme henüz oluşturulmadıysa oluştur ve ayarlarını yükle."""
+        if index < 0 or index in self._built_tabs:
+            return
+        self._built_tabs.add(index)
+        
+        label, build, _, _ = self._tab_builders[index]
+        placeholder = self.tabs.widget(index)
+        
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, build(), label)
+        self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+        
+        self._load_tab(index, self.config.config)
+    
+    def _build_ai_tab(self) -> QWidget:
+        """AI sekmesini oluştur."""
         ai_tab = QWidget()
         ai_layout = QVBoxLayout(ai_tab)
         
@@ -55,20 +218,27 @@ class SettingsDialog(QDialog):
         self.api_key_input = QLineEdit()
         self.api_key_input.setEchoMode(QLineEdit.Password)
         self.api_key_input.setPlaceholderText("AIza...")
+        self.api_key_input.setValidator(_API_KEY_VALIDATOR)
         ai_form.addRow("API Anahtarı:", self.api_key_input)
         
         # Model seçici (dropdown)
         self.model_combo = QComboBox()
-        self.model_combo.addItem("gemini-flash-latest (Varsayılan)", "gemini-flash-latest")
-        self.model_combo.addItem("gemini-3-pro-preview (Yeni)", "gemini-3-pro-preview")
-        self.model_combo.addItem("gemini-3-flash-preview (Yeni)", "gemini-3-flash-preview")
-        self.model_combo.addItem("gemini-2.5-flash (Stabil)", "gemini-2.5-flash")
-        self.model_combo.addItem("gemini-2.5-flash-lite (Hızlı)", "gemini-2.5-flash-lite")
+        self.model_combo.blockSignals(True)
+        for label, model in self._MODELS:
+            self.model_combo.addItem(label, model)
+        self.model_combo.blockSignals(False)
         ai_form.addRow("Model:", self.model_combo)
         
         self.ai_enabled = QCheckBox("AI özelliklerini etkinleştir")
         ai_form.addRow("", self.ai_enabled)
         
+        self.batch_api_enabled = QCheckBox("Büyük taramalarda Batch API kullan (yarı fiyat)")
+        self.batch_api_enabled.setToolTip(
+            "50'den fazla paketlik taramalar tek bir Batch API işi olarak gönderilir.\n"
+            "Sonuçlar 24 saate kadar gecikebilir; iş uygulama kapansa da sürer."
+        )
+        ai_form.addRow("", self.batch_api_enabled)
+        
         ai_layout.addWidget(ai_group)
         
         # Cache ayarları
@@ -91,52 +261,19 @@ class SettingsDialog(QDialog):
         
         self.clear_logs_btn = QPushButton("Logları Temizle")
         self.clear_logs_btn.setToolTip("Uygulama log dosyalarını temizler.")
-        self.clear_logs_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ffc107;
-                color: black;
-                border: none;
-                padding: 5px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #e0a800;
-            }
-        """)
+        self.clear_logs_btn.setObjectName("warningButton")
         self.clear_logs_btn.clicked.connect(self._clear_logs)
         
         self.clear_db_btn = QPushButton("Veritabanını Sıfırla")
         self.clear_db_btn.setToolTip("Tüm AI analiz geçmişini siler. Dikkat!")
-        self.clear_db_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #dc3545;
-                color: white;
-                border: none;
-                padding: 5px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #c82333;
-            }
-        """)
+        self.clear_db_btn.setObjectName("dangerButton")
         self.clear_db_btn.clicked.connect(self._clear_db)
         
         maint_layout.addWidget(self.clear_logs_btn)
         
         self.open_logs_btn = QPushButton("Log Klasörünü Aç")
         self.open_logs_btn.setToolTip("Hata loglarını incelemek için klasörü açar.")
-        self.open_logs_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #17a2b8;
-                color: white;
-                border: none;
-                padding: 5px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #138496;
-            }
-        """)
+        self.open_logs_btn.setObjectName("infoButton")
         self.open_logs_btn.clicked.connect(self._open_logs)
         maint_layout.addWidget(self.open_logs_btn)
         
@@ -146,9 +283,10 @@ class SettingsDialog(QDialog):
         
         ai_layout.addStretch()
         
-        tabs.addTab(ai_tab, "🤖 AI")
-        
-        # Güvenlik Ayarları
+        return ai_tab
+    
+    def _build_security_tab(self) -> QWidget:
+        """Güvenlik sekmesini oluştur."""
         security_tab = QWidget()
         security_layout = QVBoxLayout(security_tab)
         
@@ -193,39 +331,44 @@ class SettingsDialog(QDialog):
         security_layout.addWidget(adb_group)
         security_layout.addStretch()
         
-        tabs.addTab(security_tab, "🔒 Güvenlik")
-        
-        layout.addWidget(tabs)
-        
-        # Butonlar
-        buttons = QHBoxLayout()
-        buttons.addStretch()
-        
-        cancel_btn = QPushButton("İptal")
-        cancel_btn.clicked.connect(self.reject)
-        buttons.addWidget(cancel_btn)
-        
-        save_btn = QPushButton("Kaydet")
-        save_btn.setObjectName("successButton")
-        save_btn.clicked.connect(self._save_settings)
-        buttons.addWidget(save_btn)
-        
-        layout.addLayout(buttons)
+        return security_tab
     
     def _load_settings(self):
-        """Mevcut ayarları yükle."""
+        """Mevcut ayarları oluşturulmuş sekmelere yükle."""
         config = self.config.config
-        
+        for index in self._built_tabs:
+            self._load_tab(index, config)
+    
+    def _load_tab(self, index: int, config):
+        """
+        Sekmenin alanlarını doldur.
+        
+        Atamalar sırasında sekmedeki widget'ların sinyalleri susturulur ve
+        sekme bir kez yeniden çizilir.
+        """
+        widgets = self.tabs.widget(index).findChildren(QWidget)
+        self.setUpdatesEnabled(False)
+        blocked = [widget.blockSignals(True) for widget in widgets]
+        try:
+            self._tab_builders[index][2](config)
+        finally:
+            for widget, was_blocked in zip(widgets, blocked):
+                widget.blockSignals(was_blocked)
+            self.setUpdatesEnabled(True)
+    
+    def _load_ai_settings(self, config):
+        """AI sekmesinin alanlarını doldur."""
         self.api_key_input.setText(config.openai_api_key)
-        # Model combo'da doğru modeli seç
-        model_index = self.model_combo.findData(config.ai_model)
-        if model_index >= 0:
-            self.model_combo.setCurrentIndex(model_index)
+        # Model combo'da doğru modeli seç (listede yoksa ilk model)
+        self.model_combo.setCurrentIndex(self._MODEL_INDEX.get(config.ai_model, 0))
         self.ai_enabled.setChecked(config.ai_enabled)
+        self.batch_api_enabled.setChecked(config.ai_batch_api_enabled)
         
         self.cache_enabled.setChecked(config.cache_enabled)
         self.cache_ttl.setValue(config.cache_ttl_days)
-        
+    
+    def _load_security_settings(self, config):
+        """Güvenlik sekmesinin alanlarını doldur."""
         self.confirm_critical.setChecked(config.confirm_critical_actions)
         self.show_system.setChecked(config.show_system_packages)
         self.enable_dangerous.setChecked(config.enable_dangerous_operations)
@@ -234,99 +377,175 @@ class SettingsDialog(QDialog):
         self.command_timeout.setValue(config.command_timeout)
         self.auto_detect.setChecked(config.auto_detect_device)
     
+    @Slot()
     def _save_settings(self):
-        """Ayarları kaydet."""
+        """
+        Ayarları kaydet.
+        
+        Hiç açılmamış sekmelerin ayarları değişmediği için mevcut
+        değerleri korunur. Hiçbir değer değişmediyse diske yazılmaz.
+        """
         config = self.config.config
         
-        config.openai_api_key = self.api_key_input.text().strip()
+        # AI sekmesi ilk açılan sekmedir, her zaman oluşturulmuş olur.
+        # Kayıtlı anahtar değiştirilmediyse biçimine bakılmaz.
+        api_key = self._text(self.api_key_input)
+        if api_key != config.openai_api_key and not self.api_key_input.hasAcceptableInput():
+            self._show_message(
+                QMessageBox.Warning, "Uyarı",
+                "API anahtarı geçersiz görünüyor.\n"
+                "Gemini API anahtarları 'AIza' ile başlar ve 39 karakterdir."
+            )
+            self.tabs.setCurrentIndex(0)
+            self.api_key_input.setFocus()
+            return
+        
+        before = replace(config)
+        for index in self._built_tabs:
+            self._tab_builders[index][3](config)
+        
+        if config == before:
+            self.accept()
+            return
+        
+        # Disk yazımı UI thread'ini bloklamaz; dialog sonuç gelince kapanır
+        self.save_btn.setEnabled(False)
+        self.save_btn.setText("Kaydediliyor…")
+        self._save_signals = ConfigSaveSignals()
+        self._save_signals.finished.connect(self._on_settings_saved)
+        QThreadPool.globalInstance().start(ConfigSaveTask(self.config, self._save_signals))
+    
+    @Slot(bool)
+    def _on_settings_saved(self, saved: bool):
+        """Arka plandaki kayıt bitti."""
+        self.save_btn.setEnabled(True)
+        self.save_btn.setText("Kaydet")
+        
+        if saved:
+            logger.info("Ayarlar kaydedildi")
+            self.accept()
+        else:
+            self._error("Ayarlar kaydedilemedi!")
+    
+    @staticmethod
+    def _text(line_edit: QLineEdit) -> str:
+        """Metin alanının kenar boşlukları kırpılmış değeri."""
+        return line_edit.text().strip()
+    
+    def _save_ai_settings(self, config):
+        """AI sekmesindeki değerleri config'e yaz."""
+        config.openai_api_key = self._text(self.api_key_input)
         config.ai_model = self.model_combo.currentData() or "gemini-2.5-flash"
         config.ai_enabled = self.ai_enabled.isChecked()
+        config.ai_batch_api_enabled = self.batch_api_enabled.isChecked()
         
         config.cache_enabled = self.cache_enabled.isChecked()
         config.cache_ttl_days = self.cache_ttl.value()
-        
+    
+    def _save_security_settings(self, config):
+        """Güvenlik sekmesindeki değerleri config'e yaz."""
         config.confirm_critical_actions = self.confirm_critical.isChecked()
         config.show_system_packages = self.show_system.isChecked()
         config.enable_dangerous_operations = self.enable_dangerous.isChecked()
         
-        config.adb_path = self.adb_path.text().strip()
+        config.adb_path = self._text(self.adb_path)
         config.command_timeout = self.command_timeout.value()
         config.auto_detect_device = self.auto_detect.isChecked()
-        
-        if self.config.save():
-            logger.info("Ayarlar kaydedildi")
-            self.accept()
-        else:
-            QMessageBox.critical(self, "Hata", "Ayarlar kaydedilemedi!")
+    
+    def _show_message(self, icon, title: str, text: str,
+                      buttons=QMessageBox.Ok, default=QMessageBox.NoButton):
+        """Paylaşılan QMessageBox'ı yapılandırıp göster; basılan butonu döndür."""
+        if self._mbox is None:
+            self._mbox = QMessageBox(self)
+        
+        mbox = self._mbox
+        mbox.setIcon(icon)
+        mbox.setWindowTitle(title)
+        mbox.setText(text)
+        mbox.setStandardButtons(buttons)
+        mbox.setDefaultButton(default)
+        mbox.exec()
+        return mbox.standardButton(mbox.clickedButton())
+    
+    def _ask(self, text: str) -> bool:
+        """Evet/Hayır onayı al (varsayılan: Hayır)."""
+        reply = self._show_message(
+            QMessageBox.Question, "Onay", text,
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        return reply == QMessageBox.Yes
+    
+    def _info(self, title: str, text: str):
+        self._show_message(QMessageBox.Information, title, text)
+    
+    def _error(self, text: str):
+        self._show_message(QMessageBox.Critical, "Hata", text)
             
+    @Slot()
     def _clear_db(self):
         """Veritabanını temizle."""
-        reply = QMessageBox.question(
-            self, "Onay", 
-            "Tüm AI analiz veritabanı silinecek.\nBu işlem geri alınamaz.\nDevam etmek istiyor musunuz?",
-            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-        )
-        
-        if reply == QMessageBox.Yes:
+        if self._ask("Tüm AI analiz veritabanı silinecek.\nBu işlem geri alınamaz.\nDevam etmek istiyor musunuz?"):
             try:
-                # Cache temizle
-                cache = AICache()
+                # Ana pencereyle aynı örnek: bellek katmanı da temizlenir
+                cache = AICache.instance()
+                if cache.is_empty():
+                    self._info("Bilgi", "Veritabanı zaten boş.")
+                    return
                 cache.clear()
-                QMessageBox.information(self, "Başarılı", "Veritabanı temizlendi.")
+                self._info("Başarılı", "Veritabanı temizlendi.")
             except Exception as e:
                 logger.error(f"Veritabanı silinemedi: {e}")
-                QMessageBox.critical(self, "Hata", f"Veritabanı temizlenemedi:\n{e}")
-    
+                self._error(f"Veritabanı temizlenemedi:\n{e}")
     
+    @Slot()
     def _clear_logs(self):
         """Log temizliği."""
-        reply = QMessageBox.question(
-            self, "Onay", 
+        if not self._ask(
             "Geçmiş log dosyaları silinecek.\n"
             "(Aktif oturumun log dosyası silinemez)\n\n"
-            "Devam etmek istiyor musunuz?",
-            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-        )
-        
-        if reply == QMessageBox.Yes:
-            try:
-                log_dir = Path.home() / ".adbui" / "logs"
-                deleted_count = 0
-                skipped_count = 0
-                
-                if log_dir.exists():
-                    for log_file in log_dir.glob("*.log"):
-                        try:
-                            log_file.unlink()
-                            deleted_count += 1
-                        except PermissionError:
-                             # Windows'ta açık dosyalar silinemez
-                            skipped_count += 1
-                        except Exception as e:
-                            logger.error(f"Dosya silme hatası ({log_file}): {e}")
-                            skipped_count += 1
-                    
-                    msg = f"{deleted_count} eski log dosyası silindi."
-                    if skipped_count > 0:
-                        msg += f"\n({skipped_count} aktif dosya korundu)"
-                        
-                    QMessageBox.information(self, "İşlem Tamamlandı", msg)
-                else:
-                    QMessageBox.information(self, "Bilgi", "Log klasörü bulunamadı.")
-            except Exception as e:
-                logger.error(f"Log temizleme hatası: {e}")
-                QMessageBox.critical(self, "Hata", f"Loglar temizlenemedi:\n{e}")
-                
+            "Devam etmek istiyor musunuz?"
+        ):
+            return
+        
+        log_dir = get_log_dir()
+        if not log_dir.exists():
+            self._info("Bilgi", "Log klasörü bulunamadı.")
+            return
+        
+        # Silme işlemi UI thread'ini bloklamaz; bitene kadar buton kapalı
+        self.clear_logs_btn.setEnabled(False)
+        self._log_cleanup_signals = LogCleanupSignals()
+        self._log_cleanup_signals.finished.connect(self._on_logs_cleared)
+        self._log_cleanup_signals.error_occurred.connect(self._on_logs_clear_error)
+        QThreadPool.globalInstance().start(LogCleanupTask(log_dir, self._log_cleanup_signals))
+    
+    @Slot(int, int)
+    def _on_logs_cleared(self, deleted_count: int, skipped_count: int):
+        """Log temizliği bitti."""
+        self.clear_logs_btn.setEnabled(True)
+        
+        msg = f"{deleted_count} eski log dosyası silindi."
+        if skipped_count > 0:
+            msg += f"\n({skipped_count} aktif dosya korundu)"
+        self._info("İşlem Tamamlandı", msg)
+    
+    @Slot(str)
+    def _on_logs_clear_error(self, message: str):
+        """Log temizliği hata verdi."""
+        self.clear_logs_btn.setEnabled(True)
+        self._error(f"Loglar temizlenemedi:\n{message}")
+    
+    @Slot()
     def _open_logs(self):
         """Log klasörünü aç."""
         try:
-            log_dir = Path.home() / ".adbui" / "logs"
+            log_dir = get_log_dir()
             if not log_dir.exists():
                 log_dir.mkdir(parents=True, exist_ok=True)
-                
-            import os
-            # Windows için klasör aç
-            os.startfile(log_dir)
+            
+            # Platformun dosya yöneticisiyle aç (bloklamaz, her işletim sisteminde çalışır)
+            if not QDesktopServices.openUrl(QUrl.fromLocalFile(str(log_dir))):
+                self._error(f"Log klasörü açılamadı:\n{log_dir}")
         except Exception as e:
             logger.error(f"Log klasörü açılamadı: {e}")
-            QMessageBox.critical(self, "Hata", f"Log klasörü açılamadı:\n{e}")
+            self._error(f"Log klasörü açılamadı:\n{e}")
@@ -13,7 +13,9 @@ from PySide6.QtWidgets import (
     QPushButton, QLabel, QMessageBox, QApplication,
     QTabWidget
 )
-from PySide6.QtCore import Qt, Signal, Slot, QThread, QTimer
+from PySide6.QtCore import (
+    Qt, Signal, Slot, QObject, QRunnable, QThread, QThreadPool, QTimer
+)
 from PySide6.QtGui import QAction, QIcon
 import logging
 
@@ -33,6 +35,7 @@ from ..core.package_manager import PackageManager, Package, PackageCategory
 from ..core.known_apps import KnownAppsManager
 from ..ai.analyzer import PackageAnalyzer
 from ..ai.cache import AICache
+from ..ai.semantic_cache import SemanticCache
 from ..ai.background_analyzer import BackgroundAnalyzerThread
 from ..utils.config import get_config
 from ..utils.logger import log_emitter
@@ -40,23 +43,322 @@ from ..utils.resource import get_resource_path
 
 logger = logging.getLogger(__name__)
 
+# Cihaz yoklama aralıkları (ms): değişiklik olmadıkça aralık uzatılır
+DEVICE_POLL_INTERVAL_MS = 2000
+DEVICE_POLL_IDLE_INTERVAL_MS = 5000
+DEVICE_POLL_IDLE_AFTER = 5  # Bu kadar değişmeyen yoklamadan sonra
+
 
-class PackageLoaderThread(QThread):
-    """Paketleri arka planda yükleyen thread."""
+class PackageLoaderWorker(QObject):
+    """
+    Paketleri kalıcı bir arka plan thread'inde yükleyen worker.
+    
+    Her yükleme isteği hedef cihazı ve kendi iptal işaretini
+    (threading.Event) taşır. Cihaz bu thread'de seçilir, böylece süren bir
+    yüklemenin oturumu UI thread'inden kapatılmaz. Yeni istek gelince
+    önceki işaret kurulur; eski yükleme adb çağrıları arasında durur ve
+    sonuç göndermez.
+    """
     
-    packages_loaded = Signal(list)
-    error_occurred = Signal(str)
+    packages_loaded = Signal(object, list)  # iptal işareti, paketler
+    error_occurred = Signal(object, str)  # iptal işareti, hata
     
     def __init__(self, package_manager: PackageManager):
         super().__init__()
         self.package_manager = package_manager
     
+    @Slot(str, object)
+    def load(self, serial: str, cancel: threading.Event):
+        if cancel.is_set():
+            return
+        try:
+            self.package_manager.set_device(serial)
+            packages = self.package_manager.get_all_packages(cancel=cancel)
+        except Exception as e:
+            if not cancel.is_set():
+                self.error_occurred.emit(cancel, str(e))
+            return
+        if not cancel.is_set():
+            self.packages_loaded.emit(cancel, packages)
+
+
+class AIAnalysisSignals(QObject):
+    """AIAnalysisTask sinyalleri (QRunnable bir QObject değildir)."""
+    finished = Signal(int, object)  # istek numarası, AIAnalysis veya None
+
+
+class AIAnalysisTask(QRunnable):
+    """Tek paketin AI analizini global QThreadPool'da yapan görev."""
+    
+    def __init__(self, analyzer: PackageAnalyzer, package_name: str, token: int,
+                 signals: AIAnalysisSignals, use_cache: bool = True):
+        super().__init__()
+        self.analyzer = analyzer
+        self.package_name = package_name
+        self.token = token
+        self.signals = signals
+        self.use_cache = use_cache
+    
     def run(self):
         try:
-            packages = self.package_manager.get_all_packages()
-            self.packages_loaded.emit(packages)
+            analysis = self.analyzer.analyze(
+                self.package_name, use_cache=self.use_cache, priority=True
+            )
         except Exception as e:
-            self.error_occurred.emit(str(e))
+            logger.error(f"AI analiz hatası ({self.package_name}): {e}")
+            analysis = None
+        self.signals.finished.emit(self.token, analysis)
+
+
+# Windows yol ayırıcılarını düzelt (Qt stil dosyası için forward slash gerekli)
+_CHECK_ICON_PATH = get_resource_path("adbui/assets/check.svg").replace("\\", "/")
+
+# Koyu tema: import sırasında bir kez oluşturulur
+_STYLESHEET = f"""
+QMainWindow {{
+    background-color: #1a1a2e;
+}}
+
+QWidget {{
+    background-color: #16213e;
+    color: #e8e8e8;
+    font-family: 'Segoe UI', Arial, sans-serif;
+    font-size: 13px;
+}}
+
+QToolBar {{
+    background-color: #0f0f23;
+    border: none;
+    padding: 8px;
+    spacing: 10px;
+}}
+
+QToolBar QLabel {{
+    color: #a0a0a0;
+    background: transparent;
+}}
+
+/* ToolBar specific fixes */
+QToolBar QToolButton {{
+    background-color: #2d2d44;
+    border: 1px solid #4a4e69;
+    border-radius: 8px;
+    padding: 6px 12px;
+    font-weight: bold;
+    color: white;
+}}
+
+QToolBar QToolButton:hover {{
+    background-color: #4a4e69;
+    border-color: #6c757d;
+}}
+
+QPushButton {{
+    background-color: #4a4e69;
+    color: white;
+    border: none;
+    padding: 8px 16px;
+    border-radius: 8px;
+    font-weight: bold;
+}}
+
+QPushButton:hover {{
+    background-color: #6c757d;
+}}
+
+QPushButton:pressed {{
+    background-color: #545b62;
+}}
+
+QPushButton:disabled {{
+    background-color: #3d3d3d;
+    color: #6c6c6c;
+}}
+
+QPushButton#dangerButton {{
+    background-color: #dc3545;
+}}
+
+QPushButton#dangerButton:hover {{
+    background-color: #c82333;
+}}
+
+QPushButton#successButton {{
+    background-color: #28a745;
+}}
+
+QPushButton#successButton:hover {{
+    background-color: #218838;
+}}
+
+QPushButton#warningButton {{
+    background-color: #ffc107;
+    color: #212529;
+}}
+
+QComboBox {{
+    background-color: #2d2d44;
+    border: 1px solid #4a4e69;
+    border-radius: 8px;
+    padding: 6px 12px;
+    min-width: 150px;
+}}
+
+QComboBox:hover {{
+    border-color: #6c757d;
+}}
+
+QComboBox::drop-down {{
+    border: none;
+    padding-right: 10px;
+}}
+
+QComboBox QAbstractItemView {{
+    background-color: #2d2d44;
+    border: 1px solid #4a4e69;
+    selection-background-color: #4a4e69;
+}}
+
+QLineEdit {{
+    background-color: #2d2d44;
+    border: 1px solid #4a4e69;
+    border-radius: 8px;
+    padding: 8px 12px;
+}}
+
+QLineEdit:focus {{
+    border-color: #667eea;
+}}
+
+QListWidget {{
+    background-color: #1a1a2e;
+    border: 1px solid #2d2d44;
+    border-radius: 8px;
+    padding: 4px;
+}}
+
+QListWidget::item {{
+    padding: 8px 12px;
+    border-radius: 6px;
+    margin: 2px 0;
+}}
+
+QListWidget::item:selected {{
+    background-color: #4a4e69;
+}}
+
+QListWidget::item:hover {{
+    background-color: #2d2d44;
+}}
+
+QTextEdit {{
+    background-color: #0f0f23;
+    border: 1px solid #2d2d44;
+    border-radius: 8px;
+    padding: 8px;
+    font-family: 'Consolas', 'Courier New', monospace;
+}}
+
+QGroupBox {{
+    border: 1px solid #2d2d44;
+    border-radius: 8px;
+    margin-top: 12px;
+    padding-top: 12px;
+    font-weight: bold;
+}}
+
+QGroupBox::title {{
+    subcontrol-origin: margin;
+    left: 12px;
+    padding: 0 8px;
+}}
+
+QSplitter::handle {{
+    background-color: #2d2d44;
+}}
+
+QSplitter::handle:horizontal {{
+    width: 2px;
+}}
+
+QSplitter::handle:vertical {{
+    height: 2px;
+}}
+
+QStatusBar {{
+    background-color: #0f0f23;
+    color: #a0a0a0;
+}}
+
+QScrollBar:vertical {{
+    background-color: #1a1a2e;
+    width: 12px;
+    border-radius: 6px;
+}}
+
+QScrollBar::handle:vertical {{
+    background-color: #4a4e69;
+    border-radius: 6px;
+    min-height: 30px;
+}}
+
+QScrollBar::handle:vertical:hover {{
+    background-color: #6c757d;
+}}
+
+QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
+    height: 0;
+}}
+
+QCheckBox {{
+    spacing: 8px;
+}}
+
+QCheckBox::indicator {{
+    width: 18px;
+    height: 18px;
+    border-radius: 6px;
+    border: 2px solid #4a4e69;
+}}
+
+/* Tab Widget Styling */
+QTabWidget::pane {{
+    border: 1px solid #2d2d44;
+    border-radius: 8px;
+    background-color: #1a1a2e;
+}}
+
+QTabWidget::tab-bar {{
+    left: 5px;
+}}
+
+QTabBar::tab {{
+    background-color: #0f0f23;
+    color: #888888;
+    border-top-left-radius: 8px;
+    border-top-right-radius: 8px;
+    padding: 8px 16px;
+    margin-right: 4px;
+    font-weight: bold;
+}}
+
+QTabBar::tab:selected {{
+    background-color: #2d2d44; /* Active tab matches content bg */
+    color: #ffffff;
+    border-bottom: 2px solid #667eea;
+}}
+
+QTabBar::tab:hover {{
+    background-color: #2d2d44;
+    color: #e8e8e8;
+}}
+
+QCheckBox::indicator:checked {{
+    background-color: transparent;
+    border: 2px solid #667eea;
+    image: url({_CHECK_ICON_PATH});
+}}
+"""
 
 
 class MainWindow(QMainWindow):
@@ -70,21 +372,19 @@ class MainWindow(QMainWindow):
     - Alt: Log paneli
     """
     
-    refresh_finished = Signal(object)
     advanced_info_loaded = Signal(dict)
     log_received = Signal(str, str)  # Thread-safe log sinyali
+    load_requested = Signal(str, object)  # Paket yükleme isteği (seri no, iptal işareti)
     
     def __init__(self):
         super().__init__()
         
-        # Sinyal bağlantıları
-        self.refresh_finished.connect(self._on_ai_refresh_done)
-        
         self.setWindowTitle("ADBUI - Android Debloat ve Kontrol Aracı")
         self.setMinimumSize(1000, 700) # 1366x768 ekranlar için optimize edildi
         
         # Thread referansları
-        self._loader_thread: Optional[PackageLoaderThread] = None
+        self._last_devices_fingerprint: Optional[str] = None
+        self._unchanged_polls = 0
         self._device_timer = QTimer(self)
         self._device_timer.timeout.connect(self._check_devices_periodically)
         
@@ -107,8 +407,8 @@ class MainWindow(QMainWindow):
         self._refresh_devices()
         
         # Otomatik algılama aktifse timer'ı başlat
-        if get_config().get('auto_detect_device', True):
-            self._device_timer.start(2000)  # 2 saniyede bir kontrol et
+        if self._config.get('auto_detect_device', True):
+            self._device_timer.start(DEVICE_POLL_INTERVAL_MS)
     
     def _init_logging_signals(self):
         """Log sinyallerini bağla (Thread-Safe UI Updates)."""
@@ -122,16 +422,23 @@ class MainWindow(QMainWindow):
     def ai_analyzer(self):
         """Lazy load AI analyzer."""
         if self._ai_analyzer_instance is None:
-            config = get_config()
+            config = self._config
+            semantic_cache = None
+            if config.get('semantic_cache_enabled', False):
+                semantic_cache = SemanticCache(storage_dir=self.ai_cache.db_path.parent)
+            
             self._ai_analyzer_instance = PackageAnalyzer(
                 api_key=config.get('openai_api_key'),
-                cache_manager=self.ai_cache
+                cache_manager=self.ai_cache,
+                semantic_cache=semantic_cache,
+                requests_per_minute=config.get('ai_requests_per_minute', 10)
             )
         return self._ai_analyzer_instance
     
     def _init_services(self):
         """Servisleri başlat."""
-        config = get_config()
+        # Tekil ConfigManager; ayarlar dialogu da aynı nesneyi günceller
+        self._config = get_config()
         
         try:
             self.adb_service = ADBService()
@@ -140,7 +447,7 @@ class MainWindow(QMainWindow):
             self.known_apps_manager = KnownAppsManager()
             
             # AI servisi (Lazy loading için placeholder)
-            self.ai_cache = AICache() if config.get('cache_enabled', True) else AICache()
+            self.ai_cache = AICache.instance()
             self._ai_analyzer_instance = None
             
             self._current_device: Optional[Device] = None
@@ -148,6 +455,23 @@ class MainWindow(QMainWindow):
             self._selected_package: Optional[Package] = None
             self._background_analyzer: Optional[BackgroundAnalyzerThread] = None
             
+            # Paket yükleyici: tek thread, uygulama boyunca yaşar
+            self._load_cancel = threading.Event()
+            self._loader_thread = QThread(self)
+            self._loader_worker = PackageLoaderWorker(self.package_manager)
+            self._loader_worker.moveToThread(self._loader_thread)
+            self.load_requested.connect(self._loader_worker.load)
+            self._loader_worker.packages_loaded.connect(self._on_packages_loaded)
+            self._loader_worker.error_occurred.connect(self._on_load_error)
+            self._loader_thread.start()
+            
+            # Tekil AI analizleri: her seçim yeni bir istek numarası alır,
+            # sonucu gelene kadar başka paket seçildiyse sonuç atılır
+            self._ai_pool = QThreadPool.globalInstance()
+            self._current_ai_token = 0
+            self._ai_signals = AIAnalysisSignals()
+            self._ai_signals.finished.connect(self._on_ai_refresh_done)
+            
         except FileNotFoundError as e:
             QMessageBox.critical(
                 self,
@@ -235,7 +559,8 @@ class MainWindow(QMainWindow):
         # Yenile butonu
         refresh_action = QAction("🔄 Cihazları Yenile", self)
         refresh_action.setToolTip("Cihaz listesini yenile")
-        refresh_action.triggered.connect(self._refresh_devices)
+        # triggered(bool) argümanı devices parametresine geçmesin
+        refresh_action.triggered.connect(lambda: self._refresh_devices())
         toolbar.addAction(refresh_action)
         
         # Paketleri Yükle butonu
@@ -289,295 +614,60 @@ class MainWindow(QMainWindow):
     
     def _load_stylesheet(self):
         """Koyu tema stilini yükle."""
-        
-        check_icon_path = get_resource_path("adbui/assets/check.svg")
-        
-        # Windows yol ayırıcılarını düzelt (Qt stil dosyası için forward slash gerekli)
-        check_icon_path = check_icon_path.replace("\\", "/")
-        
-        style = f"""
-        QMainWindow {{
-            background-color: #1a1a2e;
-        }}
-        
-        QWidget {{
-            background-color: #16213e;
-            color: #e8e8e8;
-            font-family: 'Segoe UI', Arial, sans-serif;
-            font-size: 13px;
-        }}
-        
-        QToolBar {{
-            background-color: #0f0f23;
-            border: none;
-            padding: 8px;
-            spacing: 10px;
-        }}
-        
-        QToolBar QLabel {{
-            color: #a0a0a0;
-            background: transparent;
-        }}
-        
-        /* ToolBar specific fixes */
-        QToolBar QToolButton {{
-            background-color: #2d2d44;
-            border: 1px solid #4a4e69;
-            border-radius: 8px;
-            padding: 6px 12px;
-            font-weight: bold;
-            color: white;
-        }}
-
-        QToolBar QToolButton:hover {{
-            background-color: #4a4e69;
-            border-color: #6c757d;
-        }}
-        
-        QPushButton {{
-            background-color: #4a4e69;
-            color: white;
-            border: none;
-            padding: 8px 16px;
-            border-radius: 8px;
-            font-weight: bold;
-        }}
-        
-        QPushButton:hover {{
-            background-color: #6c757d;
-        }}
-        
-        QPushButton:pressed {{
-            background-color: #545b62;
-        }}
-        
-        QPushButton:disabled {{
-            background-color: #3d3d3d;
-            color: #6c6c6c;
-        }}
-        
-        QPushButton#dangerButton {{
-            background-color: #dc3545;
-        }}
-        
-        QPushButton#dangerButton:hover {{
-            background-color: #c82333;
-        }}
-        
-        QPushButton#successButton {{
-            background-color: #28a745;
-        }}
-        
-        QPushButton#successButton:hover {{
-            background-color: #218838;
-        }}
-        
-        QPushButton#warningButton {{
-            background-color: #ffc107;
-            color: #212529;
-        }}
-        
-        QComboBox {{
-            background-color: #2d2d44;
-            border: 1px solid #4a4e69;
-            border-radius: 8px;
-            padding: 6px 12px;
-            min-width: 150px;
-        }}
-        
-        QComboBox:hover {{
-            border-color: #6c757d;
-        }}
-        
-        QComboBox::drop-down {{
-            border: none;
-            padding-right: 10px;
-        }}
-        
-        QComboBox QAbstractItemView {{
-            background-color: #2d2d44;
-            border: 1px solid #4a4e69;
-            selection-background-color: #4a4e69;
-        }}
-        
-        QLineEdit {{
-            background-color: #2d2d44;
-            border: 1px solid #4a4e69;
-            border-radius: 8px;
-            padding: 8px 12px;
-        }}
-        
-        QLineEdit:focus {{
-            border-color: #667eea;
-        }}
-        
-        QListWidget {{
-            background-color: #1a1a2e;
-            border: 1px solid #2d2d44;
-            border-radius: 8px;
-            padding: 4px;
-        }}
-        
-        QListWidget::item {{
-            padding: 8px 12px;
-            border-radius: 6px;
-            margin: 2px 0;
-        }}
-        
-        QListWidget::item:selected {{
-            background-color: #4a4e69;
-        }}
-        
-        QListWidget::item:hover {{
-            background-color: #2d2d44;
-        }}
-        
-        QTextEdit {{
-            background-color: #0f0f23;
-            border: 1px solid #2d2d44;
-            border-radius: 8px;
-            padding: 8px;
-            font-family: 'Consolas', 'Courier New', monospace;
-        }}
-        
-        QGroupBox {{
-            border: 1px solid #2d2d44;
-            border-radius: 8px;
-            margin-top: 12px;
-            padding-top: 12px;
-            font-weight: bold;
-        }}
-        
-        QGroupBox::title {{
-            subcontrol-origin: margin;
-            left: 12px;
-            padding: 0 8px;
-        }}
-        
-        QSplitter::handle {{
-            background-color: #2d2d44;
-        }}
-        
-        QSplitter::handle:horizontal {{
-            width: 2px;
-        }}
-        
-        QSplitter::handle:vertical {{
-            height: 2px;
-        }}
-        
-        QStatusBar {{
-            background-color: #0f0f23;
-            color: #a0a0a0;
-        }}
-        
-        QScrollBar:vertical {{
-            background-color: #1a1a2e;
-            width: 12px;
-            border-radius: 6px;
-        }}
-        
-        QScrollBar::handle:vertical {{
-            background-color: #4a4e69;
-            border-radius: 6px;
-            min-height: 30px;
-        }}
-        
-        QScrollBar::handle:vertical:hover {{
-            background-color: #6c757d;
-        }}
-        
-        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-            height: 0;
-        }}
-        
-        QCheckBox {{
-            spacing: 8px;
-        }}
-        
-        QCheckBox::indicator {{
-            width: 18px;
-            height: 18px;
-            border-radius: 6px;
-            border: 2px solid #4a4e69;
-        }}
-        
-        /* Tab Widget Styling */
-        QTabWidget::pane {{
-            border: 1px solid #2d2d44;
-            border-radius: 8px;
-            background-color: #1a1a2e;
-        }}
-        
-        QTabWidget::tab-bar {{
-            left: 5px;
-        }}
-        
-        QTabBar::tab {{
-            background-color: #0f0f23;
-            color: #888888;
-            border-top-left-radius: 8px;
-            border-top-right-radius: 8px;
-            padding: 8px 16px;
-            margin-right: 4px;
-            font-weight: bold;
-        }}
-        
-        QTabBar::tab:selected {{
-            background-color: #2d2d44; /* Active tab matches content bg */
-            color: #ffffff;
-            border-bottom: 2px solid #667eea;
-        }}
-        
-        QTabBar::tab:hover {{
-            background-color: #2d2d44;
-            color: #e8e8e8;
-        }}
-        
-        QCheckBox::indicator:checked {{
-            background-color: transparent;
-            border: 2px solid #667eea;
-            image: url({check_icon_path});
-        }}
+        self.setStyleSheet(_STYLESHEET)
+    
+    def _refresh_devices(self, devices: Optional[List[Device]] = None):
         """
+        Cihaz listesini yenile.
         
-        self.setStyleSheet(style)
-    
-    def _refresh_devices(self):
-        """Cihaz listesini yenile."""
+        Args:
+            devices: Zaten alınmış cihaz listesi (None ise adb'ye sorulur)
+        """
         # Önce mevcut seçimi kaydet
         old_serial = self._current_device.serial if self._current_device else None
         
-        self.device_combo.clear()
-        devices = self.device_manager.get_devices()
-        
-        if not devices:
-            self.device_combo.addItem("Cihaz bulunamadı", None)
-            self.status_label.setText("Cihaz bağlı değil")
-            self.load_packages_btn.setEnabled(False)
-            self._clear_packages()  # Paketleri temizle
-            return
+        if devices is None:
+            devices = self.device_manager.get_devices()
+        self._last_devices_fingerprint = self._devices_fingerprint(devices)
         
-        # Cihazları combo'ya ekle
-        selected_index = 0
-        for i, device in enumerate(devices):
-            if device.is_ready:
-                self.device_combo.addItem(device.display_name, device)
-                if device.serial == old_serial:
-                    selected_index = i
+        # Yeniden kurulum sırasında her addItem currentIndexChanged tetiklemesin
+        combo = self.device_combo
+        combo.blockSignals(True)
+        try:
+            combo.clear()
+            if not devices:
+                combo.addItem("Cihaz bulunamadı", None)
             else:
-                status_text = ""
-                if device.status.value == "unauthorized":
-                    status_text = " ⚠️ (Yetkilendirilmemiş)"
-                else:
-                    status_text = f" ({device.status.value})"
-                self.device_combo.addItem(
-                    f"{device.display_name}{status_text}",
-                    device
-                )
+                labels = []
+                selected_index = 0
+                for i, device in enumerate(devices):
+                    if device.is_ready:
+                        labels.append(device.display_name)
+                        if device.serial == old_serial:
+                            selected_index = i
+                    elif device.status.value == "unauthorized":
+                        labels.append(f"{device.display_name} ⚠️ (Yetkilendirilmemiş)")
+                    else:
+                        labels.append(f"{device.display_name} ({device.status.value})")
+                
+                combo.addItems(labels)
+                for i, device in enumerate(devices):
+                    combo.setItemData(i, device)
+                
+                # Eğer önceki cihaz hala varsa onu seç, yoksa ilkini seç
+                combo.setCurrentIndex(selected_index)
+        finally:
+            combo.blockSignals(False)
         
-        # Eğer önceki cihaz hala varsa onu seç, yoksa ilkini seç
-        self.device_combo.setCurrentIndex(selected_index)
+        # Seçim değişikliği tek seferde işlenir
+        self._on_device_changed(combo.currentIndex())
+        if not devices:
+            self.status_label.setText("Cihaz bağlı değil")
+    
+    @staticmethod
+    def _devices_fingerprint(devices: List[Device]) -> str:
+        """Cihaz listesinin seri numarası + durum özeti."""
+        return "|".join(f"{d.serial}:{d.status.value}" for d in devices)
     
     def _clear_packages(self):
         """Paket listesini temizle."""
@@ -594,58 +684,37 @@ class MainWindow(QMainWindow):
             return
         
         self.status_label.setText("Paketler yükleniyor...")
-        self.package_manager.set_device(self._current_device.serial)
-        
-        # Varsaki thread çalışıyorsa durdur
-        if self._loader_thread is not None:
-            if self._loader_thread.isRunning():
-                self._loader_thread.terminate()  # Zorla durdur
-                self._loader_thread.wait()       # Bitmesini bekle
-            self._loader_thread = None           # Referansı temizle
-        
-        # Thread ile yükle
-        self._loader_thread = PackageLoaderThread(self.package_manager)
-        self._loader_thread.packages_loaded.connect(self._on_packages_loaded)
-        self._loader_thread.error_occurred.connect(self._on_load_error)
-        # deleteLater KULLANMA! Python tarafında referans kalıyor, C++ siliyor -> Crash.
-        # self._loader_thread.finished.connect(self._loader_thread.deleteLater)
-        self._loader_thread.start()
+        
+        # Süren yükleme iptal edilir (thread beklenmez); yeni istek kuyruğa girer.
+        # Cihaz, worker thread'inde yükleme başlarken seçilir.
+        self._load_cancel.set()
+        self._load_cancel = threading.Event()
+        self.load_requested.emit(self._current_device.serial, self._load_cancel)
         
     def _check_devices_periodically(self):
-        """Periyodik olarak cihazları kontrol et."""
-        # Eğer dropdown açık değilse güncelle (kullanıcı seçim yaparken engelleme)
-        if not self.device_combo.view().isVisible():
-             # Sadece sayı veya durum değiştiyse tam yenileme yap
-             # Şimdilik basitçe her seferinde kontrol ediyoruz
-             # İleride optimizasyon yapılabilir
-             
-             # Mevcut cihaz listesini al
-             current_devices = self.device_manager.get_devices()
-             
-             # Combobox'taki cihaz sayısıyla karşılaştır
-             # (Tam doğru değil ama pratik bir kontrol)
-             # "Cihaz bulunamadı" maddesi varsa count 1 olur ama data None'dır
-             combo_count = self.device_combo.count()
-             combo_has_none = False
-             if combo_count > 0 and self.device_combo.itemData(0) is None:
-                 combo_has_none = True
-                 
-             real_device_count = 0 if combo_has_none else combo_count
-             
-             # Değişiklik varsa yenile
-             if len(current_devices) != real_device_count:
-                 logger.debug("Cihaz değişikliği algılandı, yenileniyor...")
-                 self._refresh_devices()
-             else:
-                 # Sayı aynı olsa bile seri numaraları veya durumları değişmiş olabilir
-                 # Basitlik için şimdilik sadece sayıya bakıyoruz
-                 # Veya mevcut seçili cihazın durumu değişti mi?
-                 if self._current_device:
-                     for d in current_devices:
-                         if d.serial == self._current_device.serial and d.status != self._current_device.status:
-                             logger.info(f"Cihaz durumu değişti: {d.status.value}")
-                             self._refresh_devices()
-                             break
+        """
+        Periyodik olarak cihazları kontrol et.
+        
+        Combo yalnızca cihaz listesi (seri + durum) değiştiğinde yeniden
+        kurulur. Değişiklik olmadıkça yoklama aralığı uzatılır.
+        """
+        # Kullanıcı seçim yaparken dropdown'u yenileme
+        if self.device_combo.view().isVisible():
+            return
+        
+        devices = self.device_manager.get_devices()
+        fingerprint = self._devices_fingerprint(devices)
+        if fingerprint == self._last_devices_fingerprint:
+            self._unchanged_polls += 1
+            if self._unchanged_polls == DEVICE_POLL_IDLE_AFTER:
+                self._device_timer.setInterval(DEVICE_POLL_IDLE_INTERVAL_MS)
+            return
+        
+        logger.debug("Cihaz değişikliği algılandı, yenileniyor...")
+        self._unchanged_polls = 0
+        self._device_timer.setInterval(DEVICE_POLL_INTERVAL_MS)
+        # Parmak izi alınan liste gösterilir (adb ikinci kez çalıştırılmaz)
+        self._refresh_devices(devices)
     
     def _refresh_all(self):
         """Tüm verileri yenile."""
@@ -705,9 +774,12 @@ class MainWindow(QMainWindow):
         else:
             QMessageBox.warning(self, "Bulunamadı", f"Paket yüklü değil: {package_name}")
     
-    @Slot(list)
-    def _on_packages_loaded(self, packages: List[Package]):
+    @Slot(object, list)
+    def _on_packages_loaded(self, cancel: threading.Event, packages: List[Package]):
         """Paketler yüklendi."""
+        if cancel is not self._load_cancel:
+            return  # Yerine yenisi istenmiş eski yükleme
+        
         self._packages = packages
         self.package_list.set_packages(packages)
         self.known_apps_widget.set_installed_packages(packages)
@@ -721,9 +793,12 @@ class MainWindow(QMainWindow):
         # Arka planda AI analizini başlat
         self._start_background_analysis(packages)
     
-    @Slot(str)
-    def _on_load_error(self, error: str):
+    @Slot(object, str)
+    def _on_load_error(self, cancel: threading.Event, error: str):
         """Yükleme hatası."""
+        if cancel is not self._load_cancel:
+            return
+        
         self.status_label.setText("Hata!")
         logger.error(f"Paket yükleme hatası: {error}")
         QMessageBox.critical(self, "Hata", f"Paketler yüklenemedi:\n{error}")
@@ -748,6 +823,9 @@ class MainWindow(QMainWindow):
         
         threading.Thread(target=load_details, daemon=True).start()
         
+        # Önceki paketin süren analizi artık gösterilmeyecek
+        self._current_ai_token += 1
+        
         # Önce cache'e bak
         if self.ai_cache:
             cached_analysis = self.ai_cache.get(package.name)
@@ -756,24 +834,21 @@ class MainWindow(QMainWindow):
                 self.ai_panel.set_analysis(cached_analysis)
                 return
         
-        # Cache'de yok, AI analizi başlat (arka plan işlemi devam ediyorsa bekleyecek)
-        # Cache'de yok, AI analizi başlat (arka plan işlemi devam ediyorsa bekleyecek)
+        # Cache'de yok, AI analizi havuzda başlat - UI donmasını önler
         if self.ai_analyzer.is_available:
             self.ai_panel.set_loading(True)
-            
-            # Asenkron çağrı (Thread ile) - UI donmasını önler
-            def run():
-                try:
-                    analysis = self.ai_analyzer.analyze(package.name)
-                    self.refresh_finished.emit(analysis)
-                except Exception as e:
-                    logger.error(f"Manuel analiz hatası: {e}")
-                    self.refresh_finished.emit(None)
-            
-            threading.Thread(target=run, daemon=True).start()
+            self._start_ai_analysis(package.name)
         else:
             self.ai_panel.set_unavailable()
     
+    def _start_ai_analysis(self, package_name: str, use_cache: bool = True):
+        """Paketin AI analizini yeni bir istek numarasıyla havuza gönder."""
+        self._current_ai_token += 1
+        self._ai_pool.start(AIAnalysisTask(
+            self.ai_analyzer, package_name, self._current_ai_token,
+            self._ai_signals, use_cache=use_cache
+        ))
+    
     @Slot(str, object)
     def _on_action_requested(self, action: str, package: Package):
         """Paket işlemi istendi."""
@@ -880,8 +955,7 @@ class MainWindow(QMainWindow):
         dialog = SettingsDialog(self)
         if dialog.exec():
             # Ayarlar değiştiyse AI'ı güncelle
-            config = get_config()
-            self.ai_analyzer.set_api_key(config.get('openai_api_key'))
+            self.ai_analyzer.set_api_key(self._config.get('openai_api_key'))
     def _show_permissions_dialog(self, package: Package):
         """İzinler dialogunu göster."""
         dialog = PermissionsDialog(self.package_manager, package.name, self)
@@ -909,7 +983,8 @@ class MainWindow(QMainWindow):
             packages=packages,
             analyzer=self.ai_analyzer,
             cache=self.ai_cache,
-            batch_size=20
+            batch_size=20,
+            use_batch_api=self._config.get('ai_batch_api_enabled', False)
         )
         
         # Sinyalleri bağla
@@ -917,6 +992,7 @@ class MainWindow(QMainWindow):
         self._background_analyzer.package_analyzed.connect(self._on_background_package_analyzed)
         self._background_analyzer.all_completed.connect(self._on_background_completed)
         self._background_analyzer.error_occurred.connect(self._on_background_error)
+        self._background_analyzer.batch_job_pending.connect(self._on_batch_job_pending)
         
         # Başlat
         self.ai_panel.update_progress(f"AI Analizi Başlıyor... (0/{len(packages)})")
@@ -929,6 +1005,13 @@ class MainWindow(QMainWindow):
         self.ai_panel.update_progress(f"AI Analizi: {current}/{total}")
         # self.status_label.setText(f"AI Analizi: {current}/{total}") # Artık gerek yok
     
+    @Slot(int)
+    def _on_batch_job_pending(self, count: int):
+        """Batch API işinin sonucu bekleniyor."""
+        self.ai_panel.update_progress(
+            f"AI: Batch işi bekleniyor ({count} paket, 24 saate kadar sürebilir)"
+        )
+    
     @Slot(str, object)
     def _on_background_package_analyzed(self, package_name: str, analysis):
         """Bir paket arka planda analiz edildi."""
@@ -968,22 +1051,15 @@ class MainWindow(QMainWindow):
         # Cache'den sil
         if self.ai_cache:
             self.ai_cache.delete(package_name)
-            
-        def run():
-            if self.ai_analyzer:
-                # Cache silindiği için API'ye gidecek
-                try:
-                    analysis = self.ai_analyzer.analyze(package_name)
-                    self.refresh_finished.emit(analysis)
-                except Exception as e:
-                    logger.error(f"Yenileme hatası: {e}")
-                    self.refresh_finished.emit(None)
-                
-        threading.Thread(target=run, daemon=True).start()
+        
+        # Cache katmanları atlanır, doğrudan API'ye gidecek
+        self._start_ai_analysis(package_name, use_cache=False)
 
-    @Slot(object)
-    def _on_ai_refresh_done(self, analysis):
-        """Yenileme tamamlandı."""
+    @Slot(int, object)
+    def _on_ai_refresh_done(self, token: int, analysis):
+        """Analiz tamamlandı (eski seçimlere ait sonuçlar atılır)."""
+        if token != self._current_ai_token:
+            return
         self.ai_panel.set_analysis(analysis)
     
     @Slot()
@@ -1010,22 +1086,30 @@ class MainWindow(QMainWindow):
         if self._device_timer.isActive():
             self._device_timer.stop()
         
-        # Background analyzer'ı durdur
+        # Önce iki thread'e de durma isteği gönder (paralel kapansınlar)
+        analyzer = self._background_analyzer
         try:
-            if self._background_analyzer and self._background_analyzer.isRunning():
-                self._background_analyzer.stop()
-                self._background_analyzer.wait(2000)
-        except RuntimeError:
-            pass
-        
-        # Loader thread'i temizle (C++ objesi silinmiş olabilir)
-        try:
-            if self._loader_thread is not None and self._loader_thread.isRunning():
-                self._loader_thread.quit()
-                self._loader_thread.wait(1000)
-                if self._loader_thread.isRunning():
-                    self._loader_thread.terminate()
+            if analyzer is not None and analyzer.isRunning():
+                analyzer.stop()
+            else:
+                analyzer = None
         except RuntimeError:
-            pass  # C++ object already deleted
+            analyzer = None  # C++ object already deleted
+        
+        self._load_cancel.set()
+        self._loader_thread.quit()
+        
+        # Süresiz beklenir: oturum ve cache hâlâ kullanılırken kapatılmamalı.
+        # Loader en fazla takılı adb komutunun zaman aşımı kadar, analyzer
+        # semantik indeks yazımı bitene kadar sürer.
+        if analyzer is not None:
+            analyzer.wait()
+        self._loader_thread.wait()
+        
+        # Thread'ler durdu: kalıcı adb shell oturumunu ve AI cache bağlantısını kapat
+        if getattr(self, 'package_manager', None) is not None:
+            self.package_manager.close()
+        if getattr(self, 'ai_cache', None) is not None:
+            self.ai_cache.close()
         
         event.accept()
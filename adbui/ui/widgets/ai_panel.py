@@ -347,6 +347,10 @@ class AIPanelWidget(QWidget):
         is_cached = analysis.is_cached
         text = "Veritabanından (Cache)" if is_cached else "Canlı Analiz"
         color = "#6c757d" if is_cached else "#28a745"
+        if analysis.similar_to:
+            # Başka bir paketin analizi: karar bu pakete ait değil
+            text = f"Benzer paketten: {analysis.similar_to}"
+            color = "#fd7e14"
         
         self.cache_badge.setText(text)
         self.cache_badge.setStyleSheet(f"""
@@ -6,13 +6,39 @@ Uygulama konfigürasyon yönetimi.
 
 import json
 import os
+import threading
 from pathlib import Path
 from typing import Any, Optional
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, asdict
 import logging
 
 logger = logging.getLogger(__name__)
 
+# QSettings INI dosyası (config.json ile aynı dizinde)
+SETTINGS_FILENAME = "config.ini"
+
+# AppConfig alanı -> QSettings anahtarı
+_SETTINGS_KEYS = {
+    "openai_api_key": "ai/api_key",
+    "ai_model": "ai/model",
+    "ai_enabled": "ai/enabled",
+    "ai_requests_per_minute": "ai/requests_per_minute",
+    "ai_batch_api_enabled": "ai/batch_api_enabled",
+    "theme": "ui/theme",
+    "language": "ui/language",
+    "window_width": "ui/window_width",
+    "window_height": "ui/window_height",
+    "adb_path": "adb/path",
+    "auto_detect_device": "adb/auto_detect_device",
+    "command_timeout": "adb/command_timeout",
+    "confirm_critical_actions": "security/confirm_critical_actions",
+    "show_system_packages": "security/show_system_packages",
+    "enable_dangerous_operations": "security/enable_dangerous_operations",
+    "cache_enabled": "cache/enabled",
+    "cache_ttl_days": "cache/ttl_days",
+    "semantic_cache_enabled": "cache/semantic_opt_in",
+}
+
 
 @dataclass
 class AppConfig:
@@ -22,6 +48,8 @@ class AppConfig:
     openai_api_key: str = ""
     ai_model: str = "gemini-2.5-flash"
     ai_enabled: bool = True
+    ai_requests_per_minute: int = 10  # Hesabın/modelin RPM limiti
+    ai_batch_api_enabled: bool = False  # Büyük taramalar Batch API'ye (sonuç 24 saate kadar gecikebilir)
     
     # UI Ayarları
     theme: str = "dark"
@@ -42,13 +70,18 @@ class AppConfig:
     # Cache Ayarları
     cache_enabled: bool = True
     cache_ttl_days: int = 30
+    semantic_cache_enabled: bool = False  # Benzer paket adları için embedding araması (isteğe bağlı)
 
 
 class ConfigManager:
     """
     Konfigürasyon yöneticisi.
     
-    JSON dosyasında ayarları saklar ve yönetir.
+    Ayarlar QSettings (INI) ile saklanır; Qt her anahtarı önbellekte
+    tutar ve dosyayı kilitleyip atomik olarak yazar. PySide6 yoksa
+    aynı ayarlar JSON dosyasına yazılır. config.json, QSettings
+    kullanılırken yalnızca ilk açılışta içe aktarılır ve
+    export_json() / import_json() için kullanılır.
     """
     
     DEFAULT_CONFIG_DIR = Path.home() / ".adbui"
@@ -67,6 +100,11 @@ class ConfigManager:
             self.config_path = self.DEFAULT_CONFIG_DIR / self.CONFIG_FILENAME
         
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._settings = self._open_settings()
+        # QSettings'te kayıtlı değerler (alan adı -> değer); yalnızca
+        # bunlardan farklı olan alanlar yazılır
+        self._persisted = {}
         self._config = self._load()
     
     @property
@@ -74,16 +112,52 @@ class ConfigManager:
         """Mevcut konfigürasyon."""
         return self._config
     
+    def _open_settings(self):
+        """QSettings nesnesini oluştur (PySide6 yoksa None)."""
+        try:
+            from PySide6.QtCore import QSettings
+        except ImportError:
+            logger.info("PySide6 bulunamadı, ayarlar JSON dosyasında tutulacak")
+            return None
+        
+        path = self.config_path.with_name(SETTINGS_FILENAME)
+        return QSettings(str(path), QSettings.IniFormat)
+    
     def _load(self) -> AppConfig:
-        """Konfigürasyonu dosyadan yükle."""
+        """Konfigürasyonu yükle."""
+        if self._settings is None:
+            return self._load_json()
+        
+        with self._lock:
+            if not self._settings.allKeys():
+                # İlk açılış: varsa eski config.json'u içe aktar
+                config = self._read_json(self.config_path) if self.config_path.exists() else AppConfig()
+                self._save(config)
+                return config
+            
+            values = {}
+            for f in fields(AppConfig):
+                key = _SETTINGS_KEYS[f.name]
+                if self._settings.contains(key):
+                    values[f.name] = self._settings.value(key, type=f.type)
+            self._persisted = dict(values)
+            return AppConfig(**values)
+    
+    def _load_json(self) -> AppConfig:
+        """Konfigürasyonu JSON dosyasından yükle."""
         if not self.config_path.exists():
             logger.info("Konfigürasyon dosyası bulunamadı, varsayılan oluşturuluyor")
             config = AppConfig()
             self._save(config)
             return config
         
+        return self._read_json(self.config_path)
+    
+    @staticmethod
+    def _read_json(path: Path) -> AppConfig:
+        """JSON dosyasını AppConfig'e çevir (hata olursa varsayılanlar)."""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
+            with open(path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
             # Sadece tanımlı alanları kullan
@@ -96,24 +170,67 @@ class ConfigManager:
             logger.error(f"Konfigürasyon yükleme hatası: {e}")
             return AppConfig()
     
-    def _save(self, config: AppConfig) -> bool:
-        """Konfigürasyonu dosyaya kaydet."""
+    @staticmethod
+    def _write_json(path: Path, config: AppConfig) -> bool:
+        """AppConfig'i JSON dosyasına yaz (geçici dosya + replace)."""
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
                 json.dump(asdict(config), f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, path)
             return True
         except Exception as e:
             logger.error(f"Konfigürasyon kaydetme hatası: {e}")
             return False
     
+    def _save(self, config: AppConfig) -> bool:
+        """Konfigürasyonu kaydet."""
+        with self._lock:
+            if self._settings is None:
+                return self._write_json(self.config_path, config)
+            
+            changed = {
+                name: getattr(config, name)
+                for name in _SETTINGS_KEYS
+                if name not in self._persisted or self._persisted[name] != getattr(config, name)
+            }
+            if not changed:
+                return True
+            
+            for name, value in changed.items():
+                self._settings.setValue(_SETTINGS_KEYS[name], value)
+            self._settings.sync()
+            
+            if self._settings.status() != self._settings.Status.NoError:
+                logger.error(f"Konfigürasyon kaydetme hatası: {self._settings.status()}")
+                return False
+            self._persisted.update(changed)
+            return True
+    
     def save(self) -> bool:
         """Mevcut konfigürasyonu kaydet."""
         return self._save(self._config)
     
     def reload(self):
         """Konfigürasyonu yeniden yükle."""
+        if self._settings is not None:
+            self._settings.sync()
         self._config = self._load()
     
+    def export_json(self, path: Optional[str] = None) -> bool:
+        """Mevcut konfigürasyonu JSON dosyasına aktar (varsayılan: config.json)."""
+        return self._write_json(Path(path) if path else self.config_path, self._config)
+    
+    def import_json(self, path: Optional[str] = None) -> bool:
+        """JSON dosyasındaki ayarları yükle ve kaydet (varsayılan: config.json)."""
+        source = Path(path) if path else self.config_path
+        if not source.exists():
+            logger.warning(f"Konfigürasyon dosyası bulunamadı: {source}")
+            return False
+        
+        self._config = self._read_json(source)
+        return self.save()
+    
     def get(self, key: str, default: Any = None) -> Any:
         """Konfigürasyon değeri al."""
         return getattr(self._config, key, default)
@@ -6,6 +6,7 @@ Uygulama genelinde kullanılan log sistemi.
 
 import logging
 import sys
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -102,7 +103,7 @@ def setup_logging(
     # File handler
     if enable_file:
         if log_dir is None:
-            log_dir = Path.home() / ".adbui" / "logs"
+            log_dir = get_log_dir()
         else:
             log_dir = Path(log_dir)
         
@@ -136,3 +137,9 @@ def setup_logging(
 def get_logger(name: str) -> logging.Logger:
     """Modül için logger al."""
     return logging.getLogger(name)
+
+
+@lru_cache(maxsize=None)
+def get_log_dir() -> Path:
+    """Varsayılan log dizini (ev dizini bir kez çözümlenir)."""
+    return Path.home() / ".adbui" / "logs"
@@ -31,6 +31,18 @@ def clean():
             except Exception as e:
                 print(f"   ! Silinemedi {f}: {e}")
 
+# Paketlenen modüllerin bytecode optimizasyon seviyesi (python -O ile aynı:
+# assert'ler atılır). Docstring'leri de silen 2 bazı bağımlılıkları bozabilir.
+BYTECODE_OPTIMIZE = 1
+
+def pyinstaller_supports_optimize():
+    """Analysis(optimize=...) PyInstaller 6.0 ile geldi."""
+    import PyInstaller
+    try:
+        return int(PyInstaller.__version__.split(".")[0]) >= 6
+    except ValueError:
+        return False
+
 def build():
     clean()
     print("🚀 ADBUI Derleme İşlemi Başlatılıyor...")
@@ -137,6 +149,14 @@ coll = COLLECT(
 # )
 """
     
+    if pyinstaller_supports_optimize():
+        spec_content = spec_content.replace(
+            "    noarchive=False,\n",
+            f"    noarchive=False,\n    optimize={BYTECODE_OPTIMIZE},\n"
+        )
+    else:
+        print("   ! PyInstaller 6.0+ değil, bytecode optimizasyonu atlanıyor")
+    
     spec_file = Path("adbui.spec")
     spec_file.write_text(spec_content, encoding="utf-8")
 